@@ -1,3 +1,6 @@
+from game import board_2d
+from game import board_3d
 from game import game_2d
 from game import game_3d
 from game import move_data
+from game import piece_generator
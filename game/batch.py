@@ -0,0 +1,552 @@
+"""
+Module with 'BatchGame', the engine 'BatchGame2D' (look at
+'game/batch_2d.py') and 'BatchGame3D' (look at 'game/batch_3d.py')
+use to play MANY games at once, in lockstep, with numpy.
+
+Instead of one game object per game, the state of ALL of the games
+is kept in numpy arrays, with one entry per game:
+
+    'cells[game, level]': bitmask of the filled cells of one level
+        of the game's board (a row in 2D, a floor in 3D),
+        like the rows of 'BitBoard2D' and the floors of 'BitBoard3D',
+    'pieces', 'next_pieces': indexes of the games' pieces
+        in the game mode's piece list,
+    'orientations', 'pos': the games' current pieces' orientations
+        and positions, where 'pos[axis]' is the position of all of
+        the pieces along 'axis', and the axis of the levels is LAST,
+    'points', 'lines', 'levels', 'transitioned': the games' 'Score's,
+
+and every step (moving, rotating, falling, landing, clearing levels
+and scoring) is done to all of the games with the same few numpy
+operations, so playing 10000 games takes about as many Python calls
+as playing one.
+
+The pieces are looked up in a 'BatchTables', made ONCE for the size
+of the board, with every piece in every orientation ALREADY MOVED
+to every position along the levels (its "lateral" position),
+as 'PIECE_SIZE' level masks, so checking a piece is ONE AND
+between its masks and the 'PIECE_SIZE' levels it's in.
+
+The games play EXACTLY like the game mode's games with
+'PieceGenerator's with the same seeds, played frame by frame
+like 'play_game' (look at 'game/simulation.py') plays them,
+with at most one action per game per frame.
+"""
+from dataclasses import dataclass
+from numpy import (ndarray, arange, argsort, array, asarray, copyto,
+                   flatnonzero, full, int64, minimum, ones, take_along_axis,
+                   uint64, where, zeros)
+from numpy.lib.stride_tricks import sliding_window_view
+from game.piece_generator import PieceGenerator
+from game.score import Score, fall_rate
+
+NO_ACTION = 0
+"""
+The action code of doing nothing in a frame.
+(Look at 'BatchGame.apply')
+"""
+
+PIECE_SIZE = 4
+"""
+The size of the biggest piece matrix (the I piece's) along every axis.
+Every piece is checked as 'PIECE_SIZE' levels,
+and can be at most 'PIECE_SIZE' cells outside of the board's walls.
+"""
+
+SCORE_PER_LINE = array((0, 40, 100, 300, 1200), int64)
+# (Look at 'Score.score')
+
+FALL_RATES = array([fall_rate(level) for level in range(64)], int64)
+"""
+'fall_rate(level)' of levels 0 to 63.
+(From level 41 up, it's always 1)
+"""
+
+
+@dataclass(frozen=True, eq=False)
+class BatchTables:
+    """
+    The pieces of a game mode, looked up ONCE for a board size,
+    for 'BatchGame' to play with.
+
+    The "lateral" position of a piece is its position along every axis
+    but the last one (the one the pieces fall along), with every axis
+    going from '-PIECE_SIZE' to 'width + PIECE_SIZE - 1',
+    (every position a piece can try to move to)
+    flattened into ONE index with 'lateral_strides'.
+
+    'masks[piece, orientation, lateral, dz]': bitmask of the cells
+        of level 'dz' of the piece's matrix, at the lateral position.
+    'packed_masks[piece, orientation, lateral]': the same
+        'PIECE_SIZE' masks, read as uint64's.
+    'inside[piece, orientation, lateral]': whether the piece,
+        at the lateral position, is between the board's walls.
+    'heights[piece, orientation]': the height of the piece's matrix,
+        (the levels that are checked when it lands)
+    'transitions[piece, orientation, rotation]': the orientation
+        the piece ends up in when it does 'rotation'.
+    'spawn_orientations[piece]', 'spawn_pos[axis, piece]':
+        the orientation and position the piece spawns in.
+    'lateral_strides': how much each lateral axis moves the index.
+        (The first one is always 1)
+    'full_level': the mask of a full level.
+    """
+    masks: ndarray
+    packed_masks: ndarray
+    inside: ndarray
+    heights: ndarray
+    transitions: ndarray
+    spawn_orientations: ndarray
+    spawn_pos: ndarray
+    lateral_strides: tuple[int, ...]
+    full_level: int
+
+
+def batch_tables(masks: ndarray, inside: ndarray, heights: ndarray,
+                 transitions: ndarray, spawn_orientations,
+                 spawn_pos, lateral_strides, full_level: int) -> BatchTables:
+    """
+    Returns a 'BatchTables' with the tables, made read-only,
+    and 'masks' packed into uint64's.
+    """
+    packed_masks = masks.view(uint64)
+    # The 'PIECE_SIZE' masks of each piece are next to each other
+    # in memory, so they can be read as uint64's.
+
+    tables = BatchTables(
+        masks, packed_masks, inside, heights, transitions,
+        array(spawn_orientations, int64), array(spawn_pos, int64).T.copy(),
+        tuple(lateral_strides), full_level)
+
+    for table in (tables.masks, tables.packed_masks, tables.inside,
+                  tables.heights, tables.transitions,
+                  tables.spawn_orientations, tables.spawn_pos):
+        table.flags.writeable = False
+    return tables
+
+
+class BatchGame:
+    """
+    'count' games, played in lockstep.
+    (Read the docstring of this module)
+
+    'self.cells': '(count, level_count + PIECE_SIZE)' array of the
+        boards' level masks, where the levels under the floor are full.
+    'self.pieces', 'self.orientations': the games' current pieces,
+        and their orientations.
+    'self.pos[axis, game]': the position of the game's piece
+        along 'axis', where the LAST axis is the one the pieces
+        fall along. (Each axis is its own contiguous array)
+    'self.next_pieces': the games' next pieces.
+    'self.points', 'self.lines', 'self.levels', 'self.transitioned':
+        the games' scores. (Look at 'Score')
+    'self.amount_of_levels_cleared': amount of levels each game cleared
+        when its last piece landed.
+    'self.alive': False for the games that are over.
+        Games that are over don't change anymore.
+    'self.frame_counts': frames since each game's piece last fell,
+        like 'GameControl.frame_count'.
+    'self.frames', 'self.spawned': amount of frames each game played,
+        and amount of pieces spawned in it (not counting the first one).
+
+    The game modes say what their action codes do in 'OPERATIONS':
+    'OPERATIONS[code - 1]' is one of:
+        ("move", axis, direction)
+        ("hard_drop",)
+        ("soft_drop",)
+        ("rotate", rotation)    (look at 'BatchTables.transitions')
+    """
+    OPERATIONS: tuple[tuple, ...] = ()
+
+    def __init__(self, count: int, level_count: int, tables: BatchTables,
+                 generators):
+        """
+        Makes 'count' new games, with boards of 'level_count' levels,
+        playing the pieces in 'tables'.
+
+        Game number 'i' picks its pieces with 'generators[i]',
+        so it gets the same pieces a game with that generator would.
+        """
+        if count < 1:
+            raise ValueError(f"'count' must be at least 1, not {count}")
+        if len(generators) != count:
+            raise ValueError(
+                f"Expected {count} generators, got {len(generators)}")
+
+        self.count = count
+        self.level_count = level_count
+        self.tables = tables
+        self.words = tables.packed_masks.shape[-1]
+
+        self.generators = list(generators)
+        self.block_sizes = array(
+            [generator.block_size for generator in self.generators], int64)
+        self.piece_blocks = zeros((count, self.block_sizes.max(initial=1)),
+                                  int64)
+        self.piece_indexes = zeros(count, int64)
+        for game in range(count):
+            self._load_block(game)
+
+        self.cells = zeros((count, level_count + PIECE_SIZE),
+                           tables.masks.dtype)
+        self.cells[:, level_count:] = ~tables.masks.dtype.type(0)
+        # The levels under the floor are full, so pieces land on them.
+        self.flat_cells = self.cells.reshape(-1)
+        self.windows = sliding_window_view(
+            self.flat_cells, PIECE_SIZE).view(uint64)
+        # 'self.windows[game * self.stride + level]' are the 'PIECE_SIZE'
+        # levels a piece at 'level' is in, read as uint64's.
+        self.stride = level_count + PIECE_SIZE
+
+        self.flat_masks = tables.masks.reshape(-1, PIECE_SIZE)
+        self.flat_packed_masks = tables.packed_masks.reshape(-1, self.words)
+        self.flat_inside = tables.inside.reshape(-1)
+        self.flat_transitions = tables.transitions.reshape(-1)
+        # The tables are looked up with ONE flat index
+        # (look at 'self._table_index'), which is a lot faster
+        # than indexing them with 3 arrays.
+
+        codes = len(self.OPERATIONS) + 1
+        self.action_shifts = zeros(
+            (len(tables.lateral_strides) + 1, codes), int64)
+        self.action_rotations = full(codes, -1, int64)
+        self.action_hard_drops = zeros(codes, bool)
+        for code, (operation, *arguments) in enumerate(self.OPERATIONS, 1):
+            if operation == "move":
+                axis, direction = arguments
+                self.action_shifts[axis, code] = direction
+            elif operation == "soft_drop":
+                self.action_shifts[-1, code] = 1
+            elif operation == "hard_drop":
+                self.action_hard_drops[code] = True
+            else:
+                self.action_rotations[code] = arguments[0]
+        self.action_shifting = self.action_shifts.any(axis=0) \
+            | (self.action_rotations >= 0)
+        # 'self.action_shifts[:, code]', 'self.action_rotations[code]':
+        # how action 'code' moves and rotates the piece
+        # (-1 for no rotation), 'self.action_hard_drops[code]':
+        # whether it's a hard drop.
+
+        self.pieces = zeros(count, int64)
+        self.orientations = zeros(count, int64)
+        self.pos = zeros((len(tables.lateral_strides) + 1, count), int64)
+        self.next_pieces = zeros(count, int64)
+
+        ALL = arange(count)
+        self.pieces[:] = self._next_pieces(ALL)
+        self.next_pieces[:] = self._next_pieces(ALL)
+        self.orientations[:] = tables.spawn_orientations[self.pieces]
+        self.pos[:] = tables.spawn_pos[:, self.pieces]
+
+        self.points = zeros(count, int64)
+        self.lines = zeros(count, int64)
+        self.levels = zeros(count, int64)
+        self.transitioned = zeros(count, bool)
+        self.amount_of_levels_cleared = zeros(count, int64)
+
+        self.alive = ones(count, bool)
+        self.frame_counts = zeros(count, int64)
+        self.frames = zeros(count, int64)
+        self.spawned = zeros(count, int64)
+
+    @property
+    def boards(self) -> ndarray:
+        """
+        '(count, level_count)' view of the boards' level masks.
+        """
+        return self.cells[:, :self.level_count]
+
+    def _load_block(self, game: int) -> None:
+        """
+        Copies the block of piece indexes 'self.generators[game]'
+        is handing out into 'self.piece_blocks[game]'.
+        """
+        generator = self.generators[game]
+        self.piece_blocks[game, :len(generator.block)] = generator.block
+        self.piece_indexes[game] = generator.index
+
+    def _next_pieces(self, games: ndarray) -> ndarray:
+        """
+        Returns the next piece index of each game in 'games',
+        like 'PieceGenerator.next_index'.
+
+        The indexes are read from the generators' blocks,
+        copied into 'self.piece_blocks', and only the games
+        whose block ran out call their generator.
+        """
+        for game in games[
+                self.piece_indexes[games] == self.block_sizes[games]]:
+            self.generators[game].fill_block()
+            self._load_block(game)
+
+        pieces = self.piece_blocks[games, self.piece_indexes[games]]
+        self.piece_indexes[games] += 1
+        return pieces
+
+    def _lateral(self, pos: ndarray) -> ndarray:
+        """
+        Returns the lateral indexes (look at 'BatchTables')
+        of the positions in 'pos' ('pos[axis]' like 'self.pos').
+        """
+        strides = self.tables.lateral_strides
+        lateral = pos[0] + PIECE_SIZE * sum(strides)
+        for axis in range(1, len(strides)):
+            lateral += pos[axis] * strides[axis]
+        return lateral
+
+    def _table_index(self, pieces: ndarray, orientations: ndarray,
+                     pos: ndarray) -> ndarray:
+        """
+        Returns the indexes of 'pieces', in 'orientations',
+        at 'pos' ('pos[axis]' like 'self.pos'), in the flattened tables.
+        """
+        _, orientation_count, lateral_count = self.tables.inside.shape
+        return (pieces * orientation_count + orientations) * lateral_count \
+            + self._lateral(pos)
+
+    def _overlaps(self, levels: ndarray, masks: ndarray) -> ndarray:
+        """
+        Returns whether the packed 'masks' overlap the packed 'levels'
+        they're in, along the last axis.
+        """
+        overlap = levels & masks
+        if self.words == 1:
+            return overlap[..., 0] != 0
+        return overlap.any(axis=-1)
+
+    def _collides(self, games: ndarray, orientations: ndarray,
+                  pos: ndarray) -> ndarray:
+        """
+        Returns, for each game in 'games', whether its piece,
+        in 'orientations', at 'pos', would be outside of the walls,
+        below the floor, or overlap a cell of its board.
+        """
+        index = self._table_index(self.pieces[games], orientations, pos)
+        return ~self.flat_inside.take(index) | self._overlaps(
+            self.windows[games * self.stride + pos[-1]],
+            self.flat_packed_masks.take(index, axis=0))
+
+    def _drop_distances(self, games: ndarray) -> ndarray:
+        """
+        Returns how many levels the pieces of 'games' can move down
+        before they land.
+
+        Every distance is checked at once: the board's levels
+        under the piece are gathered for every position it could
+        fall to, and the first one it collides at is found.
+        """
+        pos = self.pos.take(games, axis=1)
+        masks = self.flat_packed_masks.take(self._table_index(
+            self.pieces[games], self.orientations[games], pos), axis=0)
+
+        levels = pos[-1, :, None] + arange(1, self.level_count + 2)
+        minimum(levels, self.level_count, out=levels)
+        # every level under the floor is full, like level 'level_count'
+
+        return self._overlaps(
+            self.windows[games[:, None] * self.stride + levels],
+            masks[:, None]
+        ).argmax(axis=1)
+
+    def apply(self, actions) -> ndarray:
+        """
+        Does each game's action in 'actions' (an action code, look at
+        'self.OPERATIONS'), to the games that aren't over.
+        Moves and rotations that would make the piece collide fail.
+
+        Returns which games hard dropped their piece.
+        """
+        actions = asarray(actions)
+        if actions.shape != (self.count,):
+            raise ValueError(
+                f"Expected {self.count} actions, got {actions.shape}")
+
+        if ((actions < NO_ACTION) | (actions > len(self.OPERATIONS))).any():
+            raise ValueError(
+                f"The action codes must be from {NO_ACTION} "
+                f"to {len(self.OPERATIONS)}")
+
+        actions = where(self.alive, actions, NO_ACTION)
+
+        games = flatnonzero(self.action_shifting[actions])
+        codes = actions[games]
+        pieces = self.pieces[games]
+        pos = self.pos.take(games, axis=1) + self.action_shifts[:, codes]
+        orientations = self.orientations[games]
+        rotations = self.action_rotations[codes]
+        rotating = flatnonzero(rotations >= 0)
+        orientations[rotating] = self.flat_transitions.take(
+            (pieces[rotating] * self.tables.transitions.shape[1]
+             + orientations[rotating]) * self.tables.transitions.shape[2]
+            + rotations[rotating])
+
+        shifted = ~self._collides(games, orientations, pos)
+        self.pos[:, games[shifted]] = pos[:, shifted]
+        self.orientations[games[shifted]] = orientations[shifted]
+        # Every game does at most one action, so the moves,
+        # the soft drops and the rotations are checked all at once.
+
+        hard_dropped = self.action_hard_drops[actions]
+        games = flatnonzero(hard_dropped)
+        self.pos[-1, games] += self._drop_distances(games)
+
+        return hard_dropped
+
+    def play(self, games=None) -> None:
+        """
+        Plays one "step" (where the piece goes one down)
+        of each game in 'games' that isn't over
+        (or of every game that isn't over, if 'games' is None).
+
+        The games whose piece landed set it down, clear the levels
+        it completed, score them, and spawn their next piece,
+        and the games whose new piece spawns in their board's cells
+        are over. (Look at 'self.alive')
+        The other games' pieces move one down.
+        """
+        if games is None:
+            games = flatnonzero(self.alive)
+        else:
+            games = asarray(games)
+            games = games[self.alive[games]]
+        if not len(games):
+            return
+
+        pos = self.pos.take(games, axis=1)
+        pos[-1] += 1
+        landed = self._collides(games, self.orientations[games], pos)
+
+        self.pos[-1, games[~landed]] += 1
+        games = games[landed]
+        if not len(games):
+            return
+
+        pieces = self.pieces[games]
+        orientations = self.orientations[games]
+        pos = self.pos.take(games, axis=1)
+
+        levels = pos[-1, :, None] + arange(PIECE_SIZE)
+        cells = games[:, None] * self.stride + levels
+        self.flat_cells[cells] |= self.flat_masks.take(
+            self._table_index(pieces, orientations, pos), axis=0)
+        # set down
+
+        cleared = self._clear_levels(
+            games, levels, cells,
+            arange(PIECE_SIZE)
+            < self.tables.heights[pieces, orientations][:, None])
+        self._score(games, cleared)
+
+        self.pieces[games] = self.next_pieces[games]
+        self.next_pieces[games] = self._next_pieces(games)
+        self.orientations[games] = \
+            self.tables.spawn_orientations[self.pieces[games]]
+        self.pos[:, games] = self.tables.spawn_pos[:, self.pieces[games]]
+        self.spawned[games] += 1
+
+        self.alive[games] = ~self._collides(
+            games, self.orientations[games], self.pos.take(games, axis=1))
+
+    def _clear_levels(self, games: ndarray, levels: ndarray,
+                      cells: ndarray, in_piece: ndarray) -> ndarray:
+        """
+        Clears the full levels in 'levels' (the levels of the pieces
+        of 'games' that just landed, at 'cells' in 'self.flat_cells',
+        where 'in_piece' is True),
+        and returns the amount of levels each game cleared.
+
+        The levels of the boards that cleared levels are moved with ONE
+        stable sort per board, that puts the cleared levels (emptied)
+        on top, and the others under them, in the same order.
+        """
+        full = in_piece & (levels < self.level_count) \
+            & (self.flat_cells.take(cells) == self.tables.full_level)
+        cleared = full.sum(axis=1)
+
+        clearing = cleared > 0
+        if clearing.any():
+            boards = games[clearing]
+            removed = zeros((len(boards), self.level_count), bool)
+            full_levels = full[clearing]
+            removed[
+                arange(len(boards)).repeat(full_levels.sum(axis=1)),
+                levels[clearing][full_levels]
+            ] = True
+
+            order = argsort(~removed, axis=1, kind="stable")
+            cells = take_along_axis(self.boards[boards], order, axis=1)
+            cells[arange(self.level_count) < cleared[clearing][:, None]] = 0
+            self.boards[boards] = cells
+
+        return cleared
+
+    def _score(self, games: ndarray, cleared: ndarray) -> None:
+        """
+        Scores the levels 'games' cleared, like 'Score.score',
+        and sets their 'amount_of_levels_cleared'.
+        """
+        self.amount_of_levels_cleared[games] = cleared
+
+        lines = self.lines[games]
+        levels = self.levels[games]
+        next_lines = lines + cleared
+
+        self.points[games] += (levels + 1) * SCORE_PER_LINE[cleared]
+
+        after_transition = self.transitioned[games] & (cleared > 0) \
+            & (next_lines // 10 > lines // 10)
+        transition = ~after_transition \
+            & (lines < (levels + 1) * 10) & ((levels + 1) * 10 <= next_lines)
+        # (Look at 'Score.score')
+
+        self.levels[games] += after_transition | transition
+        self.transitioned[games[transition]] = True
+        self.lines[games] = next_lines
+
+    def step(self, actions) -> ndarray:
+        """
+        Plays one frame of every game that isn't over,
+        like 'play_game' (look at 'game/simulation.py'):
+        each game does its action in 'actions' (look at 'self.apply'),
+        and the games whose piece is due to fall
+        ('fall_rate(level)' frames after it last fell,
+        or right after a hard drop) play their step.
+
+        Returns 'self.alive'.
+        """
+        alive = self.alive.copy()
+        self.frames += alive
+        self.frame_counts += alive
+
+        hard_dropped = self.apply(actions)
+
+        fall_rates = FALL_RATES[minimum(self.levels, len(FALL_RATES) - 1)]
+        copyto(self.frame_counts, fall_rates, where=hard_dropped)
+
+        games = flatnonzero(alive & (self.frame_counts >= fall_rates))
+        self.frame_counts[games] = 0
+        self.play(games)
+
+        return self.alive
+
+    def score(self, game: int) -> Score:
+        """
+        Returns the 'Score' of game number 'game'.
+        """
+        return Score(
+            int(self.points[game]), int(self.lines[game]),
+            int(self.levels[game]), bool(self.transitioned[game]))
+
+
+def seeded_generators(piece_count: int, count: int,
+                      seed: int = 0) -> list[PieceGenerator]:
+    """
+    Returns 'count' 'PieceGenerator's of 'piece_count' pieces,
+    where generator number 'i' is seeded with 'seed + i',
+    like 'simulate' seeds its games.
+    """
+    return [
+        PieceGenerator(piece_count, game_seed)
+        for game_seed in range(seed, seed + count)
+    ]
@@ -0,0 +1,171 @@
+"""
+Module with 'BatchGame2D', which plays MANY 2D games at once,
+in lockstep, with numpy. (Look at 'game/batch.py')
+
+The boards are a '(count, rows)' uint16 array, where bit 'x'
+of 'boards[game, y]' is the square at (x, y) of the game's board,
+like the rows of 'BitBoard2D'.
+
+The games play EXACTLY like 'Game2D's with 'PieceGenerator's
+with the same seeds, played frame by frame like 'play_game'
+(look at 'game/simulation.py') plays them,
+with at most one action per game per frame.
+"""
+from functools import lru_cache
+from numpy import zeros, int64, uint16
+from game.batch import *
+from game.game_2d import (PIECES_2D, ROTATIONS_2D, ROWS, COLUMNS, Game2D,
+                          spawn_template_2d)
+from game.move_data import *
+
+BATCH_ACTIONS_2D = (
+    ("try_move", LEFT),
+    ("try_move", RIGHT),
+    ("try_move", HARD_DROP),
+    ("try_move", SOFT_DROP),
+    ("try_rotate", True),
+    ("try_rotate", False),
+)
+"""
+The actions a 'BatchGame2D' game can do in a frame.
+Action code 'i + 1' is 'BATCH_ACTIONS_2D[i]',
+and 'NO_ACTION' (0) does nothing.
+
+(The same actions, in the same order, as 'ENGINES["2d"].actions'
+in 'game/simulation.py')
+"""
+LEFT_ACTION, RIGHT_ACTION, HARD_DROP_ACTION, SOFT_DROP_ACTION, \
+    CLOCKWISE_ACTION, COUNTERCLOCKWISE_ACTION = range(1, 7)
+
+MAX_COLUMNS = 16
+"""
+The rows of the boards are uint16 bitmasks,
+so the boards can't be wider than 16 columns.
+"""
+
+
+@lru_cache(maxsize=None)
+def batch_tables_2d(columns: int = COLUMNS) -> BatchTables:
+    """
+    Returns the 'BatchTables' of 'PIECES_2D', in boards
+    with 'columns' columns, where the orientations are the
+    pieces' rotations (padded to 4), and rotation 0 is
+    counterclockwise, and 1 clockwise.
+    """
+    positions = range(-PIECE_SIZE, columns + PIECE_SIZE)
+    full_row = (1 << columns) - 1
+
+    masks = zeros((len(PIECES_2D), 4, len(positions), PIECE_SIZE), uint16)
+    inside = zeros((len(PIECES_2D), 4, len(positions)), bool)
+    heights = zeros((len(PIECES_2D), 4), int64)
+    transitions = zeros((len(PIECES_2D), 4, 2), int64)
+
+    for index, piece in enumerate(PIECES_2D):
+        rotations = ROTATIONS_2D[id(piece)]
+
+        for rotation, compiled in enumerate(rotations):
+            heights[index, rotation] = compiled.height
+            transitions[index, rotation] = (
+                (rotation - 1) % len(rotations),
+                (rotation + 1) % len(rotations))
+
+            for position, x_pos in enumerate(positions):
+                row_masks = []
+                for dy, mask in compiled.row_masks:
+                    if x_pos >= 0:
+                        mask <<= x_pos
+                    elif mask & ((1 << -x_pos) - 1):
+                        break
+                    else:
+                        mask >>= -x_pos
+                    if mask > full_row:
+                        break
+                    row_masks.append((dy, mask))
+                else:
+                    inside[index, rotation, position] = True
+                    for dy, mask in row_masks:
+                        masks[index, rotation, position, dy] = mask
+                # Like 'Board2D._shift_inside',
+                # the piece is outside the walls if any row is.
+
+    return batch_tables(
+        masks, inside, heights, transitions,
+        [0] * len(PIECES_2D),
+        [spawn_template_2d(piece, columns).pos for piece in PIECES_2D],
+        [1],
+        full_row
+    )
+
+
+class BatchGame2D(BatchGame):
+    """
+    'count' 2D games, played in lockstep.
+    (Read the docstrings of this module and 'BatchGame')
+
+    'self.boards': '(count, rows)' uint16 array of the boards' rows.
+    'self.pieces': the games' current pieces, as indexes in 'PIECES_2D'.
+    'self.rotations', 'self.x_pos', 'self.y_pos': the games' current
+        pieces' rotations and positions, like 'Piece2D.rotation'
+        and 'Piece2D.pos'.
+    """
+    OPERATIONS = (
+        ("move", 0, -1),
+        ("move", 0, 1),
+        ("hard_drop",),
+        ("soft_drop",),
+        ("rotate", 1),
+        ("rotate", 0),
+    )
+    # (Look at 'BATCH_ACTIONS_2D')
+
+    def __init__(self, count: int, seed: int = 0,
+                 rows: int = ROWS, columns: int = COLUMNS,
+                 generators=None):
+        """
+        Makes 'count' new games, with boards of 'rows' rows
+        and 'columns' columns (at most 'MAX_COLUMNS').
+
+        Game number 'i' picks its pieces with 'generators[i]',
+        or with a new 'PieceGenerator' seeded with 'seed + i'
+        if 'generators' is None (like 'simulate' seeds its games),
+        so it gets the same pieces a 'Game2D' with that generator would.
+        """
+        if rows < Game2D.MIN_SIZE or columns < Game2D.MIN_SIZE:
+            raise ValueError(
+                f"The board must be at least {Game2D.MIN_SIZE}x"
+                f"{Game2D.MIN_SIZE}, not {rows}x{columns}")
+        if columns > MAX_COLUMNS:
+            raise ValueError(
+                f"The board can't have more than {MAX_COLUMNS} columns, "
+                f"not {columns}")
+
+        if generators is None:
+            generators = seeded_generators(len(PIECES_2D), count, seed)
+
+        self.rows = rows
+        self.columns = columns
+        super().__init__(count, rows, batch_tables_2d(columns), generators)
+
+    @property
+    def rotations(self):
+        return self.orientations
+
+    @property
+    def x_pos(self):
+        return self.pos[0]
+
+    @property
+    def y_pos(self):
+        return self.pos[1]
+
+    def squares(self, game: int) -> set[tuple[int, int]]:
+        """
+        Returns the (x, y) positions of the filled squares
+        of game number 'game's board.
+        """
+        return {
+            (x_pos, y_pos)
+            for y_pos, row in enumerate(self.boards[game].tolist())
+            for x_pos in range(self.columns)
+            if row >> x_pos & 1
+        }
@@ -0,0 +1,185 @@
+"""
+Module with 'BatchGame3D', which plays MANY 3D games at once,
+in lockstep, with numpy. (Look at 'game/batch.py')
+
+The boards are a '(count, floors)' array of floor bitmasks,
+where bit 'y * floor_width + x' of 'boards[game, z]' is the cube
+at (x, y, z) of the game's board, like the floors of 'BitBoard3D'.
+The pieces are their orientations in their 'OrientationTable3D's.
+
+The games play EXACTLY like 'Game3D's with 'PieceGenerator's
+with the same seeds, played frame by frame like 'play_game'
+(look at 'game/simulation.py') plays them,
+with at most one action per game per frame.
+"""
+from functools import lru_cache
+from numpy import zeros, int64, uint16, uint32, uint64
+from game.batch import *
+from game.game_3d import (PIECES_3D, AXII, X_AXIS, Y_AXIS, FLOOR_WIDTH,
+                          FLOORS, Game3D, spawn_templates_3d)
+from game.move_data import *
+
+BATCH_ACTIONS_3D = tuple(("try_move", move) for move in MOVES_3D) + tuple(
+    ("try_rotate", axis, clockwise)
+    for axis in AXII
+    for clockwise in (True, False)
+)
+"""
+The actions a 'BatchGame3D' game can do in a frame.
+Action code 'i + 1' is 'BATCH_ACTIONS_3D[i]',
+and 'NO_ACTION' (0) does nothing.
+
+(The same actions, in the same order, as 'ENGINES["3d"].actions'
+in 'game/simulation.py')
+"""
+
+MAX_FLOOR_WIDTH = 8
+"""
+The floors of the boards are at most uint64 bitmasks,
+so the floors can't be wider than 8 cubes.
+"""
+
+
+def _floor_dtype(floor_width: int) -> type:
+    """
+    Returns the smallest unsigned int type
+    a floor 'floor_width' cubes wide fits in.
+    """
+    for dtype in (uint16, uint32, uint64):
+        if floor_width ** 2 <= dtype(0).itemsize * 8:
+            return dtype
+    raise ValueError(
+        f"The floors can't be wider than {MAX_FLOOR_WIDTH} cubes, "
+        f"not {floor_width}")
+
+
+@lru_cache(maxsize=None)
+def batch_tables_3d(floor_width: int = FLOOR_WIDTH) -> BatchTables:
+    """
+    Returns the 'BatchTables' of 'PIECES_3D', in boards with floors
+    'floor_width' cubes wide, where the orientations are the
+    orientations of the pieces' 'OrientationTable3D's,
+    and rotation 'axis * 2 + clockwise' rotates around 'axis'.
+    (like the bits of 'Game3D.rotation_mask')
+    """
+    dtype = _floor_dtype(floor_width)
+    positions = range(-PIECE_SIZE, floor_width + PIECE_SIZE)
+    templates = spawn_templates_3d(floor_width)
+
+    orientation_count = len(templates[0].table.orientations)
+    shape = (len(PIECES_3D), orientation_count, len(positions) ** 2)
+    masks = zeros(shape + (PIECE_SIZE,), dtype)
+    inside = zeros(shape, bool)
+    heights = zeros(shape[:2], int64)
+    transitions = zeros(shape[:2] + (len(AXII) * 2,), int64)
+
+    for index, template in enumerate(templates):
+        for orientation, compiled in enumerate(template.table.orientations):
+            heights[index, orientation] = compiled.blocks.shape[2]
+            transitions[index, orientation] = [
+                template.table.transitions[orientation][axis][clockwise]
+                for axis in AXII
+                for clockwise in (False, True)
+            ]
+
+            min_dx, min_dy, _, max_dx, max_dy, _ = compiled.bounds
+            for y_index, y_pos in enumerate(positions):
+                for x_index, x_pos in enumerate(positions):
+                    if x_pos + min_dx < 0 or x_pos + max_dx >= floor_width \
+                            or y_pos + min_dy < 0 \
+                            or y_pos + max_dy >= floor_width:
+                        continue
+                    # outside of the walls
+
+                    lateral = y_index * len(positions) + x_index
+                    inside[index, orientation, lateral] = True
+                    for dx, dy, dz in compiled.positions:
+                        masks[index, orientation, lateral, dz] |= dtype(
+                            1 << (y_pos + dy) * floor_width + x_pos + dx)
+                    # (like 'Orientation3D.floor_masks', moved to the
+                    # piece's position)
+
+    return batch_tables(
+        masks, inside, heights, transitions,
+        [template.orientation for template in templates],
+        [template.pos for template in templates],
+        [1, len(positions)],
+        (1 << floor_width ** 2) - 1
+    )
+
+
+class BatchGame3D(BatchGame):
+    """
+    'count' 3D games, played in lockstep.
+    (Read the docstrings of this module and 'BatchGame')
+
+    'self.boards': '(count, floors)' array of the boards' floor masks.
+    'self.pieces': the games' current pieces, as indexes in 'PIECES_3D'.
+    'self.orientations', 'self.pos': the games' current pieces'
+        orientations and positions, like 'Piece3D.orientation'
+        and 'Piece3D.pos' ('self.pos[axis, game]').
+    """
+    OPERATIONS = (
+        ("move", X_AXIS, -1),
+        ("move", X_AXIS, 1),
+        ("move", Y_AXIS, -1),
+        ("move", Y_AXIS, 1),
+        ("hard_drop",),
+        ("soft_drop",),
+    ) + tuple(
+        ("rotate", axis * 2 + clockwise)
+        for axis in AXII
+        for clockwise in (True, False)
+    )
+    # (Look at 'BATCH_ACTIONS_3D')
+
+    def __init__(self, count: int, seed: int = 0,
+                 floor_width: int = FLOOR_WIDTH, floors: int = FLOORS,
+                 generators=None):
+        """
+        Makes 'count' new games, with boards of 'floors' floors,
+        'floor_width' cubes wide (at most 'MAX_FLOOR_WIDTH').
+
+        Game number 'i' picks its pieces with 'generators[i]',
+        or with a new 'PieceGenerator' seeded with 'seed + i'
+        if 'generators' is None (like 'simulate' seeds its games),
+        so it gets the same pieces a 'Game3D' with that generator would.
+        """
+        if floor_width < Game3D.MIN_SIZE or floors < Game3D.MIN_SIZE:
+            raise ValueError(
+                f"The board must be at least {Game3D.MIN_SIZE}x"
+                f"{Game3D.MIN_SIZE}x{Game3D.MIN_SIZE}, "
+                f"not {floor_width}x{floor_width}x{floors}")
+        if floor_width > MAX_FLOOR_WIDTH:
+            raise ValueError(
+                f"The floors can't be wider than {MAX_FLOOR_WIDTH} cubes, "
+                f"not {floor_width}")
+
+        if generators is None:
+            generators = seeded_generators(len(PIECES_3D), count, seed)
+
+        self.floor_width = floor_width
+        self.floors = floors
+        super().__init__(
+            count, floors, batch_tables_3d(floor_width), generators)
+
+    def _score(self, games: ndarray, cleared: ndarray) -> None:
+        """
+        Scores the floors 'games' cleared, like 'Game3D._clear_floors':
+        the games that didn't clear any floors keep their
+        'amount_of_levels_cleared'.
+        """
+        clearing = cleared > 0
+        super()._score(games[clearing], cleared[clearing])
+
+    def cubes(self, game: int) -> set[tuple[int, int, int]]:
+        """
+        Returns the (x, y, z) positions of the filled cubes
+        of game number 'game's board.
+        """
+        return {
+            (bit % self.floor_width, bit // self.floor_width, z_pos)
+            for z_pos, floor in enumerate(self.boards[game].tolist())
+            for bit in range(self.floor_width ** 2)
+            if floor >> bit & 1
+        }
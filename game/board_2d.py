@@ -0,0 +1,728 @@
+"""
+Module with the 2D game's board backends.
+
+A board works exactly like the old '{(x, y): color}' dictionary
+('board[pos]', 'pos in board', 'board.items()', ...),
+so 'main.py' and anything else reading 'Game2D.board' doesn't need to change,
+but it ALSO knows how to answer the questions 'Game2D' asks it
+every frame (does the piece collide? does it fit?) without
+looking up every square of the piece in a dictionary.
+
+'BitBoard2D' stores each row of the board as an int bitmask,
+where bit 'x' of 'rows[y]' is set if the square at (x, y) is filled,
+and keeps the squares' colors in a side table,
+and the amount of filled squares in each row,
+so that full rows are found without looking at their squares.
+It also keeps each COLUMN as an int bitmask, and the board's "skyline"
+(the highest filled square of each column), so that the distance a piece
+can drop is found without moving it down one square at a time.
+
+'PaletteBoard2D' is the compact storage mode: the whole board is ONE
+bytearray of palette indexes (look at 'game/palette.py'),
+for when thousands of boards have to be kept in memory.
+It answers the same questions, just by looking at the bytes.
+
+'ArrayBoard2D' is the N-dimensional array board (look at
+'game/board_nd.py') with 2 dimensions, the same board 'ArrayBoard3D'
+and the 4D game use, answering the same questions with numpy.
+
+Both keep the Zobrist hash of which squares are filled
+(look at 'game/zobrist.py') in 'zobrist_hash', updated with every
+square that is filled or emptied.
+"""
+from abc import abstractmethod
+from collections.abc import Mapping, MutableMapping
+from functools import lru_cache
+from numpy import ndarray, frombuffer, uint8, zeros
+from game.board_nd import ArrayBoardND
+from game.palette import PALETTE, palette_index
+from game.zobrist import cell_keys_2d
+
+
+class Board2D(MutableMapping):
+    """
+    The things every 2D board backend has to do,
+    on top of being a '{(x, y): color}' mapping.
+
+    Pieces are checked against the board with "row masks":
+    tuples of '(dy, mask)', where 'mask' has bit 'dx' set
+    if the piece has a square 'dx' columns right and 'dy' rows down
+    from its top-left corner.
+    (Look at 'Piece2D.row_masks')
+
+    Every backend must define the '@abstractmethod's,
+    or it can't be made.
+    """
+    __slots__ = ()
+
+    row_count: int
+    column_count: int
+    zobrist_hash: int
+    """
+    XOR of the Zobrist keys of all of the filled squares.
+    """
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.items())})"
+
+    def _in_board(self, pos) -> bool:
+        return 0 <= pos[0] < self.column_count \
+            and 0 <= pos[1] < self.row_count
+
+    def _shift_inside(self, mask: int, x_pos: int):
+        """
+        Returns the piece row 'mask' moved 'x_pos' columns right
+        (so that its bits are the board's columns),
+        or None if any of its squares would be outside of the walls.
+        """
+        if x_pos >= 0:
+            mask <<= x_pos
+        elif mask & ((1 << -x_pos) - 1):
+            return None
+        # left wall
+        else:
+            mask >>= -x_pos
+
+        if mask >> self.column_count:
+            return None
+        # right wall
+        return mask
+
+    @abstractmethod
+    def copy(self):
+        """
+        Returns a new board with the same size and squares as 'self'.
+        """
+
+    @abstractmethod
+    def snapshot(self) -> tuple:
+        """
+        Returns the complete state of 'self' as an immutable tuple,
+        that 'self.from_snapshot' can make a new board from.
+        """
+
+    @classmethod
+    @abstractmethod
+    def from_snapshot(cls, state: tuple):
+        """
+        Returns a new board with the state 'snapshot' returned.
+        """
+
+    @abstractmethod
+    def collides(self, row_masks, x_pos: int, y_pos: int) -> bool:
+        """
+        Returns True if a piece with 'row_masks', with its top-left corner
+        at ('x_pos', 'y_pos'), would have a square:
+        left or right of the walls, below the floor,
+        or in a filled square of the board.
+
+        Squares ABOVE the board never collide,
+        like in the original dictionary lookups,
+        where 'board.get' returned None for them.
+        """
+
+    def fits(self, row_masks, x_pos: int, y_pos: int) -> bool:
+        """
+        Returns True if a piece with 'row_masks', with its top-left corner
+        at ('x_pos', 'y_pos'), is COMPLETELY inside the board,
+        and doesn't overlap any of the board's squares.
+        """
+        return y_pos + row_masks[0][0] >= 0 \
+            and not self.collides(row_masks, x_pos, y_pos)
+
+    @abstractmethod
+    def place(self, row_masks, x_pos: int, y_pos: int, color) -> None:
+        """
+        Fills the squares of a piece with 'row_masks', with its top-left
+        corner at ('x_pos', 'y_pos'), with 'color'.
+
+        ASSUMES THE PIECE FITS IN THE BOARD.
+        (Look at 'self.fits')
+        """
+
+    @abstractmethod
+    def clear_rows(self, row_indexes) -> int:
+        """
+        Removes every FULL row in 'row_indexes' from the board,
+        makes the rows above them fall down to fill their space,
+        and returns the amount of rows removed.
+        """
+
+    @abstractmethod
+    def drop_distance(self, bottom, x_pos: int, y_pos: int) -> int:
+        """
+        Returns how many squares a piece with the 'bottom' profile
+        (the (dx, dy) of the lowest square in each of its columns,
+        look at 'Rotation2D.bottom'), with its top-left corner at
+        ('x_pos', 'y_pos'), can move down before it lands.
+
+        Only the lowest square of each of the piece's columns can
+        land on something.
+        (Pieces with gaps in their columns aren't supported)
+
+        ASSUMES THE PIECE FITS IN THE BOARD.
+        """
+
+
+class BitBoard2D(Board2D):
+    """
+    2D board of 'rows' rows and 'columns' columns,
+    stored as one int bitmask per row.
+
+    'self.rows[y]': bitmask of the filled squares in row 'y',
+        (bit 'x' is the square at column 'x')
+    'self.colors[y][x]': color of the square at (x, y),
+        or None if the square is empty.
+    'self.counts[y]': amount of filled squares in row 'y'.
+        (The row is full when it's 'self.column_count')
+    'self.columns[x]': bitmask of the filled squares in column 'x',
+        (bit 'y' is the square at row 'y')
+    'self.heights[x]': the y-pos of the highest filled square in column 'x',
+        or 'self.row_count' if the column is empty.
+        (AKA: the "skyline" of the board)
+    'self.row_hashes[y]': XOR of the Zobrist keys of the filled squares
+        in row 'y', so that only the rows that move in a line clear
+        have to be hashed again.
+    """
+
+    def __init__(self, rows: int, columns: int, squares: Mapping = None):
+        """
+        Makes an empty board with 'rows' rows and 'columns' columns,
+        then fills it with the '{(x, y): color}' items in 'squares',
+        if given.
+        """
+        self.row_count = rows
+        self.column_count = columns
+        self.full_row = (1 << columns) - 1
+
+        self.rows = [0] * rows
+        self.colors = [[None] * columns for _ in range(rows)]
+        self.counts = [0] * rows
+        self.columns = [0] * columns
+        self.heights = [rows] * columns
+
+        self.cell_keys = cell_keys_2d(rows, columns)
+        self.row_hashes = [0] * rows
+        self.zobrist_hash = 0
+
+        if squares is not None:
+            for pos, color in squares.items():
+                self[pos] = color
+
+    def __getitem__(self, pos):
+        if self._in_board(pos) and self.rows[pos[1]] >> pos[0] & 1:
+            return self.colors[pos[1]][pos[0]]
+        raise KeyError(pos)
+
+    def __setitem__(self, pos, color):
+        if not self._in_board(pos):
+            raise ValueError(
+                f"Square {pos} is outside of the "
+                + f"{self.column_count}x{self.row_count} board!"
+            )
+        x_pos, y_pos = pos
+        if not self.rows[y_pos] >> x_pos & 1:
+            self.rows[y_pos] |= 1 << x_pos
+            self.counts[y_pos] += 1
+            self.columns[x_pos] |= 1 << y_pos
+            if y_pos < self.heights[x_pos]:
+                self.heights[x_pos] = y_pos
+            self.row_hashes[y_pos] ^= self.cell_keys[y_pos][x_pos]
+            self.zobrist_hash ^= self.cell_keys[y_pos][x_pos]
+        self.colors[y_pos][x_pos] = color
+
+    def __delitem__(self, pos):
+        if not (self._in_board(pos) and self.rows[pos[1]] >> pos[0] & 1):
+            raise KeyError(pos)
+        x_pos, y_pos = pos
+        self.rows[y_pos] &= ~(1 << x_pos)
+        self.colors[y_pos][x_pos] = None
+        self.counts[y_pos] -= 1
+        self.columns[x_pos] &= ~(1 << y_pos)
+        self.heights[x_pos] = self._highest_square(self.columns[x_pos])
+        self.row_hashes[y_pos] ^= self.cell_keys[y_pos][x_pos]
+        self.zobrist_hash ^= self.cell_keys[y_pos][x_pos]
+
+    def _highest_square(self, column: int) -> int:
+        """
+        Returns the y-pos of the highest filled square in the 'column'
+        bitmask, or 'self.row_count' if it's empty.
+        """
+        if not column:
+            return self.row_count
+        return (column & -column).bit_length() - 1
+        # 'column & -column' is the lowest set bit.
+
+    def __iter__(self):
+        for y_pos, row in enumerate(self.rows):
+            x_pos = 0
+            while row:
+                if row & 1:
+                    yield x_pos, y_pos
+                row >>= 1
+                x_pos += 1
+
+    def __len__(self):
+        return sum(self.counts)
+
+    def copy(self):
+        board = type(self).__new__(type(self))
+        board.row_count = self.row_count
+        board.column_count = self.column_count
+        board.full_row = self.full_row
+        board.rows = self.rows.copy()
+        board.colors = [row.copy() for row in self.colors]
+        board.counts = self.counts.copy()
+        board.columns = self.columns.copy()
+        board.heights = self.heights.copy()
+        board.cell_keys = self.cell_keys
+        board.row_hashes = self.row_hashes.copy()
+        board.zobrist_hash = self.zobrist_hash
+        return board
+
+    def snapshot(self) -> tuple:
+        return (
+            self.row_count, self.column_count,
+            tuple(self.rows), tuple(map(tuple, self.colors)),
+            tuple(self.counts), tuple(self.columns), tuple(self.heights),
+            tuple(self.row_hashes), self.zobrist_hash
+        )
+
+    @classmethod
+    def from_snapshot(cls, state: tuple):
+        board = cls.__new__(cls)
+        board.row_count, board.column_count, \
+            rows, colors, counts, columns, heights, \
+            row_hashes, board.zobrist_hash = state
+        board.full_row = (1 << board.column_count) - 1
+        board.rows = list(rows)
+        board.colors = list(map(list, colors))
+        board.counts = list(counts)
+        board.columns = list(columns)
+        board.heights = list(heights)
+        board.cell_keys = cell_keys_2d(board.row_count, board.column_count)
+        board.row_hashes = list(row_hashes)
+        return board
+
+    def _row_hash(self, row: int) -> int:
+        """
+        Returns the XOR of the Zobrist keys of the filled squares
+        of 'row', from its bitmask.
+        """
+        keys = self.cell_keys[row]
+        mask = self.rows[row]
+        row_hash = 0
+        x_pos = 0
+        while mask:
+            if mask & 1:
+                row_hash ^= keys[x_pos]
+            mask >>= 1
+            x_pos += 1
+        return row_hash
+
+    def collides(self, row_masks, x_pos: int, y_pos: int) -> bool:
+        for dy, mask in row_masks:
+            row = y_pos + dy
+
+            if row >= self.row_count:
+                return True
+            # floor
+
+            if x_pos >= 0:
+                mask <<= x_pos
+            elif mask & ((1 << -x_pos) - 1):
+                return True
+            # left wall
+            else:
+                mask >>= -x_pos
+
+            if mask > self.full_row:
+                return True
+            # right wall
+
+            if row >= 0 and self.rows[row] & mask:
+                return True
+        return False
+
+    def place(self, row_masks, x_pos: int, y_pos: int, color) -> None:
+        for dy, mask in row_masks:
+            row = y_pos + dy
+            colors = self.colors[row]
+
+            new_squares = (
+                mask << x_pos if x_pos >= 0 else mask >> -x_pos
+            ) & ~self.rows[row]
+            self.rows[row] |= new_squares
+            self.counts[row] += bin(new_squares).count("1")
+
+            keys = self.cell_keys[row]
+            column = x_pos
+            while mask:
+                if mask & 1:
+                    colors[column] = color
+                    if not self.columns[column] >> row & 1:
+                        self.columns[column] |= 1 << row
+                        if row < self.heights[column]:
+                            self.heights[column] = row
+                        self.row_hashes[row] ^= keys[column]
+                        self.zobrist_hash ^= keys[column]
+                mask >>= 1
+                column += 1
+
+    def clear_rows(self, row_indexes) -> int:
+        """
+        The rows are removed and added as whole row objects
+        (masks, color lists, counts), in one pass,
+        instead of moving the squares one by one.
+        """
+        full_rows = sorted(
+            row for row in set(row_indexes)
+            if 0 <= row < self.row_count
+            and self.counts[row] == self.column_count
+        )
+        if not full_rows:
+            return 0
+
+        top = min(self.heights)
+        # highest filled square of the board, the rows above it are empty.
+
+        for row in reversed(full_rows):
+            del self.rows[row]
+            del self.colors[row]
+            del self.counts[row]
+        # deleting from the bottom up keeps the indexes
+        # of the rows still to delete valid.
+
+        amount = len(full_rows)
+        self.rows[:0] = [0] * amount
+        self.colors[:0] = [[None] * self.column_count for _ in range(amount)]
+        self.counts[:0] = [0] * amount
+        # new empty rows at the top
+
+        for row in range(top, full_rows[-1] + 1):
+            self.zobrist_hash ^= self.row_hashes[row]
+            self.row_hashes[row] = \
+                self._row_hash(row) if row >= amount else 0
+            self.zobrist_hash ^= self.row_hashes[row]
+        # Only the rows between the top of the stack and
+        # the lowest cleared row moved, so only their squares' keys change.
+        # (the rows above the stack are empty before AND after)
+
+        for x_pos, column in enumerate(self.columns):
+            for row in full_rows:
+                column = (column >> (row + 1) << (row + 1)) \
+                    | (column & ((1 << row) - 1)) << 1
+            # remove the row's bit, and move the bits above it one down.
+            # (going from the top row down, removing a row doesn't move
+            # the bits of the rows below it)
+            self.columns[x_pos] = column
+            self.heights[x_pos] = self._highest_square(column)
+
+        return amount
+
+    def drop_distance(self, bottom, x_pos: int, y_pos: int) -> int:
+        """
+        Looks up the first filled square below the lowest square
+        of each of the piece's columns in the column bitmasks,
+        instead of moving the piece down one square at a time.
+        """
+        distance = self.row_count
+
+        for dx, dy in bottom:
+            row = y_pos + dy
+            column = self.columns[x_pos + dx]
+
+            if row >= 0:
+                column >>= row + 1
+            # only the squares below the piece's square,
+            # 'row + 1' becomes bit 0.
+            else:
+                column <<= -row - 1
+
+            below = self.row_count - row - 1 if not column \
+                else (column & -column).bit_length() - 1
+            # empty squares between the piece's square
+            # and the next filled square (or the floor).
+
+            if below < distance:
+                distance = below
+        return distance
+
+
+class PaletteBoard2D(Board2D):
+    """
+    Compact 2D board of 'rows' rows and 'columns' columns,
+    stored as ONE bytearray of palette indexes.
+
+    'self.cells[y * self.column_count + x]': palette index of the color
+        of the square at (x, y), or 0 if the square is empty.
+        (Look at 'game/palette.py')
+
+    It keeps nothing else (no masks, counts or skyline),
+    so it's much slower to play on than 'BitBoard2D',
+    but it takes about a byte per square.
+    """
+    __slots__ = ("row_count", "column_count", "cells", "zobrist_hash")
+
+    def __init__(self, rows: int, columns: int, squares: Mapping = None):
+        """
+        Makes an empty board with 'rows' rows and 'columns' columns,
+        then fills it with the '{(x, y): color}' items in 'squares',
+        if given.
+        """
+        self.row_count = rows
+        self.column_count = columns
+        self.cells = bytearray(rows * columns)
+        self.zobrist_hash = 0
+
+        if squares is not None:
+            for pos, color in squares.items():
+                self[pos] = color
+
+    def __getitem__(self, pos):
+        if self._in_board(pos):
+            index = self.cells[pos[1] * self.column_count + pos[0]]
+            if index:
+                return PALETTE[index]
+        raise KeyError(pos)
+
+    def __setitem__(self, pos, color):
+        if not self._in_board(pos):
+            raise ValueError(
+                f"Square {pos} is outside of the "
+                + f"{self.column_count}x{self.row_count} board!"
+            )
+        cell = pos[1] * self.column_count + pos[0]
+        if not self.cells[cell]:
+            self.zobrist_hash ^= \
+                cell_keys_2d(self.row_count, self.column_count)[pos[1]][pos[0]]
+        self.cells[cell] = palette_index(color)
+
+    def __delitem__(self, pos):
+        if not (self._in_board(pos)
+                and self.cells[pos[1] * self.column_count + pos[0]]):
+            raise KeyError(pos)
+        self.cells[pos[1] * self.column_count + pos[0]] = 0
+        self.zobrist_hash ^= \
+            cell_keys_2d(self.row_count, self.column_count)[pos[1]][pos[0]]
+
+    def __iter__(self):
+        for index, cell in enumerate(self.cells):
+            if cell:
+                yield divmod(index, self.column_count)[::-1]
+
+    def __len__(self):
+        return len(self.cells) - self.cells.count(0)
+
+    def copy(self):
+        board = type(self).__new__(type(self))
+        board.row_count = self.row_count
+        board.column_count = self.column_count
+        board.cells = self.cells.copy()
+        board.zobrist_hash = self.zobrist_hash
+        return board
+
+    def snapshot(self) -> tuple:
+        return self.row_count, self.column_count, bytes(self.cells), \
+            self.zobrist_hash
+
+    @classmethod
+    def from_snapshot(cls, state: tuple):
+        board = cls.__new__(cls)
+        board.row_count, board.column_count, cells, board.zobrist_hash = \
+            state
+        board.cells = bytearray(cells)
+        return board
+
+    def _rows_hash(self, rows) -> int:
+        """
+        Returns the XOR of the Zobrist keys of the filled squares
+        of the rows in 'rows'.
+        """
+        keys = cell_keys_2d(self.row_count, self.column_count)
+        rows_hash = 0
+        for row in rows:
+            start = row * self.column_count
+            for x_pos, cell in enumerate(
+                    self.cells[start:start + self.column_count]):
+                if cell:
+                    rows_hash ^= keys[row][x_pos]
+        return rows_hash
+
+    def _row_overlaps(self, row: int, mask: int) -> bool:
+        """
+        Returns True if any square of 'row' in the board's
+        column 'mask' is filled.
+        """
+        cells = self.cells
+        index = row * self.column_count
+        while mask:
+            if mask & 1 and cells[index]:
+                return True
+            mask >>= 1
+            index += 1
+        return False
+
+    def collides(self, row_masks, x_pos: int, y_pos: int) -> bool:
+        for dy, mask in row_masks:
+            row = y_pos + dy
+
+            if row >= self.row_count:
+                return True
+            # floor
+
+            mask = self._shift_inside(mask, x_pos)
+            if mask is None:
+                return True
+            # walls
+
+            if row >= 0 and self._row_overlaps(row, mask):
+                return True
+        return False
+
+    def place(self, row_masks, x_pos: int, y_pos: int, color) -> None:
+        index = palette_index(color)
+        keys = cell_keys_2d(self.row_count, self.column_count)
+
+        for dy, mask in row_masks:
+            row = y_pos + dy
+            cell = row * self.column_count + x_pos
+            column = x_pos
+            while mask:
+                if mask & 1:
+                    if not self.cells[cell]:
+                        self.zobrist_hash ^= keys[row][column]
+                    self.cells[cell] = index
+                mask >>= 1
+                cell += 1
+                column += 1
+
+    def clear_rows(self, row_indexes) -> int:
+        """
+        A row is full if there's no 0 in its slice of 'self.cells',
+        and the full rows are deleted as whole slices.
+        """
+        COLUMNS = self.column_count
+
+        full_rows = sorted(
+            row for row in set(row_indexes)
+            if 0 <= row < self.row_count
+            and self.cells.find(0, row * COLUMNS, (row + 1) * COLUMNS) == -1
+        )
+        if not full_rows:
+            return 0
+
+        top = (len(self.cells) - len(self.cells.lstrip(b"\0"))) // COLUMNS
+        # row of the first filled square, the rows above it are empty.
+
+        MOVED_ROWS = range(top, full_rows[-1] + 1)
+        # Only the rows between the top of the stack and
+        # the lowest cleared row move, so only their squares' keys change.
+        self.zobrist_hash ^= self._rows_hash(MOVED_ROWS)
+
+        for row in reversed(full_rows):
+            del self.cells[row * COLUMNS:(row + 1) * COLUMNS]
+        self.cells[:0] = bytes(len(full_rows) * COLUMNS)
+        # new empty rows at the top
+
+        self.zobrist_hash ^= self._rows_hash(MOVED_ROWS)
+
+        return len(full_rows)
+
+    def drop_distance(self, bottom, x_pos: int, y_pos: int) -> int:
+        """
+        Looks down each of the piece's columns, one square at a time,
+        from its lowest square.
+        """
+        distance = self.row_count
+
+        for dx, dy in bottom:
+            row = y_pos + dy + 1
+            while row < self.row_count and (
+                    row < 0
+                    or not self.cells[row * self.column_count + x_pos + dx]):
+                row += 1
+
+            below = row - (y_pos + dy) - 1
+            if below < distance:
+                distance = below
+        return distance
+
+
+@lru_cache(maxsize=None)
+def row_masks_blocks(row_masks) -> ndarray:
+    """
+    Returns the piece with 'row_masks' (look at 'Piece2D.row_masks')
+    as a read-only blocks matrix, 'blocks[dx, dy]',
+    the format 'ArrayBoardND' checks pieces with.
+    """
+    width = max(mask.bit_length() for _, mask in row_masks)
+    blocks = zeros((width, row_masks[-1][0] + 1), uint8)
+
+    for dy, mask in row_masks:
+        for dx in range(width):
+            if mask >> dx & 1:
+                blocks[dx, dy] = 1
+
+    blocks.flags.writeable = False
+    return blocks
+
+
+class ArrayBoard2D(ArrayBoardND, Board2D):
+    """
+    2D board stored as a numpy array of palette indexes.
+
+    'self.cells[x, y]': palette index of the color of the square
+        at (x, y), or 0 if the square is empty.
+        (Look at 'game/palette.py')
+
+    It's the N-dimensional array board (look at 'game/board_nd.py')
+    with 2 dimensions, where the rows are the levels,
+    and the pieces' row masks are turned into blocks matrices
+    (look at 'row_masks_blocks'), so it checks pieces,
+    finds the full rows and makes rows fall with the same code
+    as the boards of every other game mode.
+    """
+    __slots__ = ()
+
+    CELL_FEATURE = "2d-cell"
+    # the same keys as 'cell_keys_2d'
+    OPEN_TOP = True
+
+    def __init__(self, rows: int, columns: int, squares: Mapping = None):
+        """
+        Makes an empty board with 'rows' rows and 'columns' columns,
+        then fills it with the '{(x, y): color}' items in 'squares',
+        if given.
+        """
+        ArrayBoardND.__init__(self, (columns, rows), squares)
+
+    @property
+    def row_count(self) -> int:
+        return self.extents[1]
+
+    @property
+    def column_count(self) -> int:
+        return self.extents[0]
+
+    def snapshot(self) -> tuple:
+        return self.extents, self.cells.tobytes(), self.zobrist_hash
+
+    @classmethod
+    def from_snapshot(cls, state: tuple):
+        board = cls.__new__(cls)
+        board.extents, cells, board.zobrist_hash = state
+        board.cells = frombuffer(cells, uint8).reshape(board.extents).copy()
+        return board
+
+    def collides(self, row_masks, x_pos: int, y_pos: int) -> bool:
+        return self._collides(row_masks_blocks(row_masks), (x_pos, y_pos))
+
+    def place(self, row_masks, x_pos: int, y_pos: int, color) -> None:
+        self._place(row_masks_blocks(row_masks), (x_pos, y_pos), color)
+
+    def clear_rows(self, row_indexes) -> int:
+        return self.clear_levels(row_indexes)
+
+    def drop_distance(self, bottom, x_pos: int, y_pos: int) -> int:
+        return self._drop_distance(bottom, (x_pos, y_pos))
@@ -0,0 +1,652 @@
+"""
+Module with the 3D game's board backends.
+
+Like the 2D boards (look at 'game/board_2d.py'), a board works exactly
+like the old '{(x, y, z): color}' dictionary, but it ALSO knows how to
+answer the questions 'Game3D' asks it every frame (does the piece collide?
+which floors are full?) without 'Game3D' looking up every cube of the piece.
+
+'DictBoard3D' is the '{(x, y, z): color}' dictionary 'Game3D' used
+to store its board in, and answers those questions by looking up
+the piece's cubes in itself. It can ALSO hold cubes outside of the board.
+
+'ArrayBoard3D' stores the board as a '(floor_width, floor_width, floors)'
+numpy array of palette indexes (look at 'game/palette.py'),
+so that checking a piece is ONE AND between the piece's blocks matrix
+and the slice of the board it's in, and clearing floors is
+ONE 'all' over the floors and ONE shift of the array.
+It's the N-dimensional board core (look at 'game/board_nd.py')
+the array boards of every game mode share.
+
+'BitBoard3D' stores each floor as an int bitmask, like 'BitBoard2D'
+stores rows, so that a full floor is ONE comparison,
+and checking a piece is ONE AND for each floor the piece is in.
+It's the default, since it also keeps the height map of its columns,
+so hard drops and ghost pieces don't look down one cube at a time.
+
+Both keep the Zobrist hash of which cubes are filled
+(look at 'game/zobrist.py') in 'zobrist_hash',
+updated with every cube that is added or removed.
+"""
+from abc import abstractmethod
+from collections.abc import Mapping, MutableMapping
+from functools import lru_cache
+from game.board_nd import ArrayBoardND
+from game.zobrist import cell_key_3d
+
+
+class Board3D(MutableMapping):
+    """
+    The things every 3D board backend has to do,
+    on top of being a '{(x, y, z): color}' mapping.
+
+    Pieces are checked against the board with their current orientation
+    (look at 'Orientation3D', with the piece's 'blocks' matrix
+    and its blocks' 'positions' from its left-front-top corner),
+    and the position of that corner in the board.
+
+    Every backend must define the '@abstractmethod's,
+    or it can't be made.
+    """
+    __slots__ = ()
+
+    floor_width: int
+    floors: int
+    zobrist_hash: int
+    """
+    XOR of the Zobrist keys of all of the filled cubes.
+    """
+
+    @abstractmethod
+    def collides(self, orientation, pos) -> bool:
+        """
+        Returns True if a piece in 'orientation',
+        with its left-front-top corner at 'pos',
+        would have a cube outside of the board,
+        or in a filled cube of the board.
+        """
+
+    def collision_mask(self, orientations, pos, blocks=None) -> int:
+        """
+        Returns a bitmask where bit 'i' is set if a piece in
+        'orientations[i]', with its left-front-top corner at 'pos',
+        collides. (Look at 'self.collides')
+
+        'blocks', if given, is the stack of the orientations'
+        blocks matrices (all the same size, like
+        'OrientationTable3D.rotation_blocks'),
+        for the backends that check all of them at once.
+        """
+        mask = 0
+        for bit, orientation in enumerate(orientations):
+            if self.collides(orientation, pos):
+                mask |= 1 << bit
+        return mask
+
+    @abstractmethod
+    def place(self, orientation, pos, color) -> None:
+        """
+        Fills the cubes of a piece in 'orientation',
+        with its left-front-top corner at 'pos', with 'color'.
+
+        ASSUMES THE PIECE IS INSIDE THE BOARD.
+        (Look at 'self.collides')
+        """
+
+    @abstractmethod
+    def clear_floors(self, floor_indexes) -> int:
+        """
+        Removes every FULL floor in 'floor_indexes' from the board,
+        makes the floors above them fall down to fill their space,
+        and returns the amount of floors removed.
+        """
+
+    @abstractmethod
+    def drop_distance(self, orientation, pos) -> int:
+        """
+        Returns how many floors a piece in 'orientation',
+        with its left-front-top corner at 'pos', can move down
+        before it lands on a cube or the floor,
+        looking only below the lowest block of each of its columns.
+        (Look at 'Orientation3D.bottom')
+
+        ASSUMES THE PIECE IS INSIDE THE BOARD.
+        """
+
+
+class DictBoard3D(dict, Board3D):
+    """
+    '{(x, y, z): color}' dictionary of the cubes in a 3D board,
+    with the Zobrist hash of its filled positions in 'self.zobrist_hash'.
+
+    All of the ways of adding or removing cubes
+    ('board[pos] = color', 'del board[pos]', 'pop', 'update', ...)
+    update the hash. Reading it is as fast as reading a dict.
+
+    'self.floor_counts[z]': the amount of cubes in floor 'z'
+        that are inside of the board's floors,
+        so that a floor is full when its count is 'floor_width ** 2'.
+    """
+
+    def __init__(self, floor_width: int, floors: int, squares=()):
+        """
+        Makes an empty board 'floor_width' cubes wide and deep,
+        and 'floors' floors tall, then fills it with the
+        '{(x, y, z): color}' items in 'squares', if given.
+
+        Cubes outside of the board are kept too, like in a dict.
+        """
+        dict.__init__(self)
+        self.floor_width = floor_width
+        self.floors = floors
+        self.floor_counts = {}
+        self.zobrist_hash = 0
+        self.update(squares)
+
+    def _count(self, pos, amount: int) -> None:
+        """
+        Adds 'amount' to the count of the floor of 'pos',
+        if 'pos' is inside of the board's floors.
+        """
+        x_pos, y_pos, z_pos = pos
+        if 0 <= x_pos < self.floor_width and 0 <= y_pos < self.floor_width:
+            self.floor_counts[z_pos] = \
+                self.floor_counts.get(z_pos, 0) + amount
+
+    def __setitem__(self, pos, color):
+        if pos not in self:
+            self.zobrist_hash ^= cell_key_3d(pos)
+            self._count(pos, 1)
+        dict.__setitem__(self, pos, color)
+
+    def __delitem__(self, pos):
+        dict.__delitem__(self, pos)
+        self.zobrist_hash ^= cell_key_3d(pos)
+        self._count(pos, -1)
+
+    def pop(self, pos, *default):
+        if pos in self:
+            self.zobrist_hash ^= cell_key_3d(pos)
+            self._count(pos, -1)
+        return dict.pop(self, pos, *default)
+
+    def popitem(self):
+        pos, color = dict.popitem(self)
+        self.zobrist_hash ^= cell_key_3d(pos)
+        self._count(pos, -1)
+        return pos, color
+
+    def setdefault(self, pos, color=None):
+        if pos not in self:
+            self[pos] = color
+        return self[pos]
+
+    def update(self, squares=(), **kwargs):
+        if hasattr(squares, "keys"):
+            for pos in squares.keys():
+                self[pos] = squares[pos]
+        else:
+            for pos, color in squares:
+                self[pos] = color
+        for pos, color in kwargs.items():
+            self[pos] = color
+
+    def clear(self):
+        dict.clear(self)
+        self.floor_counts.clear()
+        self.zobrist_hash = 0
+
+    def copy(self):
+        board = type(self).__new__(type(self))
+        dict.update(board, self)
+        board.floor_width = self.floor_width
+        board.floors = self.floors
+        board.floor_counts = self.floor_counts.copy()
+        board.zobrist_hash = self.zobrist_hash
+        return board
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict.__repr__(self)})"
+
+    def collides(self, orientation, pos) -> bool:
+        x_pos, y_pos, z_pos = pos
+        for dx, dy, dz in orientation.positions:
+            block_pos = (x_pos + dx, y_pos + dy, z_pos + dz)
+            if block_pos in self \
+                    or not 0 <= block_pos[0] < self.floor_width \
+                    or not 0 <= block_pos[1] < self.floor_width \
+                    or not 0 <= block_pos[2] < self.floors:
+                return True
+        return False
+
+    def place(self, orientation, pos, color) -> None:
+        x_pos, y_pos, z_pos = pos
+        for dx, dy, dz in orientation.positions:
+            self[(x_pos + dx, y_pos + dy, z_pos + dz)] = color
+
+    def clear_floors(self, floor_indexes) -> int:
+        """
+        The full floors are found with 'self.floor_counts',
+        and only the cubes of the cleared floors and of the floors
+        above them are moved, looking up the positions of the floors
+        that 'self.floor_counts' says have cubes in them.
+        The cubes below the lowest cleared floor aren't touched,
+        so clearing floors doesn't get slower as the well gets bigger.
+        """
+        area = self.floor_width * self.floor_width
+        deleted_floors = {
+            z_pos for z_pos in floor_indexes
+            if 0 <= z_pos < self.floors
+            and self.floor_counts.get(z_pos, 0) == area
+        }
+        if not deleted_floors:
+            return 0
+        # no cleared floors, so no "landing" of floors either.
+
+        landing_floor = max(deleted_floors)
+        # lowest deleted floor is where all the floors with gunk in them will
+        # 'land' on.
+
+        landing_floors = {}
+        for gunk_floor in range(landing_floor, -1, -1):
+            if gunk_floor not in deleted_floors:
+                landing_floors[gunk_floor] = landing_floor
+                landing_floor -= 1
+        # where each floor higher than the cleared floors "lands"
+
+        keys = floor_keys_3d(self.floor_width, self.floors)
+        moved_cubes = {}
+        zobrist_hash = self.zobrist_hash
+        for z_pos in range(max(deleted_floors), -1, -1):
+            if not self.floor_counts.get(z_pos):
+                continue
+            # (empty floors have nothing to move)
+
+            new_z_pos = landing_floors.get(z_pos)
+            floor_keys = keys[z_pos]
+            for bit in range(area):
+                y_pos, x_pos = divmod(bit, self.floor_width)
+                color = dict.pop(self, (x_pos, y_pos, z_pos), self)
+                if color is self:
+                    continue
+                # (the board is never a cube's color, so it means "empty")
+
+                zobrist_hash ^= floor_keys[bit]
+                if new_z_pos is not None:
+                    zobrist_hash ^= keys[new_z_pos][bit]
+                    moved_cubes[(x_pos, y_pos, new_z_pos)] = color
+
+        dict.update(self, moved_cubes)
+        self.zobrist_hash = zobrist_hash
+        # The moved cubes are added back in their new floors at once,
+        # after every cube of those floors was taken out.
+
+        floor_counts = {
+            z_pos: count for z_pos, count in self.floor_counts.items()
+            if z_pos not in deleted_floors and z_pos not in landing_floors
+        }
+        for gunk_floor, landing_floor in landing_floors.items():
+            floor_counts[landing_floor] = self.floor_counts.get(gunk_floor, 0)
+        self.floor_counts = floor_counts
+
+        return len(deleted_floors)
+
+    def drop_distance(self, orientation, pos) -> int:
+        """
+        Looks down each of the piece's columns, one cube at a time,
+        from its lowest block.
+        """
+        x_pos, y_pos, z_pos = pos
+        distance = self.floors
+
+        for dx, dy, dz in orientation.bottom:
+            column_x, column_y = x_pos + dx, y_pos + dy
+            floor = z_pos + dz + 1
+            while floor < self.floors \
+                    and (column_x, column_y, floor) not in self:
+                floor += 1
+
+            below = floor - (z_pos + dz) - 1
+            if below < distance:
+                distance = below
+        return distance
+
+
+class ArrayBoard3D(ArrayBoardND, Board3D):
+    """
+    3D board stored as a numpy array of palette indexes.
+
+    'self.cells[x, y, z]': palette index of the color of the cube
+        at (x, y, z), or 0 if the cube is empty.
+        (Look at 'game/palette.py')
+
+    It's the N-dimensional array board (look at 'game/board_nd.py')
+    with 3 dimensions, where the floors are the levels,
+    so it checks pieces, finds the full floors and makes floors fall
+    with the same code as the boards of every other game mode.
+
+    The board can't hold cubes outside of it,
+    so adding them raises ValueError.
+    """
+    __slots__ = ()
+
+    CELL_FEATURE = "3d-cell"
+    # the same keys as 'cell_key_3d'
+
+    def __init__(self, floor_width: int, floors: int,
+                 squares: Mapping = None):
+        """
+        Makes an empty board 'floor_width' cubes wide and deep,
+        and 'floors' floors tall, then fills it with the
+        '{(x, y, z): color}' items in 'squares', if given.
+        """
+        ArrayBoardND.__init__(
+            self, (floor_width, floor_width, floors), squares)
+
+    @property
+    def floor_width(self) -> int:
+        return self.extents[0]
+
+    @property
+    def floors(self) -> int:
+        return self.extents[-1]
+
+    def clear_floors(self, floor_indexes) -> int:
+        return self.clear_levels(floor_indexes)
+
+
+@lru_cache(maxsize=None)
+def floor_keys_3d(floor_width: int,
+                  floors: int) -> tuple[tuple[int, ...], ...]:
+    """
+    Returns the keys of the cubes of a 3D board, as
+    'keys[z][y * floor_width + x]', with the same keys as 'cell_key_3d'.
+    """
+    return tuple(
+        tuple(
+            cell_key_3d((x_pos, y_pos, z_pos))
+            for y_pos in range(floor_width)
+            for x_pos in range(floor_width)
+        )
+        for z_pos in range(floors)
+    )
+
+
+class BitBoard3D(Board3D):
+    """
+    3D board that stores each floor as an int bitmask,
+    where bit 'y * floor_width + x' of 'masks[z]' is set
+    if the cube at (x, y, z) is filled.
+    (a 4x4 floor fits in 16 bits, wider floors just use bigger ints)
+
+    'self.colors[z][y * floor_width + x]': the color of the cube
+        at (x, y, z), or None if it's empty.
+    'self.floor_hashes[z]': XOR of the Zobrist keys of the filled cubes
+        of floor 'z', so that floors that fall are rehashed
+        from their masks, without looking at their colors.
+    'self.columns[y * floor_width + x]': bitmask of the (x, y) column,
+        where bit 'z' is set if the cube at (x, y, z) is filled.
+    'self.heights[y * floor_width + x]': the height map,
+        z-pos of the highest filled cube of the (x, y) column,
+        or 'self.floors' if it's empty.
+
+    A floor is full when its mask is 'self.full_floor',
+    and a piece collides when any of its floors' footprints
+    (look at 'Orientation3D.floor_masks') AND the board's floor
+    it's in isn't 0.
+
+    The board can't hold cubes outside of it,
+    so adding them raises ValueError.
+    """
+    __slots__ = ("floor_width", "floors", "full_floor", "masks", "colors",
+                 "columns", "heights", "floor_keys", "floor_hashes",
+                 "zobrist_hash")
+
+    def __init__(self, floor_width: int, floors: int,
+                 squares: Mapping = None):
+        """
+        Makes an empty board 'floor_width' cubes wide and deep,
+        and 'floors' floors tall, then fills it with the
+        '{(x, y, z): color}' items in 'squares', if given.
+        """
+        self.floor_width = floor_width
+        self.floors = floors
+        self.full_floor = (1 << floor_width * floor_width) - 1
+
+        self.masks = [0] * floors
+        self.colors = [[None] * floor_width * floor_width
+                       for _ in range(floors)]
+        self.columns = [0] * floor_width * floor_width
+        self.heights = [floors] * floor_width * floor_width
+
+        self.floor_keys = floor_keys_3d(floor_width, floors)
+        self.floor_hashes = [0] * floors
+        self.zobrist_hash = 0
+
+        if squares is not None:
+            for pos, color in squares.items():
+                self[pos] = color
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.items())})"
+
+    def _in_board(self, pos) -> bool:
+        return 0 <= pos[0] < self.floor_width \
+            and 0 <= pos[1] < self.floor_width \
+            and 0 <= pos[2] < self.floors
+
+    def __getitem__(self, pos):
+        if self._in_board(pos):
+            x_pos, y_pos, z_pos = pos
+            bit = y_pos * self.floor_width + x_pos
+            if self.masks[z_pos] >> bit & 1:
+                return self.colors[z_pos][bit]
+        raise KeyError(pos)
+
+    def __setitem__(self, pos, color):
+        if not self._in_board(pos):
+            raise ValueError(
+                f"Cube {pos} is outside of the {self.floor_width}x"
+                + f"{self.floor_width}x{self.floors} board!"
+            )
+        x_pos, y_pos, z_pos = pos
+        bit = y_pos * self.floor_width + x_pos
+
+        if not self.masks[z_pos] >> bit & 1:
+            self.masks[z_pos] |= 1 << bit
+            self.columns[bit] |= 1 << z_pos
+            if z_pos < self.heights[bit]:
+                self.heights[bit] = z_pos
+            self.floor_hashes[z_pos] ^= self.floor_keys[z_pos][bit]
+            self.zobrist_hash ^= self.floor_keys[z_pos][bit]
+        self.colors[z_pos][bit] = color
+
+    def __delitem__(self, pos):
+        if not self._in_board(pos):
+            raise KeyError(pos)
+        x_pos, y_pos, z_pos = pos
+        bit = y_pos * self.floor_width + x_pos
+
+        if not self.masks[z_pos] >> bit & 1:
+            raise KeyError(pos)
+        self.masks[z_pos] &= ~(1 << bit)
+        self.colors[z_pos][bit] = None
+        self.columns[bit] &= ~(1 << z_pos)
+        self.heights[bit] = self._highest_cube(self.columns[bit])
+        self.floor_hashes[z_pos] ^= self.floor_keys[z_pos][bit]
+        self.zobrist_hash ^= self.floor_keys[z_pos][bit]
+
+    def _highest_cube(self, column: int) -> int:
+        """
+        Returns the z-pos of the highest filled cube in the 'column'
+        bitmask, or 'self.floors' if it's empty.
+        """
+        if not column:
+            return self.floors
+        return (column & -column).bit_length() - 1
+        # 'column & -column' is the lowest set bit.
+
+    def __iter__(self):
+        for z_pos, mask in enumerate(self.masks):
+            bit = 0
+            while mask:
+                if mask & 1:
+                    yield (bit % self.floor_width,
+                           bit // self.floor_width,
+                           z_pos)
+                mask >>= 1
+                bit += 1
+
+    def __len__(self):
+        return sum(bin(mask).count("1") for mask in self.masks)
+
+    def copy(self):
+        board = BitBoard3D.__new__(BitBoard3D)
+        board.floor_width = self.floor_width
+        board.floors = self.floors
+        board.full_floor = self.full_floor
+        board.masks = self.masks.copy()
+        board.colors = [colors.copy() for colors in self.colors]
+        board.columns = self.columns.copy()
+        board.heights = self.heights.copy()
+        board.floor_keys = self.floor_keys
+        board.floor_hashes = self.floor_hashes.copy()
+        board.zobrist_hash = self.zobrist_hash
+        return board
+
+    def _floor_hash(self, z_pos: int) -> int:
+        """
+        Returns the XOR of the Zobrist keys of the filled cubes
+        of floor 'z_pos', from its bitmask.
+        """
+        keys = self.floor_keys[z_pos]
+        mask = self.masks[z_pos]
+        floor_hash = 0
+        while mask:
+            lowest_bit = mask & -mask
+            floor_hash ^= keys[lowest_bit.bit_length() - 1]
+            mask ^= lowest_bit
+        # only looks at the filled cubes, not at the whole floor.
+        return floor_hash
+
+    def _outside(self, orientation, pos) -> bool:
+        """
+        Returns True if any block of a piece in 'orientation',
+        with its left-front-top corner at 'pos', is outside of the board.
+        """
+        x_pos, y_pos, z_pos = pos
+        min_dx, min_dy, min_dz, max_dx, max_dy, max_dz = orientation.bounds
+        return x_pos + min_dx < 0 or x_pos + max_dx >= self.floor_width \
+            or y_pos + min_dy < 0 or y_pos + max_dy >= self.floor_width \
+            or z_pos + min_dz < 0 or z_pos + max_dz >= self.floors
+
+    def collides(self, orientation, pos) -> bool:
+        if self._outside(orientation, pos):
+            return True
+
+        x_pos, y_pos, z_pos = pos
+        shift = y_pos * self.floor_width + x_pos
+        masks = self.masks
+
+        for dz, mask in orientation.floor_masks(self.floor_width):
+            if masks[z_pos + dz] & (
+                    mask << shift if shift >= 0 else mask >> -shift):
+                return True
+        # (if the piece is inside the board, moving its footprints
+        # right never pushes any of its bits out)
+        return False
+
+    def place(self, orientation, pos, color) -> None:
+        x_pos, y_pos, z_pos = pos
+        masks = self.masks
+
+        for dx, dy, dz in orientation.positions:
+            floor = z_pos + dz
+            bit = (y_pos + dy) * self.floor_width + x_pos + dx
+
+            if not masks[floor] >> bit & 1:
+                masks[floor] |= 1 << bit
+                self.columns[bit] |= 1 << floor
+                if floor < self.heights[bit]:
+                    self.heights[bit] = floor
+                self.floor_hashes[floor] ^= self.floor_keys[floor][bit]
+                self.zobrist_hash ^= self.floor_keys[floor][bit]
+            self.colors[floor][bit] = color
+
+    def clear_floors(self, floor_indexes) -> int:
+        """
+        A floor is full if its mask is 'self.full_floor',
+        and the full floors are removed and added as whole floor objects
+        (masks and color lists), in one pass,
+        instead of moving the cubes one by one.
+        """
+        full_floors = sorted(
+            z_pos for z_pos in set(floor_indexes)
+            if 0 <= z_pos < self.floors
+            and self.masks[z_pos] == self.full_floor
+        )
+        if not full_floors:
+            return 0
+
+        top = min(self.heights)
+        # the floors above the highest cube are empty,
+        # before and after the clear, so they're never rehashed.
+
+        for z_pos in reversed(full_floors):
+            del self.masks[z_pos]
+            del self.colors[z_pos]
+        # deleting from the bottom up keeps the indexes
+        # of the floors still to delete valid.
+
+        amount = len(full_floors)
+        self.masks[:0] = [0] * amount
+        self.colors[:0] = [[None] * self.floor_width * self.floor_width
+                           for _ in range(amount)]
+        # new empty floors at the top
+
+        for z_pos in range(top, full_floors[-1] + 1):
+            self.zobrist_hash ^= self.floor_hashes[z_pos]
+            self.floor_hashes[z_pos] = self._floor_hash(z_pos)
+            self.zobrist_hash ^= self.floor_hashes[z_pos]
+        # Only the floors between the top of the stack
+        # and the lowest cleared floor moved,
+        # so only their cubes' keys change.
+
+        for bit, column in enumerate(self.columns):
+            for z_pos in full_floors:
+                column = (column >> (z_pos + 1) << (z_pos + 1)) \
+                    | (column & ((1 << z_pos) - 1)) << 1
+            # remove the floor's bit, and move the bits above it one down.
+            # (going from the top floor down, removing a floor doesn't move
+            # the bits of the floors below it)
+            self.columns[bit] = column
+            self.heights[bit] = self._highest_cube(column)
+
+        return amount
+
+    def drop_distance(self, orientation, pos) -> int:
+        """
+        Uses the height map when the piece is above its columns' stacks,
+        and looks up the first filled cube below the piece's block in the
+        column bitmask when it's under an overhang,
+        instead of moving the piece down one floor at a time.
+        """
+        x_pos, y_pos, z_pos = pos
+        distance = self.floors
+
+        for dx, dy, dz in orientation.bottom:
+            bit = (y_pos + dy) * self.floor_width + x_pos + dx
+            floor = z_pos + dz
+
+            if self.heights[bit] > floor:
+                below = self.heights[bit] - floor - 1
+            else:
+                column = self.columns[bit] >> floor + 1
+                # only the cubes below the piece's block,
+                # 'floor + 1' becomes bit 0.
+                below = self.floors - floor - 1 if not column \
+                    else (column & -column).bit_length() - 1
+
+            if below < distance:
+                distance = below
+        return distance
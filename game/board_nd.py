@@ -0,0 +1,373 @@
+"""
+Module with the N-dimensional board core, shared by the array boards
+of the 2D, 3D and 4D games.
+
+'ArrayBoardND' stores a board of ANY amount of dimensions as ONE numpy
+array of palette indexes (look at 'game/palette.py'), 'cells[pos]',
+where the LAST axis is the one the pieces fall along
+(y in 2D, z in 3D and 4D), and each "level" of the board
+(a row in 2D, a floor in 3D, a hyper-floor in 4D)
+is a slice across that axis.
+
+Pieces are checked against the board with their blocks matrix
+(an array with the same amount of dimensions as the board,
+with 1's where the piece has blocks), so that:
+
+    checking a piece is ONE AND between the piece's blocks matrix
+    and the slice of the board it's in,
+    full levels are found with ONE 'all' over the levels,
+    and the levels above them fall with ONE copy of the array,
+
+no matter how many dimensions the board has, so any optimization
+of these is an optimization of every game mode.
+
+'ArrayBoard2D' (look at 'game/board_2d.py') and 'ArrayBoard3D'
+(look at 'game/board_3d.py') are this board with their games'
+constructors and method names, and 'game/game_4d.py' plays
+4D games on it.
+
+Like the other boards, it keeps the Zobrist hash of which cells are filled
+(look at 'game/zobrist.py') in 'zobrist_hash',
+updated with every cell that is added or removed.
+"""
+from collections.abc import Mapping, MutableMapping
+from functools import lru_cache
+from itertools import product
+from numpy import (ndarray, argwhere, array, bitwise_xor, count_nonzero,
+                   logical_and, ones, uint8, uint64, zeros)
+from game.palette import PALETTE, palette_index
+from game.zobrist import feature_key
+
+
+@lru_cache(maxsize=None)
+def cell_keys_nd(feature: str, extents: tuple[int, ...]) -> ndarray:
+    """
+    Returns the keys of the cells of a board with 'extents',
+    as a numpy array of uint64's with the board's shape,
+    where the key of the cell at 'pos' is 'feature_key(feature, *pos)'.
+    """
+    keys = array(
+        [feature_key(feature, *pos) for pos in product(*map(range, extents))],
+        dtype=uint64
+    ).reshape(extents)
+    keys.flags.writeable = False
+    return keys
+
+
+class ArrayBoardND(MutableMapping):
+    """
+    Board of any amount of dimensions, stored as a numpy array
+    of palette indexes.
+
+    'self.extents': the size of the board along each axis,
+        the last one is the amount of levels.
+    'self.cells[pos]': palette index of the color of the cell
+        at 'pos', or 0 if the cell is empty.
+        (Look at 'game/palette.py')
+
+    The board can't hold cells outside of it,
+    so adding them raises ValueError.
+
+    Pieces are passed in as objects with a 'blocks' matrix
+    and a 'bottom' profile (like 'Orientation3D' and 'OrientationND'),
+    and the position of the matrix's first corner in the board.
+    """
+    __slots__ = ("extents", "cells", "zobrist_hash")
+
+    CELL_FEATURE = "nd-cell"
+    """
+    The Zobrist feature of the board's filled cells.
+    (Look at 'cell_keys_nd')
+    """
+    OPEN_TOP = False
+    """
+    If True, blocks ABOVE the first level never collide,
+    like in the 2D game, where pieces can stick out of the top.
+    """
+
+    def __init__(self, extents: tuple[int, ...], squares: Mapping = None):
+        """
+        Makes an empty board with 'extents',
+        then fills it with the '{pos: color}' items in 'squares', if given.
+        """
+        self.extents = tuple(extents)
+        self.cells = zeros(self.extents, uint8)
+        self.zobrist_hash = 0
+
+        if squares is not None:
+            for pos, color in squares.items():
+                self[pos] = color
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.items())})"
+
+    @property
+    def levels(self) -> int:
+        return self.extents[-1]
+
+    def _keys(self) -> ndarray:
+        return cell_keys_nd(self.CELL_FEATURE, self.extents)
+
+    def _in_board(self, pos) -> bool:
+        return len(pos) == len(self.extents) and all(
+            0 <= coordinate < extent
+            for coordinate, extent in zip(pos, self.extents))
+
+    def __getitem__(self, pos):
+        if self._in_board(pos):
+            index = self.cells[tuple(pos)]
+            if index:
+                return PALETTE[index]
+        raise KeyError(pos)
+
+    def __setitem__(self, pos, color):
+        if not self._in_board(pos):
+            raise ValueError(
+                f"Cell {pos} is outside of the "
+                + "x".join(map(str, self.extents)) + " board!"
+            )
+        pos = tuple(pos)
+        if not self.cells[pos]:
+            self.zobrist_hash ^= feature_key(self.CELL_FEATURE, *pos)
+        self.cells[pos] = palette_index(color)
+
+    def __delitem__(self, pos):
+        if not (self._in_board(pos) and self.cells[tuple(pos)]):
+            raise KeyError(pos)
+        pos = tuple(pos)
+        self.cells[pos] = 0
+        self.zobrist_hash ^= feature_key(self.CELL_FEATURE, *pos)
+
+    def __iter__(self):
+        for pos in argwhere(self.cells).tolist():
+            yield tuple(pos)
+
+    def __len__(self):
+        return int(count_nonzero(self.cells))
+
+    def copy(self):
+        board = type(self).__new__(type(self))
+        board.extents = self.extents
+        board.cells = self.cells.copy()
+        board.zobrist_hash = self.zobrist_hash
+        return board
+
+    def _slices(self, blocks: ndarray, pos):
+        """
+        Returns the slices of 'self.cells' AND of 'blocks'
+        where a piece with the 'blocks' matrix, with its first corner
+        at 'pos', overlaps the board.
+        """
+        board_slices = []
+        block_slices = []
+        for start, size, board_size in zip(pos, blocks.shape, self.extents):
+            board_start = min(max(start, 0), board_size)
+            board_end = min(max(start + size, 0), board_size)
+            board_slices.append(slice(board_start, board_end))
+            block_slices.append(
+                slice(board_start - start, board_end - start))
+        return tuple(board_slices), tuple(block_slices)
+
+    def _inside_slices(self, shape, pos):
+        """
+        Returns the slices of 'self.cells' a matrix with 'shape',
+        with its first corner at 'pos', is in,
+        or None if any part of the matrix is outside of the board.
+        """
+        slices = []
+        for start, size, board_size in zip(pos, shape, self.extents):
+            if start < 0 or start + size > board_size:
+                return None
+            slices.append(slice(start, start + size))
+        return tuple(slices)
+
+    def _hash(self, cells: ndarray, keys: ndarray) -> int:
+        """
+        Returns the XOR of the 'keys' of the filled 'cells'.
+        """
+        return int(bitwise_xor.reduce(keys[cells != 0]))
+
+    def _collides(self, blocks: ndarray, pos) -> bool:
+        """
+        Returns True if a piece with the 'blocks' matrix,
+        with its first corner at 'pos', would have a block
+        outside of the board, or in a filled cell of the board.
+        """
+        slices = self._inside_slices(blocks.shape, pos)
+        if slices is not None:
+            return bool(logical_and(self.cells[slices], blocks).any())
+        # The piece's whole matrix is inside the board,
+        # so none of its blocks can be outside of it.
+
+        board_slices, block_slices = self._slices(blocks, pos)
+        inside = blocks[block_slices]
+
+        kept = inside
+        if self.OPEN_TOP:
+            kept = blocks[block_slices[:-1]
+                          + (slice(0, max(block_slices[-1].stop, 0)),)]
+        # with an open top, the blocks above the board are kept too.
+
+        if count_nonzero(kept) != count_nonzero(blocks):
+            return True
+        # some of the piece's blocks are outside the board.
+
+        return bool(logical_and(self.cells[board_slices], inside).any())
+
+    def _place(self, blocks: ndarray, pos, color) -> None:
+        """
+        Fills the cells of a piece with the 'blocks' matrix,
+        with its first corner at 'pos', with 'color'.
+        """
+        board_slices, block_slices = self._slices(blocks, pos)
+        cells = self.cells[board_slices]
+        # a view, so setting its cells sets the board's cells.
+        filled = blocks[block_slices] != 0
+
+        new_cells = filled & (cells == 0)
+        self.zobrist_hash ^= self._hash(new_cells, self._keys()[board_slices])
+
+        cells[filled] = palette_index(color)
+
+    def _drop_distance(self, bottom, pos) -> int:
+        """
+        Returns how many levels a piece with the 'bottom' profile
+        (the offsets of the lowest block of each of its columns,
+        with the level offset last), with its first corner at 'pos',
+        can move down before it lands,
+        looking up the first filled cell below each of those blocks
+        with 'nonzero'.
+        """
+        *column_pos, level_pos = pos
+        distance = self.levels
+
+        for *column_offsets, level_offset in bottom:
+            start = level_pos + level_offset + 1
+            below = self.cells[(
+                *(coordinate + offset for coordinate, offset
+                  in zip(column_pos, column_offsets)),
+                slice(max(start, 0), None)
+            )]
+            filled = below.nonzero()[0]
+            first = int(filled[0]) if len(filled) else len(below)
+            first += max(start, 0) - start
+            # first filled cell below the block, or the floor,
+            # counting the levels above the board as empty.
+
+            if first < distance:
+                distance = first
+        return distance
+
+    def collides(self, orientation, pos) -> bool:
+        """
+        Uses the orientation's 'bounds' to only look at the box
+        around its blocks, so that pieces in padded matrices
+        (like the I piece's) don't need their matrix to be clipped
+        when it's partly outside of the board.
+        """
+        bounds = orientation.bounds
+        dimensions = len(pos)
+        blocks = orientation.blocks
+        board_slices = []
+        block_slices = []
+
+        for axis, start, extent in zip(range(dimensions), pos, self.extents):
+            low = bounds[axis]
+            high = bounds[dimensions + axis] + 1
+            if start + low < 0 or start + high > extent:
+                return self._collides(blocks, pos)
+            # some of the blocks may be outside of the board
+            board_slices.append(slice(start + low, start + high))
+            block_slices.append(slice(low, high))
+
+        return bool(logical_and(
+            self.cells[tuple(board_slices)], blocks[tuple(block_slices)]
+        ).any())
+
+    def collision_mask(self, orientations, pos, blocks=None) -> int:
+        """
+        Returns a bitmask where bit 'i' is set if a piece in
+        'orientations[i]', with its first corner at 'pos', collides.
+
+        'blocks', if given, is the stack of the orientations'
+        blocks matrices (all the same size), and when the whole stack
+        is inside the board, all of the orientations are checked with
+        ONE AND between the stack and the slice of the board they're in.
+        """
+        slices = None
+        if blocks is not None:
+            slices = self._inside_slices(blocks.shape[1:], pos)
+
+        mask = 0
+        if slices is None:
+            for bit, orientation in enumerate(orientations):
+                if self._collides(orientation.blocks, pos):
+                    mask |= 1 << bit
+            return mask
+
+        collisions = logical_and(self.cells[slices], blocks).any(
+            axis=tuple(range(1, blocks.ndim)))
+        # the board's slice is broadcast against every matrix in the stack
+
+        for bit in collisions.nonzero()[0].tolist():
+            mask |= 1 << bit
+        return mask
+
+    def place(self, orientation, pos, color) -> None:
+        """
+        ASSUMES THE PIECE IS INSIDE THE BOARD.
+        (Look at 'self.collides')
+        """
+        self._place(orientation.blocks, pos, color)
+
+    def clear_levels(self, level_indexes) -> int:
+        """
+        Removes every FULL level in 'level_indexes' from the board,
+        makes the levels above them fall down to fill their space,
+        and returns the amount of levels removed.
+
+        The full levels are found with ONE 'all' over their cells,
+        and the levels above them fall with ONE copy of the array.
+        """
+        level_indexes = sorted(
+            level for level in set(level_indexes)
+            if 0 <= level < self.levels
+        )
+        if not level_indexes:
+            return 0
+
+        full_levels = [
+            level for level, full in zip(
+                level_indexes,
+                self.cells[..., level_indexes].all(
+                    axis=tuple(range(self.cells.ndim - 1))))
+            if full
+        ]
+        if not full_levels:
+            return 0
+
+        MOVED = slice(0, full_levels[-1] + 1)
+        # Only the levels above the lowest cleared level move,
+        # so only their cells' keys change.
+        keys = self._keys()[..., MOVED]
+        self.zobrist_hash ^= self._hash(self.cells[..., MOVED], keys)
+
+        kept_levels = ones(full_levels[-1] + 1, bool)
+        kept_levels[full_levels] = False
+        amount = len(full_levels)
+
+        self.cells[..., amount:MOVED.stop] = \
+            self.cells[..., MOVED][..., kept_levels]
+        self.cells[..., :amount] = 0
+        # The fancy index copies the kept levels before they're written,
+        # so the levels can be written over themselves.
+
+        self.zobrist_hash ^= self._hash(self.cells[..., MOVED], keys)
+
+        return amount
+
+    def drop_distance(self, orientation, pos) -> int:
+        """
+        ASSUMES THE PIECE IS INSIDE THE BOARD.
+        """
+        return self._drop_distance(orientation.bottom, pos)
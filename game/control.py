@@ -0,0 +1,451 @@
+"""
+Module with 'GameControl', the state machine that plays a Game2D/3D
+frame by frame, like the player plays it: with DAS
+(look at 'GameControl.direction_input_handler'),
+and pieces that fall every 'fall_rate(level)' frames.
+
+It DOESN'T use pygame or the keyboard: each frame is played
+with the NAMES of the controls the player is holding,
+and of the ones they just pressed
+(the action names of 'keyboard_settings.json', like "LEFT"
+or "rotate_cw_y", look at 'CONTROLS_2D' and 'CONTROLS_3D'),
+so games can be played by the keyboard ('game_control.py'),
+by remote players and bots ('game/sessions.py'), or by anything else.
+"""
+from game.game_2d import Game2D
+from game.game_3d import Game3D
+from game.move_data import *
+from game.score import fall_rate
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+ROTATION_CONTROLS_3D = tuple(
+    (f"rotate_{'cw' if clockwise else 'ccw'}_{axis_name}", axis, clockwise)
+    for axis, axis_name in enumerate("xyz")
+    for clockwise in (True, False)
+)
+"""
+'(control, axis, clockwise)' of each 3D rotation control.
+"""
+
+CONTROLS_2D = frozenset((
+    "LEFT", "RIGHT", "DOWN", "SOFT_DROP", "HARD_DROP",
+    "rotate_cw_y", "rotate_ccw_y",
+))
+"""
+The controls that play a 2D game. (Look at 'GameControl2D')
+"""
+
+CONTROLS_3D = frozenset((
+    "UP", "DOWN", "LEFT", "RIGHT", "SOFT_DROP", "HARD_DROP",
+)) | frozenset(control for control, _, _ in ROTATION_CONTROLS_3D)
+"""
+The controls that play a 3D game. (Look at 'GameControl3D')
+"""
+
+
+@dataclass
+class SuccessfulActions:
+    """
+    The in-game actions that were performed,
+    AND SUCCEEDED.
+
+    For example:
+    Game2D.try_move
+    Game3D.try_rotate
+
+    This is used for game sounds, like the rotation sound
+    and hard-drop sounds in the 'Tetris3D/sound' directory.
+    """
+    moving_in_das_direction: bool
+    hard_dropping: bool
+    moving_one_block_down: bool
+    rotating: bool
+
+
+@dataclass
+class DASSettings:
+    first_move_pending: bool = False
+    charge: int = 0
+
+    def copy(self):
+        return DASSettings(self.first_move_pending, self.charge)
+
+
+class GameControl:
+    """
+    Handles piece falling framerate and the player's controls.
+    Contains Tetris Game2D/3D.
+
+    The controls are NAMES (look at 'CONTROLS_2D' and 'CONTROLS_3D'),
+    not keys, so that anything can play the game:
+    'game_control.py' turns the keyboard's keys into them,
+    and 'game/sessions.py' gets them from remote players and bots.
+    """
+    FIRST_DELAY = 15
+    """
+    The first frame the player presses a direction,
+    the piece immediately moves one block.
+    Then, the piece won't move, even if the player holds that same
+    direction, until this amount of frames have passed.
+    Prevents the player from accidentally moving the piece too far
+    when they only intend to move it one block over.
+    """
+    SECOND_DELAY = 6
+    """
+    The amount of frames the player must hold a direction
+    before the piece actually moves.
+    Prevents the piece from going too fast.
+    """
+    CONTROLS: frozenset[str] = frozenset()
+    """
+    The names of the controls that play the game.
+    """
+
+    def __init__(self, directions: Sequence[str], game):
+        """
+        'directions' SHOULD be an iterale of IN-GAME DIRECTIONS:
+        LEFT, RIGHT, FRONT, BACK
+
+        THIS METHOD DOES NOT VALIDATE THEM,
+        THE GameControl2D and GameControl3D CHILDREN OF THIS CLASS
+        MUST.
+
+        'game' is the Game2D/3D 'self' plays.
+        """
+        self.game = game
+
+        self.frame_count = 0
+
+        self.das = {
+            direction: DASSettings()
+            for direction in directions
+        }
+        """
+        "DAS" = "delayed auto shift".
+        direction_key: charge setting (same as STARTING_DAS above)
+        """
+        self.game_can_continue = True
+
+    @staticmethod
+    def fall_rate(level):
+        return fall_rate(level)
+
+    def direction_input_handler(self, pressed_directions: set[str]) -> bool:
+        """
+        Calls 'self.game.try_move' with the directions corresponding
+        to the pressed direction keys,
+
+        ASSUMING THAT:
+        - 'pressed_directions' has all of the VALID DIRECTIONS
+        (LEFT, RIGHT BACK, FRONT) that the player is currently
+        holding down in their keyboard.
+
+        BUT only if the player
+        has already been holding those direction key(s) down
+        for a certain amount of frames.
+        The first time the player holds a direction down on a cold start,
+        the first frame, its "self.game.try_move(<direction>)" will be called.
+        Then, if the player keeps holding that direction,
+        this object will count up to 'GameControl.FIRST_DELAY'
+        before the piece actually gets moved again.
+
+        This is to prevent the player from accidentally moving the piece
+        more than one block,
+        when the player is quickly tapping the direction key(s).
+
+        After that press, the player will have to keep waiting
+        'GameControl.SECOND_DELAY' frames before the next direction press.
+        This is to make the piece move at a reasonable speed,
+        unlike the framerate,
+        which may be 60FPS, causing the piece to fly into the wall
+        at the slightest tap.
+
+        This should work well,
+        IF THE FIRST DELAY IS BIGGER THAN THE SECOND DELAY,
+        AND IF THEIR SPEEDS ARE REASONABLE.
+
+        Plays 'self.game' with 'directions',
+        by calling 'self.game.try_move(<direction>)',
+        ASSUMING THE PLAYER IS HOLDING DOWN THOSE DIRECTIONS IN THEIR KEYBOARD,
+        IF THE DIRECTION IS READY TO BE PRESSED, BASED ON THE AMOUNT OF FRAMES
+        IT'S BEEN HELD DOWN, LIKE MENTIONED JUST ABOVE HERE.
+
+        After all of this,
+        this method returns True if ANY of these directions tried in
+        'self.game.try_move(<direction>)',
+        and False if NONE of the moves were made.
+
+        Please call in 'self.input_handler' overrides.
+        """
+
+        moved: bool = False
+
+        for direction in self.das.keys():
+            # dictionary keys, 'direction' SHOULD be 'str'.
+
+            assert isinstance(direction, str)
+
+            direction_moved: bool = False
+
+            if direction in pressed_directions:
+
+                if self.das[direction].charge == 0:
+                    direction_moved = self.game.try_move(direction)
+                    self.das[direction].first_move_pending \
+                        = not direction_moved
+
+                    self.das[direction].charge += 1
+                elif self.das[direction].charge == GameControl.FIRST_DELAY:
+                    direction_moved = self.game.try_move(direction)
+                    self.das[direction].first_move_pending = False
+
+                    if direction_moved:
+                        self.das[direction].charge += 1
+
+                elif self.das[direction].charge == \
+                        GameControl.FIRST_DELAY + GameControl.SECOND_DELAY:
+                    direction_moved = self.game.try_move(direction)
+                    self.das[direction].first_move_pending = False
+
+                    self.das[direction].charge = GameControl.FIRST_DELAY
+
+                    if direction_moved:
+                        self.das[direction].charge += 1
+
+                elif self.das[direction].first_move_pending:
+                    direction_moved = self.game.try_move(direction)
+                    self.das[direction].first_move_pending = \
+                        not direction_moved
+
+                    if 0 \
+                            < GameControl.FIRST_DELAY \
+                            - self.das[direction].charge \
+                            <= GameControl.SECOND_DELAY:
+                        self.das[direction].charge = \
+                            GameControl.FIRST_DELAY + 1
+                        self.das[direction].first_move_pending = False
+                    else:
+                        self.das[direction].charge += 1
+                else:
+                    self.das[direction].charge += 1
+            else:
+                self.das[direction].charge = 0
+                self.das[direction].first_move_pending = False
+
+            if direction_moved:
+                moved = True
+
+        # print(self.das, moved)
+
+        return moved
+
+    def handle_controls(self, held_controls: set[str],
+                        pressed_controls: set[str]) -> SuccessfulActions:
+        """
+        Plays the in-game actions of the controls
+        in 'held_controls' (ALL of the controls CURRENTLY being held,
+        REGARDLESS of the previous frame)
+        and 'pressed_controls' (the controls that JUST STARTED
+        being pressed, this frame).
+
+        Returns the different types of actions that were successful
+        (like rotating, moving, soft-dropping and hard-dropping)
+        """
+        raise NotImplementedError
+
+    def play_frame(
+            self, held_controls: set[str],
+            pressed_controls: set[str]) -> tuple[SuccessfulActions, bool]:
+        """
+        Counts the amount of frames before playing next game step
+        in 'self.frame_count'
+        (because of the pieces' fall rate needing to be faster the
+        higher the level),
+        and plays the game's next step (using 'self.game.play')
+        if the counter has hit the level's appropiate piece
+        fall rate.
+        (Look at 'fall_rate' for more info)
+
+        Returns the successfull actions performed with the controls
+        (look at 'self.handle_controls'),
+        and weather or not the game can keep going.
+
+        If the counter is still counting, this method's
+        result is always True.
+        """
+        self.frame_count += 1
+
+        succeessful_actions: SuccessfulActions = self.handle_controls(
+            held_controls, pressed_controls)
+
+        if not self.game_can_continue:
+            return succeessful_actions, False
+
+        if self.frame_count == self.fall_rate(self.game.score_manager.level):
+            self.game_can_continue = self.game.play()
+            self.frame_count = 0
+
+        return succeessful_actions, self.game_can_continue
+    # Counting frames.
+
+
+class GameControl2D(GameControl):
+    CONTROLS = CONTROLS_2D
+
+    def __init__(self, game: Game2D = None):
+        """
+        'game' is the Game2D 'self' plays,
+        or a new Game2D if it's None.
+        """
+        GameControl.__init__(
+            self, (LEFT, RIGHT), Game2D() if game is None else game)
+
+    def handle_controls(self, held_controls: set[str],
+                        pressed_controls: set[str]) -> SuccessfulActions:
+        """
+        Plays the in-game actions of the controls
+        in 'held_controls' (ALL of the controls CURRENTLY being held,
+        REGARDLESS of the previous frame)
+        and 'pressed_controls' (the controls that JUST STARTED
+        being pressed, this frame).
+
+        Returns the different types of actions that were successful
+        (like rotating, moving, soft-dropping and hard-dropping)
+        """
+        result = SuccessfulActions(False, False, False, False)
+
+        pressed_directions: set[str] = set()
+
+        if "LEFT" in held_controls:
+            pressed_directions.add(LEFT)
+        if "RIGHT" in held_controls:
+            pressed_directions.add(RIGHT)
+
+        if LEFT in pressed_directions and RIGHT in pressed_directions:
+            pressed_directions.remove(LEFT)
+            pressed_directions.remove(RIGHT)
+
+        result.moving_in_das_direction = GameControl.direction_input_handler(
+            self, pressed_directions)
+
+        if pressed_directions == set():
+            assert result.moving_in_das_direction is False
+
+        # Handling rotation controls
+
+        # Rotations should ONLY happen the frist frame the key is held,
+        # to spamming the rotation every frame.
+        # That's why I'm using 'pressed_controls', which SHOULD BE
+        # the controls of the pygame.KEYDOWN event,
+        # which only cares about the first frame.
+        if "rotate_cw_y" in pressed_controls:
+            result.rotating = self.game.try_rotate()
+
+        if "rotate_ccw_y" in pressed_controls:
+            result.rotating = self.game.try_rotate(False)
+        # ANY rotation key STARTING TO BE PRESSED this frame
+        # should rotate the piece,
+        # EVEN if there's MORE THAN ONE rotation key
+        # being pressed at the same time.
+        # I **think** all of the rotations will be added to eachother,
+        # in the order the code specifies,
+        # and I **think** the order doesn't matter.
+
+        if ("SOFT_DROP" in held_controls or "DOWN" in held_controls) \
+                and not self.game.landed():
+            result.moving_one_block_down = self.game.try_move(SOFT_DROP)
+
+            if self.game.landed():
+                self.frame_count = 0
+        # If the piece that we soft-dropped landed,
+        # the piece should remain there until the whole fram cycle finishes.
+        # This makes it a lot easier to do T-spins and other things,
+        # since the piece doesn't land immediatly after touching the ground.
+
+        if "HARD_DROP" in pressed_controls:
+            result.hard_dropping = self.game.try_move(HARD_DROP)
+
+            self.frame_count = self.fall_rate(self.game.score_manager.level)
+            # If we hard dropped, the dropping cycle of the pieces will reset.
+
+        return result
+
+
+class GameControl3D(GameControl):
+    CONTROLS = CONTROLS_3D
+
+    def __init__(self, game: Game3D = None):
+        """
+        'game' is the Game3D 'self' plays,
+        or a new Game3D if it's None.
+        """
+        GameControl.__init__(
+            self, (LEFT, RIGHT, FRONT, BACK),
+            Game3D() if game is None else game)
+
+    def handle_controls(self, held_controls: set[str],
+                        pressed_controls: set[str]) -> SuccessfulActions:
+        """
+        Plays the in-game actions of the controls
+        in 'held_controls' (ALL of the controls CURRENTLY being held,
+        REGARDLESS of the previous frame)
+        and 'pressed_controls' (the controls that JUST STARTED
+        being pressed, this frame).
+
+        Returns the different types of actions that were successful
+        (like rotating, moving, soft-dropping and hard-dropping)
+        """
+        result = SuccessfulActions(False, False, False, False)
+
+        pressed_directions: set[str] = set()
+
+        if "LEFT" in held_controls:
+            pressed_directions.add(LEFT)
+        if "RIGHT" in held_controls:
+            pressed_directions.add(RIGHT)
+
+        if LEFT in pressed_directions and RIGHT in pressed_directions:
+            pressed_directions.remove(LEFT)
+            pressed_directions.remove(RIGHT)
+
+        if "UP" in held_controls:
+            pressed_directions.add(BACK)
+        if "DOWN" in held_controls:
+            pressed_directions.add(FRONT)
+
+        if BACK in pressed_directions and FRONT in pressed_directions:
+            pressed_directions.remove(BACK)
+            pressed_directions.remove(FRONT)
+
+        result.moving_in_das_direction = GameControl.direction_input_handler(
+            self, pressed_directions)
+
+        if "SOFT_DROP" in held_controls:
+            result.moving_one_block_down = self.game.try_move(SOFT_DROP)
+
+            if self.game.landed():
+                self.frame_count = 0
+        # If the piece that we soft-dropped landed,
+        # the piece should remain there until the whole fram cycle finishes.
+        # This makes it a lot easier to do T-spins and other things,
+        # since the piece doesn't land immediatly after touching the ground.
+
+        if "HARD_DROP" in pressed_controls:
+            result.hard_dropping = self.game.try_move(HARD_DROP)
+
+            self.frame_count = self.fall_rate(self.game.score_manager.level)
+            # If we hard dropped, the dropping cycle of the pieces will reset.
+
+        for control, axis, clockwise in ROTATION_CONTROLS_3D:
+            if control in pressed_controls:
+
+                ROTATION_SUCCESS: bool = self.game.try_rotate(
+                    axis, clockwise)
+
+                if ROTATION_SUCCESS:
+                    result.rotating = True
+                # all we need is one rotation to succeed to set
+                # result.rotating to True.
+
+        return result
@@ -0,0 +1,385 @@
+"""
+Module with 'TetrisEnv', a Gym-style environment
+('reset()' and 'step(action)') that plays a 2D or 3D game
+frame by frame through its 'GameControl' (look at 'game/control.py'),
+with the same DAS and gravity timing as the game played
+with the keyboard, and 'VectorTetrisEnv', which steps
+MANY of them at once.
+
+An action is the bitmask of the controls held in the frame:
+bit 'i' is set if 'ENV_MODES[mode].controls[i]' is held.
+The controls that weren't held in the previous frame
+are "just pressed" (so holding "HARD_DROP" only hard drops once,
+and holding "LEFT" moves the piece with DAS).
+
+The observations are written into numpy arrays made ONCE,
+and the same arrays are returned by every step, so stepping
+doesn't make new arrays or dicts:
+
+    'board': bool array, True where the board's cells are filled,
+        indexed like the positions of the board,
+        ('[x, y]' in 2D, '[x, y, z]' in 3D)
+    'piece', 'orientation': index of the current piece,
+        (in 'PIECES_2D' or 'PIECES_3D') and its orientation,
+        ('Piece2D.rotation' or 'Piece3D.orientation')
+    'position': the current piece's position,
+    'next_piece': index of the next piece.
+
+'VectorTetrisEnv' stacks them into arrays with one row per env,
+and each of its envs writes straight into its rows.
+
+ONLY THE OBSERVATIONS ARE ALLOCATION-FREE: every env still plays
+its own game through its own 'GameControl', in Python, one env
+after the other, so each frame still makes the small Python objects
+the game and its 'GameControl' make (like the 'SuccessfulActions'
+of the frame, and the positions of the moved pieces).
+The batched engines (look at 'game/batch.py') play many games
+with numpy arrays instead, but with at most one action per frame,
+without the held controls and DAS of 'GameControl',
+so they can't play the same frames these envs play.
+"""
+from game.board_2d import ArrayBoard2D
+from game.board_3d import ArrayBoard3D
+from game.control import (GameControl2D, GameControl3D,
+                          CONTROLS_2D, CONTROLS_3D)
+from game.game_2d import Game2D, PIECES_2D, ROWS, COLUMNS
+from game.game_3d import (Game3D, PIECES_3D, ORIENTATIONS_3D,
+                          FLOOR_WIDTH, FLOORS)
+from game.piece_generator import PieceGenerator
+from dataclasses import dataclass
+from numpy import ndarray, int64, not_equal, zeros
+import random
+
+
+@dataclass(frozen=True)
+class EnvMode:
+    """
+    What 'TetrisEnv' needs to know about a game mode:
+
+    'control_type': the 'GameControl' that plays the games
+    'game_type', 'board_type': the games, and their boards,
+        (array boards, so that the observations copy their cells)
+    'controls': the controls of the actions' bits
+    'piece_indexes': '{id: index}' of the pieces, by the id of
+        what 'piece_key' returns for them
+    'piece_key': returns what tells the kind of a piece apart
+    'piece_orientation': returns the orientation of a piece
+    'board_shape': returns the shape of the boards' cells,
+        from the size arguments of the games
+        (without making a game, look at 'TetrisEnv.__init__')
+    """
+    control_type: type
+    game_type: type
+    board_type: type
+    controls: tuple[str, ...]
+    piece_indexes: dict
+    piece_key: object
+    piece_orientation: object
+    board_shape: object
+
+    @property
+    def piece_count(self) -> int:
+        return len(self.piece_indexes)
+
+
+ENV_MODES: dict[str, EnvMode] = {
+    "2d": EnvMode(
+        GameControl2D,
+        Game2D,
+        ArrayBoard2D,
+        tuple(sorted(CONTROLS_2D)),
+        {id(piece): index for index, piece in enumerate(PIECES_2D)},
+        lambda piece: piece.data,
+        lambda piece: piece.rotation,
+        lambda rows=ROWS, columns=COLUMNS: (columns, rows)
+    ),
+    "3d": EnvMode(
+        GameControl3D,
+        Game3D,
+        ArrayBoard3D,
+        tuple(sorted(CONTROLS_3D)),
+        {
+            id(ORIENTATIONS_3D[id(blocks)]): index
+            for index, (blocks, _) in enumerate(PIECES_3D)
+        },
+        lambda piece: piece.table,
+        lambda piece: piece.orientation,
+        lambda floor_width=FLOOR_WIDTH, floors=FLOORS:
+            (floor_width, floor_width, floors)
+    ),
+}
+"""
+The game modes the environments can play, by name.
+"""
+
+
+def env_mode(mode: str) -> EnvMode:
+    """
+    Returns 'ENV_MODES[mode]',
+    or raises ValueError if there's no mode called 'mode'.
+    """
+    if mode not in ENV_MODES:
+        raise ValueError(
+            f"'mode' must be one of {tuple(ENV_MODES)}, not {mode!r}")
+    return ENV_MODES[mode]
+
+
+def _control_sets(controls: tuple[str, ...]) -> tuple[frozenset, ...]:
+    """
+    Returns the set of the controls of every action bitmask,
+    so that steps look them up, instead of making them.
+    """
+    return tuple(
+        frozenset(
+            control for bit, control in enumerate(controls)
+            if action >> bit & 1)
+        for action in range(1 << len(controls))
+    )
+
+
+def observation_arrays(mode: str, board_shape: tuple[int, ...],
+                       count: int = None) -> dict[str, ndarray]:
+    """
+    Returns new (zeroed) observation arrays
+    (read the docstring of this module) of 'mode', with boards
+    of 'board_shape', with 'count' rows each,
+    or of a single environment, if 'count' is None.
+    """
+    rows = () if count is None else (count,)
+    return {
+        "board": zeros(rows + board_shape, bool),
+        "piece": zeros(rows, int64),
+        "orientation": zeros(rows, int64),
+        "position": zeros(rows + (len(board_shape),), int64),
+        "next_piece": zeros(rows, int64),
+    }
+
+
+class TetrisEnv:
+    """
+    Gym-style environment of a game of 'mode' ("2d" or "3d").
+    (Read the docstring of this module)
+
+    'self.control': the 'GameControl' of the current game.
+    'self.observation': the observation arrays.
+    'self.frames': amount of frames the current game played.
+    """
+
+    def __init__(self, mode: str = "2d", seed: int = None,
+                 max_frames: int = None,
+                 observation: dict[str, ndarray] = None, **size):
+        """
+        'mode' is the game mode, from 'ENV_MODES',
+        and 'size' are the size arguments of its games
+        ('rows' and 'columns' in 2D, 'floor_width' and 'floors' in 3D).
+
+        The games are seeded from a 'random.Random' seeded with 'seed'.
+        (Look at 'self.reset')
+
+        If 'max_frames' isn't None, the games are truncated
+        after that many frames.
+
+        'observation' are the arrays to write the observations into,
+        (like the ones 'observation_arrays' makes)
+        or None, to make new ones.
+        """
+        self.mode = env_mode(mode)
+        self.mode_name = mode
+        self.size = size
+        self.max_frames = max_frames
+        self.random = random.Random(seed)
+        self.control_sets = _control_sets(self.mode.controls)
+        self.action_count = len(self.control_sets)
+
+        self.control = self._new_control()
+        if observation is None:
+            observation = observation_arrays(
+                mode, self.mode.board_shape(**size))
+        self.observation = observation
+        self.info = {}
+
+        self.previous_action = 0
+        self.frames = 0
+        self.points = 0
+        self.done = False
+
+    def _new_control(self):
+        """
+        Returns the 'GameControl' of a new game,
+        seeded from 'self.random'.
+        """
+        generator = PieceGenerator(
+            self.mode.piece_count, self.random.getrandbits(64))
+        return self.mode.control_type(self.mode.game_type(
+            board_type=self.mode.board_type, generator=generator,
+            **self.size))
+
+    def _observe(self) -> None:
+        """
+        Writes the current game into 'self.observation'.
+        """
+        game = self.control.game
+        observation = self.observation
+        piece_indexes = self.mode.piece_indexes
+        piece_key = self.mode.piece_key
+
+        not_equal(game.board.cells, 0, out=observation["board"])
+        observation["piece"][...] = piece_indexes[id(piece_key(game.piece))]
+        observation["orientation"][...] = \
+            self.mode.piece_orientation(game.piece)
+        position = observation["position"]
+        for axis, value in enumerate(game.piece.pos):
+            position[axis] = value
+        observation["next_piece"][...] = \
+            piece_indexes[id(piece_key(game.next_piece))]
+
+    def reset(self, seed: int = None) -> tuple[dict[str, ndarray], dict]:
+        """
+        Starts a new game, and returns its observation
+        and an (empty) info dict.
+
+        If 'seed' isn't None, 'self.random' is seeded with it first,
+        so the same seed always starts the same games.
+        """
+        if seed is not None:
+            self.random.seed(seed)
+
+        self.control = self._new_control()
+        self.previous_action = 0
+        self.frames = 0
+        self.points = 0
+        self.done = False
+
+        self._observe()
+        return self.observation, self.info
+
+    def step(self, action: int) -> tuple[
+            dict[str, ndarray], float, bool, bool, dict]:
+        """
+        Plays one frame of the game, holding the controls
+        in the 'action' bitmask (read the docstring of this module),
+        and returns:
+            the observation,
+            the points the frame scored (the reward),
+            whether the game is over (terminated),
+            whether it was cut short by 'self.max_frames' (truncated),
+            and an (empty) info dict.
+        """
+        if not 0 <= action < self.action_count:
+            raise ValueError(
+                f"'action' must be from 0 to {self.action_count - 1}, "
+                f"not {action}")
+        if self.done:
+            raise ValueError("The game is over, call 'reset' first")
+
+        _, game_can_continue = self.control.play_frame(
+            self.control_sets[action],
+            self.control_sets[action & ~self.previous_action])
+        self.previous_action = action
+        self.frames += 1
+
+        points = self.control.game.score_manager.points
+        reward = float(points - self.points)
+        self.points = points
+
+        terminated = not game_can_continue
+        truncated = not terminated and self.max_frames is not None \
+            and self.frames >= self.max_frames
+        self.done = terminated or truncated
+
+        self._observe()
+        return self.observation, reward, terminated, truncated, self.info
+
+
+class VectorTetrisEnv:
+    """
+    'count' 'TetrisEnv's of the same mode and size, stepped at once.
+    (Read the docstring of this module)
+
+    'self.mode': the 'EnvMode' of the envs.
+    'self.envs': the environments.
+    'self.observation': the observation arrays, with one row per env.
+    'self.rewards', 'self.terminated', 'self.truncated':
+        arrays of what each env's last step returned.
+
+    The envs whose game ended (terminated or truncated) are reset
+    in the NEXT step, which ignores their action, and returns
+    the new game's observation, with a reward of 0.
+    """
+
+    def __init__(self, mode: str = "2d", count: int = 1, seed: int = None,
+                 max_frames: int = None, **size):
+        """
+        Makes 'count' 'TetrisEnv's (look at 'TetrisEnv.__init__'),
+        where env number 'i' is seeded with 'seed + i'
+        (or randomly, if 'seed' is None).
+        """
+        if count < 1:
+            raise ValueError(f"'count' must be at least 1, not {count}")
+
+        self.mode = env_mode(mode)
+        self.observation = observation_arrays(
+            mode, self.mode.board_shape(**size), count)
+
+        self.envs = [
+            TetrisEnv(
+                mode, None if seed is None else seed + index, max_frames,
+                {
+                    name: array[index, ...]
+                    for name, array in self.observation.items()
+                },
+                **size)
+            for index in range(count)
+        ]
+        # ('array[index, ...]' is a view of the env's row,
+        # even when the row is a single number)
+
+        self.count = count
+        self.action_count = 1 << len(self.mode.controls)
+        self.rewards = zeros(count)
+        self.terminated = zeros(count, bool)
+        self.truncated = zeros(count, bool)
+        self.info = {}
+
+    def reset(self, seed: int = None) -> tuple[dict[str, ndarray], dict]:
+        """
+        Starts a new game in every env (where env number 'i'
+        is seeded with 'seed + i', if 'seed' isn't None),
+        and returns the observation arrays and an (empty) info dict.
+        """
+        for index, env in enumerate(self.envs):
+            env.reset(None if seed is None else seed + index)
+
+        self.rewards[:] = 0
+        self.terminated[:] = False
+        self.truncated[:] = False
+        return self.observation, self.info
+
+    def step(self, actions) -> tuple[
+            dict[str, ndarray], ndarray, ndarray, ndarray, dict]:
+        """
+        Steps every env with its action in 'actions'
+        (look at 'TetrisEnv.step'), and returns the observation
+        arrays, 'self.rewards', 'self.terminated', 'self.truncated',
+        and an (empty) info dict.
+        """
+        if len(actions) != self.count:
+            raise ValueError(
+                f"Expected {self.count} actions, got {len(actions)}")
+
+        rewards = self.rewards
+        terminated = self.terminated
+        truncated = self.truncated
+
+        for index, env in enumerate(self.envs):
+            if env.done:
+                env.reset()
+                rewards[index] = 0
+                terminated[index] = False
+                truncated[index] = False
+                continue
+
+            _, rewards[index], terminated[index], truncated[index], _ = \
+                env.step(int(actions[index]))
+
+        return self.observation, rewards, terminated, truncated, self.info
@@ -0,0 +1,223 @@
+"""
+Module that plays MANY headless games (look at 'game/simulation.py')
+in parallel, in a pool of processes, one per core.
+
+The seeds of the games are split into ranges, and each worker process
+plays the games of one range at a time, with the policy
+'policy_factory(seed)' returns, like 'simulate'.
+
+Instead of pickling each game's results back to the main process,
+the workers write them STRAIGHT into a 'RESULT_DTYPE' structured array
+in shared memory (look at 'multiprocessing.shared_memory'),
+with one row per game, which the main process copies out when
+every game is over. Only each range's 'LatencyHistogram'
+is sent back.
+
+The policy factory is sent to the workers, so it must be picklable:
+a class, or a function defined at the top of a module
+(or a 'functools.partial' of one), but NOT a lambda.
+
+Run 'python -m game.farm --help' to play games
+from the command line.
+"""
+from game.score import Score
+from game.simulation import *
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from multiprocessing.shared_memory import SharedMemory
+from numpy import dtype, ndarray
+from time import perf_counter_ns
+import argparse
+import os
+
+RESULT_DTYPE = dtype([
+    ("seed", "i8"),
+    ("points", "i8"),
+    ("lines", "i8"),
+    ("level", "i8"),
+    ("transitioned", "?"),
+    ("frames", "i8"),
+    ("pieces", "i8"),
+    ("seconds", "f8"),
+])
+"""
+The results of one game:
+its seed, its final 'Score', the amount of frames it played
+and of pieces it spawned (like 'play_game' counts them),
+and how long it took to play, in seconds.
+"""
+
+
+def random_policy(engine: str, seed: int) -> RandomPolicy:
+    """
+    Returns a 'RandomPolicy' of the actions of 'engine', seeded with 'seed',
+    like the policies 'simulate' plays with by default.
+    """
+    return RandomPolicy(ENGINES[engine].actions, seed)
+
+
+def _play_range(memory_name: str, games: int, start: int, stop: int,
+                engine: str, seed: int,
+                policy_factory: Callable[[int], Policy],
+                max_frames: int) -> LatencyHistogram:
+    """
+    Plays the games 'start' to 'stop' (not included) of a farm
+    of 'games' games, seeded from 'seed', writing their results
+    into rows 'start' to 'stop' of the results in the shared memory
+    named 'memory_name'.
+
+    Runs in the worker processes, and returns the 'LatencyHistogram'
+    of the games.
+    """
+    memory = SharedMemory(memory_name)
+    results = ndarray((games,), RESULT_DTYPE, memory.buf)
+    engine_data = ENGINES[engine]
+    latency = LatencyHistogram()
+
+    for index in range(start, stop):
+        game_seed = seed + index
+        game = engine_data.new_game(game_seed)
+
+        begin = perf_counter_ns()
+        frames, pieces = play_game(
+            game, policy_factory(game_seed), latency, max_frames)
+        seconds = (perf_counter_ns() - begin) / 1e9
+
+        score = game.score_manager
+        results[index] = (
+            game_seed, score.points, score.lines, score.level,
+            score.transitioned, frames, pieces, seconds)
+
+    del results
+    memory.close()
+    # (the shared memory can't be closed while an array uses it)
+    return latency
+
+
+@dataclass
+class FarmReport(SimulationReport):
+    """
+    The results of 'farm': a 'SimulationReport',
+    where 'seconds' is the time it took to play ALL games
+    (not the sum of their durations), and with
+
+    'results': the 'RESULT_DTYPE' structured array of the results
+        of each game, in the order of their seeds.
+    """
+    results: ndarray = None
+
+    def format(self) -> str:
+        if not len(self.results):
+            return super().format()
+
+        seconds = self.results["seconds"]
+        return "\n".join((
+            super().format(),
+            f"game durations: mean {seconds.mean():.3f}s, "
+            f"max {seconds.max():.3f}s, "
+            f"total {seconds.sum():.3f}s",
+        ))
+
+
+def farm(engine: str, games: int,
+         policy_factory: Callable[[int], Policy] = None,
+         seed: int = 0, max_frames: int = None,
+         workers: int = None, chunk_size: int = None) -> FarmReport:
+    """
+    Plays 'games' games of 'engine' ("2d", "3d" or "4d", from 'ENGINES')
+    in 'workers' processes (or one per core, if it's None),
+    and returns their 'FarmReport'.
+
+    The games are the SAME games 'simulate' plays with the same
+    arguments: game number 'i' is seeded with 'seed + i',
+    and plays with the policy 'policy_factory(seed + i)' returns
+    (a 'RandomPolicy', if 'policy_factory' is None).
+    (Read the docstring of this module)
+
+    Each worker plays 'chunk_size' games at a time
+    (by default, about 4 ranges per worker, so the workers
+    that finish first take the ranges that are left).
+
+    'max_frames' is the maximum amount of frames of each game.
+    """
+    if engine not in ENGINES:
+        raise ValueError(
+            f"'engine' must be one of {tuple(ENGINES)}, not {engine!r}")
+    if games < 0:
+        raise ValueError(f"'games' can't be negative, not {games}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"'workers' must be at least 1, not {workers}")
+    if chunk_size is None:
+        chunk_size = max(1, -(-games // (workers * 4)))
+    if chunk_size < 1:
+        raise ValueError(
+            f"'chunk_size' must be at least 1, not {chunk_size}")
+
+    if policy_factory is None:
+        policy_factory = partial(random_policy, engine)
+
+    report = FarmReport(engine)
+    start = perf_counter_ns()
+
+    memory = SharedMemory(
+        create=True, size=max(1, games * RESULT_DTYPE.itemsize))
+    results = None
+    try:
+        results = ndarray((games,), RESULT_DTYPE, memory.buf)
+        # (new shared memory is filled with zeros)
+
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [
+                pool.submit(
+                    _play_range, memory.name, games,
+                    range_start, min(games, range_start + chunk_size),
+                    engine, seed, policy_factory, max_frames)
+                for range_start in range(0, games, chunk_size)
+            ]
+            for future in futures:
+                report.latency.merge(future.result())
+
+        report.results = results.copy()
+    finally:
+        results = None
+        memory.close()
+        memory.unlink()
+
+    report.seconds = (perf_counter_ns() - start) / 1e9
+    report.games = games
+    report.frames = int(report.results["frames"].sum())
+    report.pieces = int(report.results["pieces"].sum())
+    report.scores = [
+        Score(points, lines, level, transitioned)
+        for points, lines, level, transitioned in report.results[
+            ["points", "lines", "level", "transitioned"]].tolist()
+    ]
+    return report
+
+
+def main(arguments: Sequence[str] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m game.farm",
+        description="Plays Tetris games without a window, "
+                    "with random moves, in a process per core, "
+                    "and reports how fast they ran.")
+    parser.add_argument("engine", choices=tuple(ENGINES))
+    parser.add_argument("-n", "--games", type=int, default=100)
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument("-f", "--max-frames", type=int, default=None)
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parsed = parser.parse_args(arguments)
+
+    print(farm(
+        parsed.engine, parsed.games,
+        seed=parsed.seed, max_frames=parsed.max_frames,
+        workers=parsed.workers
+    ).format())
+
+
+if __name__ == "__main__":
+    main()
@@ -8,10 +8,16 @@ and the Game2D class, which contains:
     the 2D game's board,
     the 2D game's current and next pieces,
     and the amount of lines the player cleared during the previous "game step"
-        (Look in 'Game2D.__init__').
+        (Look at 'GameND', in 'game/game_nd.py').
 """
-import random
+from dataclasses import dataclass
 from game.score import Score
+from game.board_2d import BitBoard2D
+from game.game_nd import GameND
+from game.move_data import *
+from game.palette import palette_index
+from game.zobrist import feature_key
+from game.piece_generator import PieceGenerator
 
 START_POS = [3, 0]
 
@@ -145,6 +151,146 @@ ROWS = 20
 COLUMNS = 10
 
 
+@dataclass(frozen=True)
+class Rotation2D:
+    """
+    One rotation configuration of a 2D piece, compiled from its
+    "#" strings ONCE, when this module is imported.
+    (Look at 'compile_rotations')
+
+    'squares': the (dx, dy) offsets of the piece's squares from
+        the top-left of its matrix, in order: up->down, left->right.
+    'row_masks': the rows with squares in them, as '(dy, mask)'
+        tuples, from top to bottom, where 'mask' has bit 'dx' set
+        if the row has a square in column 'dx'.
+        (The format 'game.board_2d.BitBoard2D' checks collisions with)
+    'width', 'height': the size of the piece's matrix.
+    'bounds': (min_dx, min_dy, max_dx, max_dy) of 'squares'.
+    'bottom': (dx, dy) of the LOWEST square in each column
+        the piece has squares in, from left to right.
+    'key': Zobrist key of the piece being in this rotation.
+        (Look at 'game/zobrist.py')
+    """
+    squares: tuple[tuple[int, int], ...]
+    row_masks: tuple[tuple[int, int], ...]
+    width: int
+    height: int
+    bounds: tuple[int, int, int, int]
+    bottom: tuple[tuple[int, int], ...]
+    key: int
+
+
+def compile_rotations(piece: tuple) -> tuple[Rotation2D, ...]:
+    """
+    Compiles all of the rotation configurations of 'piece'
+    (I_2D, J_2D, L_2D, O_2D, S_2D, T_2D or Z_2D, or any tuple like them)
+    into 'Rotation2D's.
+    """
+    rotations = []
+
+    for rotation in piece[:-2]:
+        squares = tuple(
+            (ci, ri)
+            for ri, row in enumerate(rotation)
+            for ci, square in enumerate(row)
+            if square == "#"
+        )
+        lowest = {}
+        for dx, dy in squares:
+            lowest[dx] = dy
+        # 'squares' is sorted up->down, so the last square
+        # in each column is the lowest one.
+
+        rotations.append(Rotation2D(
+            squares=squares,
+            row_masks=tuple(
+                (ri, sum(1 << dx for dx, dy in squares if dy == ri))
+                for ri in sorted(set(dy for _, dy in squares))
+            ),
+            width=len(rotation[0]),
+            height=len(rotation),
+            bounds=(
+                min(dx for dx, _ in squares),
+                squares[0][1],
+                max(dx for dx, _ in squares),
+                squares[-1][1]
+            ),
+            bottom=tuple(sorted(lowest.items())),
+            key=feature_key("2d-piece", piece[-1], squares)
+        ))
+    return tuple(rotations)
+
+
+PIECES_2D = (I_2D, J_2D, L_2D, O_2D, S_2D, T_2D, Z_2D)
+
+for piece in PIECES_2D:
+    palette_index(piece[-1])
+# The pieces' colors are palette indexes 1 to 7, in this order.
+
+ROTATIONS_2D = {id(piece): compile_rotations(piece) for piece in PIECES_2D}
+"""
+'{id(piece): compiled rotations}' of every piece in 'PIECES_2D',
+shared by all of the 'Piece2D' instances.
+
+(The piece tuples have lists in them, so they can't be the keys)
+"""
+
+
+@dataclass(frozen=True)
+class SpawnTemplate2D:
+    """
+    Everything a new 'Piece2D' of one kind needs, resolved ONCE
+    for the width of the board it spawns in,
+    so that spawning a piece only copies its start position.
+    (Look at 'Piece2D.spawn')
+
+    'piece': the piece tuple the template was made from (I_2D, J_2D, ...)
+    'pos': the piece's start position, in the middle of the board
+    'color', 'all_rotations': the piece's color and "#" rotations
+    'rotations': the piece's compiled rotations (look at 'ROTATIONS_2D')
+    """
+    piece: tuple
+    pos: tuple[int, int]
+    color: tuple
+    all_rotations: tuple
+    rotations: tuple[Rotation2D, ...]
+
+
+SPAWN_TEMPLATES_2D: dict[tuple[int, int], SpawnTemplate2D] = {}
+"""
+'{(id(piece), columns): SpawnTemplate2D}' of every piece
+that has spawned in a board with 'columns' columns.
+"""
+
+
+def spawn_template_2d(piece: tuple, columns: int = COLUMNS) -> SpawnTemplate2D:
+    """
+    Returns the 'SpawnTemplate2D' of 'piece' in a board
+    with 'columns' columns, making it the first time it's asked for.
+    """
+    template = SPAWN_TEMPLATES_2D.get((id(piece), columns))
+
+    if template is None or template.piece is not piece:
+        rotations = ROTATIONS_2D.get(id(piece))
+        if rotations is None:
+            rotations = compile_rotations(piece)
+
+        template = SpawnTemplate2D(
+            piece,
+            (piece[-2][0] + (columns - COLUMNS) // 2, piece[-2][1]),
+            piece[-1],
+            piece[:-2],
+            rotations
+        )
+        SPAWN_TEMPLATES_2D[(id(piece), columns)] = template
+    return template
+
+
+for piece in PIECES_2D:
+    spawn_template_2d(piece)
+# The templates of the default board are made when this module is imported.
+
+
 class Piece2D:
     """
     2D piece class with all of its rotation configurations,
@@ -154,22 +300,59 @@ class Piece2D:
     The rotation configurations must be matrices of list[str],
     made with # characters representing blocks, and " " characters
     representing space.
+
+    They're compiled into 'Rotation2D's once (look at 'ROTATIONS_2D'),
+    and ALL of the pieces of the same kind share them.
     """
+    __slots__ = (
+        "data", "pos", "color", "all_rotations", "rotations", "rotation")
 
-    def __init__(self, piece: tuple):
+    def __init__(self, piece: tuple, columns: int = COLUMNS):
         """
         'piece' should be I, J, L, O, S, T or Z.
 
         The rotation configurations must be matrices of list[str],
         made with # characters representing blocks, and " " characters
         representing space.
+
+        'columns' is the amount of columns of the board 'self' spawns in.
+        The piece's start position (made for a 'COLUMNS' wide board)
+        is moved over, so that the piece spawns in the middle of the board.
         """
-        piece = list(piece)
-        self.pos = list(piece.pop(-2))
-        self.color = piece.pop(-1)
-        self.all_rotations = piece
+        self.data = piece
+        # the piece tuple 'self' was made from
+
+        self.pos = [piece[-2][0] + (columns - COLUMNS) // 2, piece[-2][1]]
+        self.color = piece[-1]
+        self.all_rotations = piece[:-2]
+
+        rotations = ROTATIONS_2D.get(id(piece))
+        if rotations is None:
+            rotations = compile_rotations(piece)
+        self.rotations: tuple[Rotation2D, ...] = rotations
+
         self.rotation = 0
 
+    @classmethod
+    def spawn(cls, template: SpawnTemplate2D) -> "Piece2D":
+        """
+        Returns a new piece made from 'template',
+        the same as 'Piece2D(template.piece, columns)',
+        without looking up or compiling anything.
+        """
+        piece = cls.__new__(cls)
+        piece.data = template.piece
+        piece.pos = list(template.pos)
+        piece.color = template.color
+        piece.all_rotations = template.all_rotations
+        piece.rotations = template.rotations
+        piece.rotation = 0
+        return piece
+
+    def __repr__(self):
+        return f"Piece2D(pos={self.pos}, rotation={self.rotation}, " \
+            + f"color={self.color})"
+
     @property
     def piece(self):
         """
@@ -177,34 +360,30 @@ class Piece2D:
         """
         return self.all_rotations[self.rotation]
 
+    @property
+    def compiled(self) -> Rotation2D:
+        """
+        The current rotation configuration of 'self', compiled.
+        """
+        return self.rotations[self.rotation]
+
     @property
     def piece_width(self):
-        return len(self.piece[0])
+        return self.rotations[self.rotation].width
 
     @property
     def piece_height(self):
-        return len(self.piece)
+        return self.rotations[self.rotation].height
 
     def relative_square_positions(self):
         """
-        Returns the list of the positions of the squares
+        Returns the positions of the squares
         in 'self.piece', IF 'self' WHERE IN THE TOP LEFT
         OF THE BOARD (aka, the "relative position")
 
         THE POSITIONS ARE RETURNED (x, y), NOT (y, x)
         """
-        positions = []
-
-        for ri, row in enumerate(self.piece):
-            for ci, square in enumerate(row):
-
-                if square == "#":
-                    position = (ci, ri)
-                    # They're "backwards" because the ci is the x position,
-                    # and ri is the y position, and that's the order
-                    # of a coordinate here, and in the window display
-                    positions.append(position)
-        return positions
+        return self.rotations[self.rotation].squares
 
     def square_positions(self):
         """
@@ -213,102 +392,264 @@ class Piece2D:
 
         THE POSITIONS ARE RETURNED (x, y), NOT (y, x)
         """
-        positions = []
+        x_pos, y_pos = self.pos
+        return [
+            (x_pos + dx, y_pos + dy)
+            for dx, dy in self.rotations[self.rotation].squares
+        ]
 
-        for ri, row in enumerate(self.piece):
-            for ci, square in enumerate(row):
+    def row_masks(self) -> tuple[tuple[int, int], ...]:
+        """
+        Returns the rows of 'self.piece' that have squares in them,
+        as '(dy, mask)' tuples, from top to bottom,
+        where 'dy' is the row's index in 'self.piece',
+        and 'mask' has bit 'ci' set if the row has a square in column 'ci'.
 
-                if square == "#":
-                    position = (self.pos[0] + ci, self.pos[1] + ri)
-                    positions.append(position)
-        return positions
+        This is the format the board's bitmask collision checks use.
+        (Look at 'game.board_2d.BitBoard2D')
+        """
+        return self.rotations[self.rotation].row_masks
 
 
-class Game2D:
-    def __init__(self):
-        self.pieces = [I_2D, J_2D, L_2D, O_2D, S_2D, T_2D, Z_2D]
+@dataclass(frozen=True)
+class Snapshot2D:
+    """
+    The complete state of a 'Game2D', returned by 'Game2D.snapshot',
+    that 'Game2D.restore' can bring the game back to.
+
+    'piece': (piece tuple, rotation, x-pos, y-pos) of the current piece.
+    'next_piece': piece tuple of the next piece.
+    'board_type': the class of the board, which makes it again
+        from its snapshot. (Look at 'Board2D.from_snapshot')
+    'board': the board's own snapshot. (Look at 'Board2D.snapshot')
+    'score': (points, lines, level, transitioned) of the game's 'Score'.
+    'amount_of_levels_cleared': the game's 'amount_of_levels_cleared',
+        the amount of lines the last piece cleared.
+    'generator_state': state of the game's 'PieceGenerator',
+        which picks the next pieces.
+    """
+    piece: tuple
+    next_piece: tuple
+    board_type: type
+    board: tuple
+    score: tuple
+    amount_of_levels_cleared: int
+    generator_state: tuple
 
-        self.piece = Piece2D(random.choice(self.pieces))
-        self.next_piece = Piece2D(random.choice(self.pieces))
 
-        self.score_manager = Score()
+class Game2D(GameND):
+    """
+    The 2D game: 'Piece2D's falling in a board of 'self.rows' rows
+    and 'self.columns' columns, where the x axis goes LEFT to RIGHT,
+    and the y axis goes UP to DOWN.
+
+    The pieces are moved, rotated, landed, and their lines
+    cleared and scored by 'GameND' (look at 'game/game_nd.py'),
+    this class only says how 'Piece2D's spawn, rotate,
+    and are checked against the board (with their row masks).
+    """
+    MIN_SIZE = 4
+    """
+    The minimum amount of rows AND columns of a board,
+    so that every piece fits in it, in every rotation.
+    """
+    moves = {LEFT: (0, -1), RIGHT: (0, 1)}
+
+    def __init__(self, board_type: type = BitBoard2D,
+                 generator: PieceGenerator = None,
+                 rows: int = ROWS, columns: int = COLUMNS):
+        """
+        'board_type' is the class used to store 'self.board'.
+        (Look at 'game/board_2d.py',
+        'PaletteBoard2D' is the compact storage mode)
+
+        'generator' picks the game's pieces.
+        If it's None, the game gets a new 'PieceGenerator',
+        with a random seed.
+
+        'rows' and 'columns' are the size of the board.
+        They must be at least 'Game2D.MIN_SIZE'.
+        Moving, rotating, landing and clearing lines only look at
+        the rows of the piece and the cleared rows,
+        so huge boards (like 1000x64) play as fast as small ones.
+        """
+        if rows < Game2D.MIN_SIZE or columns < Game2D.MIN_SIZE:
+            raise ValueError(
+                f"The board must be at least {Game2D.MIN_SIZE}x"
+                f"{Game2D.MIN_SIZE}, not {rows}x{columns}")
+
+        self.rows = rows
+        self.columns = columns
 
-        self.board = {}
-        # {pos: color}
+        self.pieces = list(PIECES_2D)
+        self.spawn_templates = self._spawn_templates()
 
-        self.amount_of_levels_cleared: int = 0
+        super().__init__(
+            (columns, rows), len(self.pieces), board_type, generator)
+
+    def _new_board(self, squares):
+        return self.board_type(self.rows, self.columns, squares)
+
+    @property
+    def zobrist_hash(self) -> int:
+        """
+        64-bit Zobrist hash of the state of 'self':
+        the filled squares of the board, the current piece's kind,
+        rotation and position, and the next piece's kind.
+        (Look at 'game/zobrist.py')
+
+        The board keeps its part of the hash up to date
+        as squares are placed and lines are cleared,
+        and the pieces' parts are just 4 keys XOR'd on top of it,
+        so this never looks at the board's squares.
+        """
+        piece = self.piece
+        return self._board.zobrist_hash \
+            ^ piece.rotations[piece.rotation].key \
+            ^ feature_key("2d-x", piece.pos[0]) \
+            ^ feature_key("2d-y", piece.pos[1]) \
+            ^ feature_key("2d-next", self.next_piece.rotations[0].key)
+
+    def snapshot(self) -> Snapshot2D:
+        """
+        Returns the complete state of 'self' (board, current and next
+        pieces, score, and the state of the 'PieceGenerator' that picks
+        the pieces) as an immutable 'Snapshot2D'.
+
+        Much cheaper than 'copy.deepcopy', since nothing but the board's
+        rows is copied.
+        """
+        score = self.score_manager
+        return Snapshot2D(
+            (self.piece.data, self.piece.rotation,
+             self.piece.pos[0], self.piece.pos[1]),
+            self.next_piece.data,
+            self.board_type,
+            self._board.snapshot(),
+            (score.points, score.lines, score.level, score.transitioned),
+            self.amount_of_levels_cleared,
+            self.generator.getstate()
+        )
+
+    def restore(self, snapshot: Snapshot2D) -> None:
+        """
+        Brings 'self' back to the state in 'snapshot'.
+        (Look at 'self.snapshot')
+
+        The state of 'self.generator' is restored too,
+        so that the same pieces come next.
+        """
+        self.board_type = snapshot.board_type
+        self._board = self.board_type.from_snapshot(snapshot.board)
+        self.rows = self._board.row_count
+        self.columns = self._board.column_count
+        self.extents = (self.columns, self.rows)
+        self.spawn_templates = self._spawn_templates()
+
+        piece_data, rotation, x_pos, y_pos = snapshot.piece
+        self.piece = self._new_piece(piece_data)
+        self.piece.rotation = rotation
+        self.piece.pos = [x_pos, y_pos]
+
+        self.next_piece = self._new_piece(snapshot.next_piece)
+
+        self.score_manager = Score(*snapshot.score)
+        self.amount_of_levels_cleared = snapshot.amount_of_levels_cleared
+
+        self.generator.setstate(snapshot.generator_state)
+
+    def fork(self):
+        """
+        Returns a new 'Game2D' in the same state as 'self',
+        that can be played without changing 'self'.
         """
-        Amount of levels (lines/floors, IN THIS CASE, LINES)
-        the player cleared when the last piece landed.
+        game = Game2D.__new__(Game2D)
+        game.pieces = self.pieces
+        game.generator = self.generator.copy()
+        game.restore(self.snapshot())
+        return game
 
-        Set by 'self.clear_lines', which is called RIGHT AFTER a piece lands,
-        in the same game step/frame.
+    def _new_piece(self, piece: tuple) -> Piece2D:
         """
+        Returns a new 'Piece2D' of the kind 'piece',
+        in its start position in 'self.board'.
+        (Look at 'SpawnTemplate2D')
+        """
+        return Piece2D.spawn(spawn_template_2d(piece, self.columns))
 
-    def init_random_piece(self):
-        self.piece = self.next_piece
-        self.next_piece = Piece2D(random.choice(self.pieces))
+    def _spawn_templates(self) -> tuple[SpawnTemplate2D, ...]:
+        """
+        Returns the 'SpawnTemplate2D' of each piece in 'self.pieces',
+        in the same order, for 'self's board.
 
-    def move_piece_down(self):
-        self.piece.pos[1] += 1
+        'self.spawn_templates' is what 'self.init_random_piece'
+        spawns the pieces from, so it has to be set again
+        if 'self.pieces' or the board's size change.
+        """
+        return tuple(
+            spawn_template_2d(piece, self.columns) for piece in self.pieces)
 
-    def try_move(self, move):
-        """Tries to move piece down, and returns
-        weather or not it was successfully moved.
+    def _spawn_piece(self) -> Piece2D:
+        return Piece2D.spawn(
+            self.spawn_templates[self.generator.next_index()])
 
-        A piece can be successfully moved if it's
-        next position (SHOULD always be one over...)
-        doesn't overlap any existing blocks in the board.
+    def _collides(self, piece: Piece2D, pos) -> bool:
+        x_pos, y_pos = pos
+        return self._board.collides(piece.row_masks(), x_pos, y_pos)
 
-        Moves can be: LEFT, RIGHT, SOFT_DROP or HARD_DROP.
+    def _fits(self, piece: Piece2D, pos) -> bool:
         """
+        Unlike moving, rotating can't make the piece
+        stick out of the top of the board.
+        (Look at 'Board2D.fits')
+        """
+        x_pos, y_pos = pos
+        return self._board.fits(piece.row_masks(), x_pos, y_pos)
+
+    def _place(self, piece: Piece2D) -> None:
+        self._board.place(
+            piece.row_masks(), piece.pos[0], piece.pos[1], piece.color)
+
+    def _clear(self, level_indexes) -> int:
+        return self._board.clear_rows(level_indexes)
 
-        if move == "l":
-            for x_pos, y_pos in self.piece.square_positions():
-                if self.board.get((x_pos - 1, y_pos)) or \
-                        x_pos == 0:
-                    return False
-            self.piece.pos[0] -= 1
-            return True
+    def _levels(self, piece: Piece2D) -> range:
+        return range(piece.pos[1], piece.pos[1] + piece.piece_height)
 
-        if move == "r":
-            for x_pos, y_pos in self.piece.square_positions():
-                if self.board.get((x_pos + 1, y_pos)) or \
-                        x_pos == COLUMNS - 1:
-                    return False
-            self.piece.pos[0] += 1
-            return True
+    def _rotate(self, piece: Piece2D, rotation, clockwise: bool) -> None:
+        self.rotate(clockwise)
 
-        if move == "h":
-            # If the move is a hard drop,
-            while not self.landed():
-                self.move_piece_down()
-            return True
-            # We move the piece down until it lands.
+    def _check_rotation(self, rotation) -> None:
+        pass
+    # (2D pieces only rotate one way)
 
-        elif move == "s" and not self.landed():
-            # If the move is a soft drop, and we haven't landed,
-            self.move_piece_down()
-            return True
-            # We move down once.
+    init_random_piece = GameND._init_random_piece
+    move_piece_down = GameND._move_piece_down
+    clear_lines = GameND._clear_levels
 
-    def set_down(self):
+    def drop_distance(self, piece: Piece2D = None) -> int:
         """
-        Makes piece 'inbeded' in board.
-        AKA: "puts" the squares of the piece
-        in the 'self.board' dictionary.
+        Returns how many squares 'piece' (or 'self.piece' if not given)
+        can move down before it lands, using the board's skyline
+        (Look at 'BitBoard2D.drop_distance').
+
+        Used for hard drops and the ghost piece,
+        and can be used to evaluate where a piece would land
+        without moving it.
         """
-        for square_pos in self.piece.square_positions():
-            self.board[square_pos] = self.piece.color
+        if piece is None:
+            piece = self.piece
+        return self._board.drop_distance(
+            piece.compiled.bottom, piece.pos[0], piece.pos[1])
 
     def try_move_up(self):
         """
         Moves 'self'ss current piece up unless a square above it blocks it.
         Returns weather or not it was able to move up.
         """
-        for x_pos, y_pos in self.piece.square_positions():
-            if self.board.get((x_pos, y_pos - 1)):
-                return False
+        if self._collides(
+                self.piece, (self.piece.pos[0], self.piece.pos[1] - 1)):
+            return False
 
         self.piece.pos[1] -= 1
         return True
@@ -331,36 +672,30 @@ class Game2D:
         Returns True if rotation succeeded, and False if the rotation
         needed to be cancelled.
         """
-        self.rotate(clockwise)
-
-        if any(
-            pos in self.board
-            or pos[0] not in range(COLUMNS)
-            or pos[1] not in range(ROWS)
-            for pos in self.piece.square_positions()
-        ):
-            self.rotate(not clockwise)
+        return super().try_rotate(0, clockwise)
 
-            return False
-        return True
-
-    def landed(self):
+    def rotation_mask(self) -> int:
         """
-        Checks if 'self's current piece landed.
-        A piece has landed if the floor or
-        another square is EXACTLY one square below
-        one of the piece's squares.
+        Returns which rotations 'self.piece' can do right now,
+        as a bitmask where bit 'clockwise' is set
+        if 'self.try_rotate(clockwise)' would succeed.
+        (bit 0: counterclockwise, bit 1: clockwise)
+
+        DOESN'T ROTATE THE PIECE:
+        the rotations it would end up in are looked up
+        in its compiled 'rotations'.
         """
-        for square_pos in reversed(self.piece.square_positions()):
-            # 'self.piece.square_positions' returns all of the squares
-            # in order: up->down, left->right.
-            # We want to scan down->up.
-            if self.board.get((square_pos[0], square_pos[1] + 1)) or \
-                    square_pos[1] == ROWS - 1:
-                # If there's a block or the wall underneath it...
-                # Return True.
-                return True
-        return False
+        rotations = self.piece.rotations
+        rotation = self.piece.rotation
+        x_pos, y_pos = self.piece.pos
+
+        mask = 0
+        for bit, target in enumerate((rotation - 1, rotation + 1)):
+            if self.board.fits(
+                    rotations[target % len(rotations)].row_masks,
+                    x_pos, y_pos):
+                mask |= 1 << bit
+        return mask
 
     def landing_handler(self):
         """If a piece landed, marks it at the previous piece,
@@ -369,89 +704,3 @@ class Game2D:
             self.set_down()
             self.clear_lines(self.piece)
             self.init_random_piece()
-
-    def clear_lines(self, previous_piece: Piece2D) -> int:
-        """
-        Finds every row in 'previous_piece', ASSUMING THAT
-        'previous_piece' IS THE PIECE THAT JUST LANDED,
-        and clears all of the lines it completes.
-
-        Stores the amount of lines the player just cleared
-        in 'self.amount_of_lines_cleared'.
-        """
-        # time: O(n), where n is: height of piece
-        # space: O(n), where n is: height of piece
-        deleted_rows = set()
-
-        for y_pos, row in zip(
-                range(len(previous_piece.piece), 0, -1), previous_piece.piece):
-            # look at each row in the dropped piece
-            square_y_pos = self.piece.pos[1] + len(self.piece.piece) - y_pos
-
-            for x_pos in range(COLUMNS):
-                if not ((x_pos, square_y_pos) in self.board):
-                    break
-            else:
-                # If the whole row in the board is filled
-                for x_pos in range(COLUMNS):
-                    self.board.pop((x_pos, square_y_pos))
-                # remove that row
-                deleted_rows.add(square_y_pos)
-                # keep track of that row
-
-        landing_row = 0
-        for row in deleted_rows:
-            if row > landing_row:
-                landing_row = row
-        # lowest deleted row is where all the rows with gunk in them will
-        # 'land' on.
-
-        gunk_row = landing_row - 1
-        while gunk_row > -1:
-            if not (gunk_row in deleted_rows):
-                # if row has gunk in it
-                for x_pos in range(COLUMNS):
-                    if (x_pos, gunk_row) in self.board:
-                        self.board[(x_pos, landing_row)] = self.board.pop(
-                            (x_pos, gunk_row))
-                # move that row down to the landing row
-
-                landing_row -= 1
-            gunk_row -= 1
-
-        self.amount_of_levels_cleared = len(deleted_rows)
-        self.score_manager.score(self.amount_of_levels_cleared)
-
-    def play(self):
-        """
-        Plays Tetris for one "step" (where the piece goes one down),
-        and returns True if the game can continue,
-        and False it the game is over.
-
-        This is the "step":
-        If the current piece has landed,
-        we set it down using 'self.set_down',
-        clear any lines the piece completed with 'self.clear_lines'
-        and makes a new piece.
-
-        If the new piece spawns where it immediately lands,
-        the game is over.
-
-        If the piece hasn't landed, or if the game isn't over,
-        we just move the piece one down using
-        'self.move_piece_down'.
-        """
-        if self.landed():
-            self.set_down()
-            self.clear_lines(self.piece)
-            self.init_random_piece()
-
-            if any(
-                block in self.board
-                for block in self.piece.square_positions()
-            ):
-                return False
-        else:
-            self.move_piece_down()
-
-        return True
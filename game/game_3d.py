@@ -17,10 +17,16 @@ The AXII INDEXES IN 'Game3D' and 'Piece3D' ARE DEFINED AS:
 1: y: front->back
 2: z: top->bottom
 """
-from numpy import zeros, ndarray, rot90
-import random
-from game.score import Score
+from numpy import (zeros, ndarray, rot90, arange, argwhere,
+                   ascontiguousarray, stack)
+from dataclasses import dataclass, field
+from functools import lru_cache
 from game.move_data import *
+from game.board_3d import BitBoard3D
+from game.game_nd import GameND
+from game.palette import palette_index
+from game.zobrist import feature_key
+from game.piece_generator import PieceGenerator
 
 I_3D = zeros(
     (4, 4, 4)
@@ -121,6 +127,11 @@ All of the classic 2D Tetrominos, but padded to be 3D boxes.
 2D Tetrominos
 """
 
+for piece in PIECES_3D:
+    palette_index(piece[-1])
+# So that the pieces' colors have the first palette indexes after
+# the 2D pieces' colors, no matter which board stores them first.
+
 FLOOR_WIDTH = 4
 FLOORS = 20
 
@@ -129,6 +140,363 @@ Y_AXIS = 1
 Z_AXIS = 2
 AXII = [X_AXIS, Y_AXIS, Z_AXIS]
 
+HORIZONTAL_MOVES_3D = {
+    LEFT: (X_AXIS, -1),
+    RIGHT: (X_AXIS, 1),
+    FRONT: (Y_AXIS, -1),
+    BACK: (Y_AXIS, 1),
+}
+"""
+{move: (axis, direction)} of the moves that move the piece
+one cube along the floor.
+"""
+
+
+def rotate_blocks(blocks: ndarray, axis: int, clockwise: bool) -> ndarray:
+    """
+    Returns 'blocks' rotated AROUND 'axis'
+    however 'clockwise' specifies,
+
+    ASSUMING 'blocks' is a cube.
+    (Read the 'Piece3D' docstring)
+    """
+    rotation_axii = [X_AXIS, Y_AXIS, Z_AXIS]
+
+    if axis not in AXII:
+        raise ValueError(
+            "Rotation axis 'axis'"
+            + "can only be 'X_AXIS, 'Y_AXIS' or 'Z_AXIS'.\n"
+            + f"Got: {axis}"
+        )
+
+    rotation_axii.remove(axis)
+
+    if axis == Z_AXIS or axis == X_AXIS:
+        clockwise = not clockwise
+    # numpy matrix rotation is flipped in the Y axis,
+    # according to our description of the piece,
+    # so we must account for it, by flipping the Y axis'
+    # rotation's direction here.
+
+    return rot90(
+        blocks,
+        1 if clockwise else 3,
+        tuple(rotation_axii))
+
+
+@dataclass(frozen=True, eq=False)
+class Orientation3D:
+    """
+    One orientation of a 3D piece, computed ONCE
+    (look at 'compile_orientations'):
+
+    'blocks': the piece's blocks matrix in this orientation (read-only)
+    'offsets': (k, 3) int array of the (x, y, z) offsets of the piece's
+        blocks from its left-front-top corner, in the same order as
+        'Piece3D.block_positions' (read-only)
+    'positions': the same offsets, as a tuple of (x, y, z) tuples
+    'bounds': (min dx, min dy, min dz, max dx, max dy, max dz)
+        of the offsets
+    'bottom': '(dx, dy, dz)' of the lowest block of each of the piece's
+        (dx, dy) columns, which are the blocks that land on something.
+    'key': the Zobrist key of the piece in this orientation
+        (look at 'game/zobrist.py')
+    """
+    blocks: ndarray
+    offsets: ndarray
+    positions: tuple[tuple[int, int, int], ...]
+    bounds: tuple[int, int, int, int, int, int]
+    bottom: tuple[tuple[int, int, int], ...]
+    key: int
+    _floor_masks: dict = field(default_factory=dict, repr=False)
+
+    def floor_masks(self, floor_width: int) -> tuple[tuple[int, int], ...]:
+        """
+        Returns the piece's "footprint" on each floor it has blocks in,
+        as '(dz, mask)' tuples, from top to bottom,
+        where 'mask' has bit 'dy * floor_width + dx' set
+        if the piece has a block at (dx, dy, dz).
+
+        Moved 'y * floor_width + x' bits over, the footprints are the
+        cubes the piece fills in the floors of a board 'floor_width' wide,
+        with its left-front-top corner at (x, y).
+        (Look at 'game.board_3d.BitBoard3D')
+
+        Computed once for each 'floor_width'.
+        """
+        floor_masks = self._floor_masks.get(floor_width)
+
+        if floor_masks is None:
+            masks = {}
+            for dx, dy, dz in self.positions:
+                masks[dz] = masks.get(dz, 0) | 1 << dy * floor_width + dx
+            floor_masks = tuple(sorted(masks.items()))
+            self._floor_masks[floor_width] = floor_masks
+
+        return floor_masks
+
+
+@dataclass(frozen=True, eq=False)
+class OrientationTable3D:
+    """
+    All 24 orientations of a 3D piece (every way a cube can be rotated),
+    and how rotating the piece moves between them.
+
+    'color': the color of the piece the table was made for.
+    'orientations': the 'Orientation3D's, where orientation 0
+        is the blocks matrix the table was made from.
+    'transitions': 'transitions[orientation][axis][clockwise]'
+        is the orientation the piece ends up in when it's rotated
+        around 'axis' from 'orientation'.
+        ('clockwise' is a bool, so it indexes 0 or 1)
+    'rotations': 'rotations[orientation][axis * 2 + clockwise]'
+        is the 'Orientation3D' the piece ends up in when it's rotated
+        around 'axis' from 'orientation'.
+        (the same as 'transitions', flattened in the order of the bits
+        of 'Game3D.rotation_mask')
+    'rotation_blocks': 'rotation_blocks[orientation]' is the read-only
+        stack of the blocks matrices of 'rotations[orientation]',
+        so that boards can check all of them at once.
+
+    Symmetric pieces (like O) have orientations with the same
+    blocks matrix, but they're still different orientations,
+    so rotating goes through them exactly like 'rotate_blocks' does.
+    """
+    color: tuple
+    orientations: tuple[Orientation3D, ...]
+    transitions: tuple[tuple[tuple[int, int], ...], ...]
+    rotations: tuple[tuple[Orientation3D, ...], ...]
+    rotation_blocks: tuple[ndarray, ...]
+
+
+def _orientation(blocks: ndarray, color: tuple) -> Orientation3D:
+    blocks = ascontiguousarray(blocks)
+    blocks.flags.writeable = False
+
+    offsets = argwhere(blocks)
+    offsets.flags.writeable = False
+    positions = tuple(map(tuple, offsets.tolist()))
+
+    bottom = {}
+    for dx, dy, dz in positions:
+        if dz > bottom.get((dx, dy), -1):
+            bottom[(dx, dy)] = dz
+
+    return Orientation3D(
+        blocks,
+        offsets,
+        positions,
+        (*offsets.min(axis=0).tolist(), *offsets.max(axis=0).tolist()),
+        tuple((dx, dy, dz) for (dx, dy), dz in sorted(bottom.items())),
+        feature_key("3d-piece", color, blocks.shape, blocks.tobytes())
+    )
+
+
+def compile_orientations(blocks: ndarray, color: tuple) -> OrientationTable3D:
+    """
+    Returns the 'OrientationTable3D' of the piece with 'blocks' and 'color'.
+
+    The orientations are found by rotating a "probe" cube
+    (the same size as 'blocks', with a different number in each cell)
+    around every axis until no new rotation of it shows up,
+    rotating 'blocks' the same way.
+    The probe tells the orientations apart even when
+    the piece's blocks matrices are the same.
+    """
+    probes = [arange(blocks.size).reshape(blocks.shape)]
+    matrices = [blocks]
+    indexes = {probes[0].tobytes(): 0}
+    transitions = []
+
+    while len(transitions) < len(probes):
+        orientation = len(transitions)
+        axis_transitions = []
+
+        for axis in AXII:
+            rotations = []
+            for clockwise in (False, True):
+                probe = rotate_blocks(probes[orientation], axis, clockwise)
+                probe_bytes = probe.tobytes()
+
+                if probe_bytes not in indexes:
+                    indexes[probe_bytes] = len(probes)
+                    probes.append(probe)
+                    matrices.append(rotate_blocks(
+                        matrices[orientation], axis, clockwise))
+                rotations.append(indexes[probe_bytes])
+            axis_transitions.append(tuple(rotations))
+        transitions.append(tuple(axis_transitions))
+
+    orientations = tuple(_orientation(matrix, color) for matrix in matrices)
+
+    rotations = tuple(
+        tuple(
+            orientations[orientation_transitions[axis][clockwise]]
+            for axis in AXII
+            for clockwise in (False, True)
+        )
+        for orientation_transitions in transitions
+    )
+    rotation_blocks = []
+    for targets in rotations:
+        blocks_stack = stack([target.blocks != 0 for target in targets])
+        blocks_stack.flags.writeable = False
+        rotation_blocks.append(blocks_stack)
+
+    return OrientationTable3D(
+        color,
+        orientations,
+        tuple(transitions),
+        rotations,
+        tuple(rotation_blocks)
+    )
+
+
+ORIENTATIONS_3D = {
+    id(blocks): compile_orientations(blocks, color)
+    for blocks, color in PIECES_3D
+}
+"""
+'{id(blocks): OrientationTable3D}' of each piece in 'PIECES_3D',
+computed once, when this module is imported.
+(The blocks matrices are unhashable, hence the id's)
+"""
+
+
+@dataclass(frozen=True)
+class SpawnTemplate3D:
+    """
+    Everything a new 'Piece3D' of one kind needs to spawn in a game,
+    resolved ONCE for the width of the floors it spawns in,
+    so that spawning a piece only copies its start position.
+    (Look at 'Piece3D.spawn')
+
+    'color': the piece's color
+    'table': the piece's 'OrientationTable3D'
+    'orientation': the orientation pieces spawn in,
+        rotated to "face the player" (look at 'spawn_templates_3d')
+    'pos': the piece's start position, in the middle of the floors
+    """
+    color: tuple
+    table: OrientationTable3D
+    orientation: int
+    pos: tuple[int, int, int]
+
+
+@lru_cache(maxsize=None)
+def spawn_templates_3d(
+        floor_width: int = FLOOR_WIDTH) -> tuple[SpawnTemplate3D, ...]:
+    """
+    Returns the 'SpawnTemplate3D' of each piece in 'PIECES_3D',
+    in the same order, for floors 'floor_width' cubes wide.
+
+    The pieces spawn rotated clockwise around Z_AXIS and then Y_AXIS,
+    to make them "face the player", perhaps in a more familiar way.
+    """
+    templates = []
+
+    for blocks, color in PIECES_3D:
+        table = ORIENTATIONS_3D[id(blocks)]
+        orientation = table.transitions[0][Z_AXIS][True]
+        orientation = table.transitions[orientation][Y_AXIS][True]
+        start = floor_width // 2 - len(blocks) // 2
+
+        templates.append(
+            SpawnTemplate3D(color, table, orientation, (start, start, 0)))
+    return tuple(templates)
+
+
+spawn_templates_3d(FLOOR_WIDTH)
+# The templates of the default floors are made when this module is imported.
+
+
+@dataclass(frozen=True, eq=False)
+class CanonicalOrientations3D:
+    """
+    The DISTINCT shapes a 3D piece can be rotated into,
+    out of the 24 orientations of its 'OrientationTable3D',
+    so that searching for placements only tries each shape once.
+
+    Two orientations have the same shape if they have the same cubes,
+    once they're moved to the left-front-top corner of their matrix:
+    (like the I piece lying along the same axis in different columns
+    of its matrix, or the O piece flipped over)
+    a piece in one of them can be in the same cubes as a piece
+    in the other one, just with a different 'pos'.
+
+    'table': the piece's 'OrientationTable3D'
+    'start': the orientation the rotation sequences start from
+    'ids': 'ids[orientation]' is the canonical id of the shape
+        of 'orientation'. Ids are numbered from 0 ('start's shape),
+        in the order the shapes are reached from 'start'.
+    'orientations': 'orientations[id]' is the orientation of shape 'id'
+        with the fewest rotations from 'start'
+    'rotations': 'rotations[id]' is the shortest sequence of
+        '(axis, clockwise)' rotations from 'start' to 'orientations[id]'
+    """
+    table: OrientationTable3D
+    start: int
+    ids: tuple[int, ...]
+    orientations: tuple[int, ...]
+    rotations: tuple[tuple[tuple[int, bool], ...], ...]
+
+
+@lru_cache(maxsize=None)
+def canonical_orientations_3d(
+        table: OrientationTable3D, start: int = 0) -> CanonicalOrientations3D:
+    """
+    Returns the 'CanonicalOrientations3D' of the piece of 'table',
+    with the rotation sequences starting from orientation 'start'.
+
+    The orientations are visited breadth-first from 'start',
+    (trying the axii and directions in the same order as
+    'table.rotations') so the first orientation found with each shape
+    is one of the closest ones to 'start'.
+    """
+    paths = {start: ()}
+    queue = [start]
+    for orientation in queue:
+        for axis in AXII:
+            for clockwise in (False, True):
+                target = table.transitions[orientation][axis][clockwise]
+                if target not in paths:
+                    paths[target] = paths[orientation] + ((axis, clockwise),)
+                    queue.append(target)
+    # 'queue' grows while it's looped over, so it's visited in BFS order.
+
+    shape_ids = {}
+    orientations = []
+    rotations = []
+    ids = [0] * len(table.orientations)
+
+    for orientation in queue:
+        compiled = table.orientations[orientation]
+        min_dx, min_dy, min_dz = compiled.bounds[:3]
+        shape = tuple(
+            (dx - min_dx, dy - min_dy, dz - min_dz)
+            for dx, dy, dz in compiled.positions
+        )
+
+        if shape not in shape_ids:
+            shape_ids[shape] = len(orientations)
+            orientations.append(orientation)
+            rotations.append(paths[orientation])
+        ids[orientation] = shape_ids[shape]
+
+    return CanonicalOrientations3D(
+        table, start, tuple(ids), tuple(orientations), tuple(rotations))
+
+
+CANONICAL_ORIENTATIONS_3D = tuple(
+    canonical_orientations_3d(template.table, template.orientation)
+    for template in spawn_templates_3d(FLOOR_WIDTH)
+)
+"""
+The 'CanonicalOrientations3D' of each piece in 'PIECES_3D',
+in the same order, with the rotation sequences starting from the
+orientation the pieces spawn in. (Look at 'spawn_templates_3d')
+"""
+
 
 class Piece3D:
     """
@@ -148,18 +516,22 @@ class Piece3D:
     in the Game3D board. (scroll down)
     """
 
-    def __init__(self, blocks: ndarray, color: tuple[int, int, int]) -> None:
+    def __init__(self, blocks: ndarray, color: tuple[int, int, int],
+                 floor_width: int = FLOOR_WIDTH) -> None:
         """
         Copies the parameters,
         BUT CHECKS THAT 'blocks' IS A 3D ARRAY,
         AND THROWS AN ERROR IF IT ISNT.
+
+        'floor_width' is the width of the board 'self' spawns in,
+        so that the piece spawns in the middle of its floors.
         """
         self.pos = [
-            FLOOR_WIDTH //
+            floor_width //
             2 -
             len(blocks) //
             2,
-            FLOOR_WIDTH //
+            floor_width //
             2 -
             len(blocks) //
             2,
@@ -169,13 +541,50 @@ class Piece3D:
         if len(blocks.shape) != 3:
             raise TypeError(f"'blocks' argument isn't a 3D numpy matrix!")
 
-        self.blocks = blocks
         self.color = color
+        self.blocks = blocks
+
+    @classmethod
+    def spawn(cls, template: SpawnTemplate3D) -> "Piece3D":
+        """
+        Returns a new piece made from 'template',
+        in its spawn orientation and start position,
+        without looking up, compiling or rotating anything.
+        """
+        piece = cls.__new__(cls)
+        piece.pos = list(template.pos)
+        piece.color = template.color
+        piece.table = template.table
+        piece.orientation = template.orientation
+        return piece
 
     def __str__(self):
         return "Piece(" \
             + "pos={self.pos}, blocks={self.blocks}, color={self.color=})"
 
+    @property
+    def blocks(self) -> ndarray:
+        """
+        The piece's blocks matrix, in its current orientation.
+        (read-only, shared by all of the pieces of the same kind)
+        """
+        return self.table.orientations[self.orientation].blocks
+
+    @blocks.setter
+    def blocks(self, blocks: ndarray):
+        table = ORIENTATIONS_3D.get(id(blocks))
+        if table is None or table.color != self.color:
+            table = compile_orientations(blocks, self.color)
+        self.table: OrientationTable3D = table
+        self.orientation = 0
+
+    @property
+    def compiled(self) -> Orientation3D:
+        """
+        The piece's current orientation, compiled.
+        """
+        return self.table.orientations[self.orientation]
+
     def rotate(self, axis: int, clockwise: bool):
         """
         Rotates self's blocks AROUND 'axis'
@@ -183,9 +592,10 @@ class Piece3D:
 
         ASSUMING 'self.blocks' is a cube.
         (Read this class' docstring)
-        """
-        rotation_axii = [X_AXIS, Y_AXIS, Z_AXIS]
 
+        The rotation is looked up in 'self.table.transitions',
+        and gives the same blocks as 'rotate_blocks'.
+        """
         if axis not in AXII:
             raise ValueError(
                 "Rotation axis 'axis'"
@@ -193,19 +603,8 @@ class Piece3D:
                 + f"Got: {axis}"
             )
 
-        rotation_axii.remove(axis)
-
-        if axis == Z_AXIS or axis == X_AXIS:
-            clockwise = not clockwise
-        # numpy matrix rotation is flipped in the Y axis,
-        # according to our description of the piece,
-        # so we must account for it, by flipping the Y axis'
-        # rotation's direction here.
-
-        self.blocks = rot90(
-            self.blocks,
-            1 if clockwise else 3,
-            tuple(rotation_axii))
+        self.orientation = \
+            self.table.transitions[self.orientation][axis][bool(clockwise)]
 
     def block_positions(self):
         """
@@ -213,35 +612,38 @@ class Piece3D:
         relative to the board.
         (aka: 'self.pos' + block_pos, as 3D vectors)
         """
-        positions = []
-
-        for x_pos, vertical_slice in enumerate(self.blocks):
-            for y_pos, column in enumerate(vertical_slice):
-                for z_pos, block in enumerate(column):
-                    if block:
-                        positions.append((
-                            x_pos + self.pos[0],
-                            y_pos + self.pos[1],
-                            z_pos + self.pos[2]
-                        ))
-        return positions
+        x_pos, y_pos, z_pos = self.pos
+        return [
+            (x_pos + dx, y_pos + dy, z_pos + dz)
+            for dx, dy, dz in self.compiled.positions
+        ]
 
     def relative_block_positions(self):
         """
         Returns all of the block's positions relative
         to the PIECE position, AKA the top-left-front position
+
+        The positions are computed once per orientation
+        (look at 'Orientation3D.positions'), and copied into a new list.
         """
-        positions = []
+        return list(self.compiled.positions)
 
-        for x_pos, vertical_slice in enumerate(self.blocks):
-            for y_pos, column in enumerate(vertical_slice):
-                for z_pos, block in enumerate(column):
-                    if block:
-                        positions.append((x_pos, y_pos, z_pos))
-        return positions
+    def block_offsets(self) -> ndarray:
+        """
+        Returns 'self.relative_block_positions' as a read-only
+        (k, 3) int array, where 'k' is the amount of blocks in 'self'.
+        """
+        return self.compiled.offsets
+
+    def block_position_array(self) -> ndarray:
+        """
+        Returns 'self.block_positions' as a new (k, 3) int array,
+        where 'k' is the amount of blocks in 'self'.
+        """
+        return self.compiled.offsets + self.pos
 
 
-class Game3D:
+class Game3D(GameND):
     """
     3D current and next pieces,
     a ScoreManager instance, and a board dictionary
@@ -260,291 +662,131 @@ class Game3D:
     AND 'self.try_move' WILL MOVE THE PIECES ACCORDING TO
     THIS 3D PROJECTION METHOD (used in 'main.py'):
 
-    x axis: LEFT to RIGHT (0 -> FLOOR_WIDTH)
-    y axis: FRONT to BACK (0 -> FLOOR_WIDTH)
-    z axis: UP to DOWN (0 -> FLOORS)
+    x axis: LEFT to RIGHT (0 -> self.floor_width)
+    y axis: FRONT to BACK (0 -> self.floor_width)
+    z axis: UP to DOWN (0 -> self.floors)
+
+    The pieces are moved, rotated, landed, and their floors
+    cleared and scored by 'GameND' (look at 'game/game_nd.py'),
+    this class only says how 'Piece3D's spawn, rotate,
+    and are checked against the board.
     """
+    moves = HORIZONTAL_MOVES_3D
+    KEEPS_LEVELS_CLEARED = True
+    # ('main.py' sets it back to 0 after showing it)
 
-    def __init__(self):
-        self.piece = Piece3D(*random.choice(PIECES_3D))
-        self.next_piece = Piece3D(*random.choice(PIECES_3D))
+    def __init__(self, board_type: type = BitBoard3D,
+                 generator: PieceGenerator = None, debug: bool = False,
+                 floor_width: int = FLOOR_WIDTH, floors: int = FLOORS):
+        """
+        'board_type' is the class used to store 'self.board'.
+        (Look at 'game/board_3d.py',
+        'BitBoard3D' is the per-floor bitmask backend, with a height map,
+        'ArrayBoard3D' is the numpy array backend,
+        'DictBoard3D' is the plain dictionary)
+
+        'generator' picks the game's pieces from 'PIECES_3D'.
+        If it's None, the game gets a new 'PieceGenerator',
+        with a random seed.
+
+        'debug' turns on the sanity checks that the piece never
+        overlaps the board's cubes when it moves down.
+        (Look at 'self._check_overlap')
+
+        'floor_width' and 'floors' are the size of the board,
+        and must be at least 'Game3D.MIN_SIZE'.
+        Moving, rotating and landing only look at the floors
+        and columns the piece is in, so wide and deep wells
+        (like 16x16x80) play about as fast as small ones,
+        as long as their board backend clears floors in bulk.
+        (Look at 'game/board_3d.py')
+        """
+        if floor_width < Game3D.MIN_SIZE or floors < Game3D.MIN_SIZE:
+            raise ValueError(
+                f"The board must be at least {Game3D.MIN_SIZE}x"
+                f"{Game3D.MIN_SIZE}x{Game3D.MIN_SIZE}, "
+                f"not {floor_width}x{floor_width}x{floors}")
 
-        self.piece.rotate(Z_AXIS, True)
-        self.piece.rotate(Y_AXIS, True)
-        self.next_piece.rotate(Z_AXIS, True)
-        self.next_piece.rotate(Y_AXIS, True)
-        # To make pieces "face the player",
-        # perhaps in a more familiar way.
+        self.debug = debug
+        self.floor_width = floor_width
+        self.floors = floors
+        self.spawn_templates = spawn_templates_3d(floor_width)
 
-        self.score_manager = Score()
+        super().__init__(
+            (floor_width, floor_width, floors), len(PIECES_3D),
+            board_type, generator)
 
-        self.board = {}
-        # {3D_pos: color}
+    def _new_board(self, squares):
+        return self.board_type(self.floor_width, self.floors, squares)
 
-        self.amount_of_levels_cleared: int = 0
+    @staticmethod
+    def _piece_key(piece: Piece3D) -> int:
         """
-        Amount of levels (lines/floors, IN THIS CASE, FLOORS)
-        the player cleared when the last piece landed.
-
-        Set by 'self.clear_floors', which is called RIGHT AFTER a piece lands,
-        in the same game step/frame.
+        Returns the Zobrist key of 'piece' being in its current rotation.
+        (The piece's color and its blocks' matrix tell which piece it is,
+        and how it's rotated, look at 'Orientation3D.key')
         """
+        return piece.compiled.key
 
-    def _init_random_piece(self) -> None:
+    @property
+    def zobrist_hash(self) -> int:
         """
-        Makes 'self.piece' to be 'self.next_piece'
-        and initializes a random new 'self.next_piece',
-
-        with the UNPACKED data in 'PIECES_3D'.
-        (higher up in the file)
+        64-bit Zobrist hash of the state of 'self':
+        the filled cubes of the board, the current piece's kind,
+        rotation and position, and the next piece's kind.
+        (Look at 'game/zobrist.py')
+
+        The board keeps its part of the hash up to date
+        as cubes are placed and floors are cleared,
+        and the pieces' parts are just a few keys XOR'd on top of it,
+        so this never looks at the board's cubes.
         """
-        self.piece = self.next_piece
-        self.next_piece = Piece3D(*random.choice(PIECES_3D))
-
-        self.next_piece.rotate(Z_AXIS, True)
-        self.next_piece.rotate(Y_AXIS, True)
-        # To make pieces "face the player",
-        # perhaps in a more familiar way.
+        return self._board.zobrist_hash \
+            ^ self._piece_key(self.piece) \
+            ^ feature_key("3d-pos", *self.piece.pos) \
+            ^ feature_key("3d-next", self._piece_key(self.next_piece))
 
-    def _move_piece_down(self) -> None:
+    def _spawn_piece(self) -> Piece3D:
         """
-        Moves 'self.piece' one floor down
-        AKA adds one to its z-pos.
-
-        If 'self.piece' overlaps any block in self.board,
-        this method raises ValueError.
+        Returns a new piece, picked from 'PIECES_3D' by 'self.generator',
+        in the middle of 'self's floors, "facing the player".
+        (Look at 'spawn_templates_3d')
         """
-        self.piece.pos[2] += 1
+        return Piece3D.spawn(
+            self.spawn_templates[self.generator.next_index()])
 
-        if any(
-            block in self.board
-            for block in self.piece.block_positions()
-        ):
-            raise ValueError(
-                "Moved piece down,"
-                + f"overlapping board block! {self.board=} {self.piece=}"
-            )
+    def _clear(self, level_indexes) -> int:
+        return self._board.clear_floors(level_indexes)
 
-    def try_move(self, move: str) -> bool:
+    def _check_rotation(self, axis: int) -> None:
         """
-        Tries to move piece in 'move' direction.
-        The direction options are defined in
-        'game.move_data.py', in this folder.
-
-        If the piece were to overlap another cube, or have any of its
-        cubes outside the position ranges of the board,
-        THE MOVE FAILS.
-
-        OTHERWISE, THE MOVE SUCCEEDS.
-
-        AND THE AXII DIRECTION ARE DEFINED IN THIS CLASS'
-        DOCSTRING!
-        """
-        # SUGGESTION: PLEASE MANAGE YOUR INDEXES, POSITIONS AND MOVES BETTER!
-        # I HAD TO SWAP TONS OF VALUES AROUND TO GET THE PIECES
-        # TO BEHAVE IN THE CORRECT POSITIONS!
-
-        if move not in MOVES_3D:
-            raise ValueError(
-                "Invalid 3D Game move!"
-                + f"Expected: {' or '.join(MOVES_3D)}. Got: {move}"
-            )
-
-        # All these paths return True after they finish,
-        # or fail and return False RIGHT THERE.
-        if move == LEFT:
-            for x_pos, y_pos, z_pos in self.piece.block_positions():
-                if self.board.get((x_pos - 1, y_pos, z_pos)) or \
-                        x_pos == 0:
-                    return False
-            self.piece.pos[X_AXIS] -= 1
-
-        elif move == RIGHT:
-            for x_pos, y_pos, z_pos in self.piece.block_positions():
-                if self.board.get((x_pos + 1, y_pos, z_pos)) or \
-                        x_pos == FLOOR_WIDTH - 1:
-                    return False
-            self.piece.pos[X_AXIS] += 1
-
-        elif move == BACK:
-            for x_pos, y_pos, z_pos in self.piece.block_positions():
-                if self.board.get((x_pos, y_pos + 1, z_pos)) or \
-                        y_pos == FLOOR_WIDTH - 1:
-                    return False
-            self.piece.pos[Y_AXIS] += 1
-
-        elif move == FRONT:
-            for x_pos, y_pos, z_pos in self.piece.block_positions():
-                if self.board.get((x_pos, y_pos - 1, z_pos)) or \
-                        y_pos == 0:
-                    return False
-            self.piece.pos[Y_AXIS] -= 1
-
-        elif move == HARD_DROP:
-            while not self.landed():
-                self._move_piece_down()
-            # move the piece down until it lands.
-
-        elif move == SOFT_DROP:
-            if self.landed():
-                return False
-            # can't move the piece down if it has already landed
-
-            self._move_piece_down()
-
-        return True
-
-    def set_down(self) -> None:
-        """
-        Makes piece 'inbeded' in board.
-        AKA: "puts" the cubes of the piece
-        in the 'self.board' dictionary.
-        """
-        for cube_pos in self.piece.block_positions():
-            self.board[cube_pos] = self.piece.color
-
-    def try_rotate(self, axis: int, clockwise: bool) -> bool:
-        """
-        Rotates 'self.piece' AROUND the 'axis'
+        The pieces rotate AROUND the axii
         DEFINED AT THE TOP OF THIS CLASS.
-
-        If the piece can't rotate because it goes outside of the 3D board,
-        or a block is already in a position
-        where the piece's block will end up in,
-        this method CANCELS THE ROTATION.
-
-        Returns weather or not the rotation succeeded.
         """
         if axis not in (X_AXIS, Y_AXIS, Z_AXIS):
             raise ValueError(
                 "Invalid rotation axis! "
                 + f"Expected: X_AXIS, Y_AXIS or Z_AXIS. Got: {axis}"
             )
-        self.piece.rotate(axis, clockwise)
-        # rotate
-
-        if any(
-            piece_block_pos in self.board
-            or piece_block_pos[0] not in range(FLOOR_WIDTH)
-            or piece_block_pos[1] not in range(FLOOR_WIDTH)
-            or piece_block_pos[2] not in range(FLOORS)
-            for piece_block_pos in self.piece.block_positions()
-        ):
-            # if any block in self.piece.block_positions
-            # is aleady occupied by self.board,
-            # or is outside the board,
-            # undo
-            self.piece.rotate(axis, not clockwise)
-            return False
-        return True
-
-    def landed(self) -> bool:
-        """
-        Checks if 'self's current piece landed.
-        A piece has landed if the floor or
-        another square is EXACTLY one square below
-        one of the piece's squares.
-        """
-        for block_x_pos, block_y_pos, block_z_pos in reversed(
-                self.piece.block_positions()):
-            # 'self.piece.block_positions' returns all of the squares
-            # in order: up->down, left->right.
-            # We want to scan down->up.
-            if self.board.get((block_x_pos, block_y_pos, block_z_pos + 1)) or \
-                    block_z_pos == FLOORS - 1:
-                # If there's a block or the floor underneath it...
-                # Return True.
-                return True
-        return False
-
-    def _clear_floors(self, previous_piece: Piece3D) -> None:
-        # time: O(n), where n is: height of piece
-        # space: O(n), where n is: height of piece
-        deleted_floors = set()
-
-        # Look at each floor 'previous_piece' landed in
-        # (assuming it's 'self.piece', that just landed)
-        # and add the floor index to 'deleted_floors' if the floor
-        # was completed
-        PREVIOUS_PIECE_HEIGHT = previous_piece.blocks.shape[2]
-        PREVIOUS_PIECE_Z_POS = previous_piece.pos[2]
-        for z_pos in range(
-                PREVIOUS_PIECE_Z_POS,
-                PREVIOUS_PIECE_Z_POS +
-                PREVIOUS_PIECE_HEIGHT):
-            # look at each floor in the dropped piece
-
-            if all(
-                (x_pos, y_pos, z_pos) in self.board
-                for y_pos in range(FLOOR_WIDTH)
-                for x_pos in range(FLOOR_WIDTH)
-            ):
-                # If the whole floor in the board is filled
-                for x_pos in range(FLOOR_WIDTH):
-                    for y_pos in range(FLOOR_WIDTH):
-                        self.board.pop((x_pos, y_pos, z_pos))
-                # remove that floor
-                deleted_floors.add(z_pos)
-                # keep track of that floor
-
-        if not deleted_floors:
-            return
-        # no cleared floors, so no "landing" of floors either.
-
-        landing_floor = max(deleted_floors)
-        # lowest deleted floor is where all the floors with gunk in them will
-        # 'land' on.
-
-        # print(f"{deleted_floors=} {landing_floor=}")
-        # make board's rows higher than the cleared rows "land"
-        # in that space
-        gunk_floor = landing_floor - 1
-        for gunk_floor in range(landing_floor, -1, -1):
-
-            if gunk_floor not in deleted_floors:
-                # if floor has gunk in it
-                for x_pos in range(FLOOR_WIDTH):
-                    for y_pos in range(FLOOR_WIDTH):
-                        if (x_pos, y_pos, gunk_floor) in self.board:
-                            self.board[(x_pos, y_pos, landing_floor)] = \
-                                self.board.pop((x_pos, y_pos, gunk_floor))
-                # move that floor down to the landing floor
-
-                landing_floor -= 1
-
-        self.amount_of_levels_cleared = len(deleted_floors)
-        self.score_manager.score(self.amount_of_levels_cleared)
-
-    def play(self) -> bool:
-        """
-        Plays Tetris for one "step" (where the piece goes one down),
-        and returns True if the game can continue,
-        and False it the game is over.
-
-        This is the "step":
-        If the current piece has landed,
-        we set it down using 'self.set_down',
-        clear any floors the piece completed with 'self.clear_floors'
-        and makes a new piece.
-
-        If the new piece spawns where it immediately lands,
-        the game is over.
-
-        If the piece hasn't landed, or if the game isn't over,
-        we just move the piece one down using
-        'self.move_piece_down'.
-        """
-        if self.landed():
-            self.set_down()
-            self._clear_floors(self.piece)
-            self._init_random_piece()
-
-            if any(
-                block in self.board
-                for block in self.piece.block_positions()
-            ):
-                return False
-        else:
-            self._move_piece_down()
-
-        return True
+
+    _clear_floors = GameND._clear_levels
+
+    def rotation_mask(self) -> int:
+        """
+        Returns which rotations 'self.piece' can do right now,
+        as a bitmask where bit 'axis * 2 + clockwise' is set
+        if 'self.try_rotate(axis, clockwise)' would succeed.
+        (6 bits, 'X_AXIS' counterclockwise is bit 0)
+
+        DOESN'T ROTATE THE PIECE:
+        the orientations it would end up in are looked up in its
+        'OrientationTable3D.rotations', and the board checks
+        all of them in one call. (Look at 'Board3D.collision_mask')
+        """
+        table = self.piece.table
+        orientation = self.piece.orientation
+        targets = table.rotations[orientation]
+
+        return ~self.board.collision_mask(
+            targets, self.piece.pos, table.rotation_blocks[orientation]
+        ) & (1 << len(targets)) - 1
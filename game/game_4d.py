@@ -0,0 +1,85 @@
+"""
+Module with 'Game4D', the 4D game mode: a hyper-well of 4D pieces
+falling through hyper-floors, played by the engine every game mode
+plays on. (Look at 'game/game_nd.py')
+"""
+from itertools import combinations
+from numpy import ndarray, zeros
+from game.board_nd import ArrayBoardND
+from game.game_3d import PIECES_3D
+from game.game_nd import GameND, compile_orientations_nd
+from game.move_data import *
+from game.piece_generator import PieceGenerator
+
+
+def lift_to_4d(blocks: ndarray) -> ndarray:
+    """
+    Returns the 3D '[x, y, z]' blocks matrix 'blocks'
+    as a 4D '[x, y, w, z]' hypercube of the same size,
+    with the piece in the middle of the w axis.
+    """
+    size = len(blocks)
+    hypercube = zeros((size,) * 4, blocks.dtype)
+    hypercube[:, :, (size - 1) // 2, :] = blocks
+    return hypercube
+
+
+X_AXIS_4D, Y_AXIS_4D, W_AXIS_4D, Z_AXIS_4D = range(4)
+PLANES_4D = tuple(combinations(range(4), 2))
+"""
+The 6 planes 4D pieces rotate in: (x, y), (x, w), (x, z), (y, w), ...
+"""
+
+HORIZONTAL_MOVES_4D = {
+    LEFT: (X_AXIS_4D, -1), RIGHT: (X_AXIS_4D, 1),
+    FRONT: (Y_AXIS_4D, -1), BACK: (Y_AXIS_4D, 1),
+    ANA: (W_AXIS_4D, -1), KATA: (W_AXIS_4D, 1),
+}
+
+PIECES_4D = tuple(
+    (lift_to_4d(blocks), color) for blocks, color in PIECES_3D)
+"""
+The 3D pieces, as flat 4D pieces. (Look at 'lift_to_4d')
+Rotating them in the planes with the w axis turns them
+into the w axis, where they can fill the hyper-floors.
+"""
+
+ORIENTATIONS_4D = tuple(
+    compile_orientations_nd(blocks, color, PLANES_4D)
+    for blocks, color in PIECES_4D
+)
+"""
+The 'OrientationTableND' of each piece in 'PIECES_4D',
+computed once, when this module is imported.
+"""
+
+HYPER_FLOOR_WIDTH = 4
+HYPER_FLOORS = 20
+
+
+class Game4D(GameND):
+    """
+    4D Tetris: the pieces of 'PIECES_4D' fall through a
+    'hyper_floor_width' x 'hyper_floor_width' x 'hyper_floor_width'
+    x 'hyper_floors' hyper-well.
+
+    THE AXII ARE: x (LEFT -> RIGHT), y (FRONT -> BACK),
+    w (ANA -> KATA), and z (UP -> DOWN), in that order,
+    and the pieces rotate in the planes of 'PLANES_4D'.
+
+    The pieces are 'PieceND's, on an 'ArrayBoardND',
+    so the game plays with 'GameND's defaults.
+    """
+    moves = HORIZONTAL_MOVES_4D
+    tables = ORIENTATIONS_4D
+
+    def __init__(self, board_type: type = ArrayBoardND,
+                 generator: PieceGenerator = None,
+                 hyper_floor_width: int = HYPER_FLOOR_WIDTH,
+                 hyper_floors: int = HYPER_FLOORS):
+        super().__init__(
+            (hyper_floor_width,) * 3 + (hyper_floors,),
+            len(ORIENTATIONS_4D),
+            board_type,
+            generator
+        )
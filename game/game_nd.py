@@ -0,0 +1,560 @@
+"""
+Module with the game engine every game mode plays on, 'GameND',
+which plays Tetris in a well with ANY amount of dimensions,
+and the N-dimensional pieces of the 4D game mode
+(look at 'game/game_4d.py').
+
+The engine works like the 3D game, generalized:
+
+    the LAST axis of the board is the one the pieces fall along,
+    and the pieces move one cell at a time along each of the others,
+    (look at 'GameND.try_move')
+
+    the pieces rotate in the PLANE of two axes
+    (in 3D, rotating in the plane of the y and z axii is
+    rotating around the x axis, in 4D there are 6 planes),
+    with every orientation of every piece compiled ONCE
+    into an 'OrientationTableND', like 'OrientationTable3D',
+
+    and each level of the board is cleared when it's full,
+    scored like the lines of the 2D game.
+
+'Game2D', 'Game3D' and 'Game4D' are 'GameND's: they move, rotate,
+land, clear and score their pieces with the SAME code, and only say
+how their pieces are made and how their boards are asked about them,
+so any optimization of the engine is an optimization of every game mode.
+The boards themselves share the N-dimensional board core
+(look at 'game/board_nd.py') when they're array boards.
+"""
+from dataclasses import dataclass
+from numpy import ndarray, arange, argwhere, ascontiguousarray, rot90
+from game.board_nd import ArrayBoardND
+from game.move_data import *
+from game.piece_generator import PieceGenerator
+from game.score import Score
+from game.zobrist import feature_key
+
+
+@dataclass(frozen=True, eq=False)
+class OrientationND:
+    """
+    One orientation of an N-dimensional piece, compiled ONCE.
+    (Look at 'compile_orientations_nd')
+
+    'blocks': the piece's blocks matrix in this orientation (read-only)
+    'positions': the offsets of the blocks from the matrix's first corner
+    'bounds': the lowest offset along each axis,
+        followed by the highest offset along each axis
+    'bottom': the offsets of the LOWEST block of each column of the piece
+        (the blocks with the same offsets along every axis but the last)
+    'key': Zobrist key of the piece being in this orientation.
+        (Look at 'game/zobrist.py')
+    """
+    blocks: ndarray
+    positions: tuple[tuple[int, ...], ...]
+    bounds: tuple[int, ...]
+    bottom: tuple[tuple[int, ...], ...]
+    key: int
+
+
+@dataclass(frozen=True, eq=False)
+class OrientationTableND:
+    """
+    All of the orientations of an N-dimensional piece,
+    and how rotating the piece moves between them.
+
+    'color': the color of the piece the table was made for.
+    'planes': the planes the piece rotates in, as pairs of axii.
+    'orientations': the 'OrientationND's, where orientation 0
+        is the blocks matrix the table was made from.
+    'transitions': 'transitions[orientation][plane][clockwise]'
+        is the orientation the piece ends up in when it's rotated
+        in 'planes[plane]' from 'orientation'.
+    """
+    color: tuple
+    planes: tuple[tuple[int, int], ...]
+    orientations: tuple[OrientationND, ...]
+    transitions: tuple[tuple[tuple[int, int], ...], ...]
+
+
+def rotate_blocks_nd(blocks: ndarray, plane: tuple[int, int],
+                     clockwise: bool) -> ndarray:
+    """
+    Returns 'blocks' rotated 90 degrees in 'plane',
+    from the plane's first axis towards its second axis if 'clockwise',
+    and the other way around otherwise.
+    """
+    return rot90(blocks, 1 if clockwise else -1, axes=plane)
+
+
+def _orientation_nd(blocks: ndarray, color: tuple) -> OrientationND:
+    blocks = ascontiguousarray(blocks)
+    blocks.flags.writeable = False
+
+    offsets = argwhere(blocks)
+    positions = tuple(map(tuple, offsets.tolist()))
+
+    bottom = {}
+    for *column, level in positions:
+        if level > bottom.get(tuple(column), -1):
+            bottom[tuple(column)] = level
+
+    return OrientationND(
+        blocks,
+        positions,
+        (*offsets.min(axis=0).tolist(), *offsets.max(axis=0).tolist()),
+        tuple((*column, level) for column, level in sorted(bottom.items())),
+        feature_key("nd-piece", color, blocks.shape, blocks.tobytes())
+    )
+
+
+def compile_orientations_nd(blocks: ndarray, color: tuple,
+                            planes) -> OrientationTableND:
+    """
+    Returns the 'OrientationTableND' of the piece with 'blocks' and 'color',
+    rotating in 'planes'.
+
+    Like 'compile_orientations' in 'game/game_3d.py',
+    the orientations are found by rotating a "probe" matrix
+    (the same size as 'blocks', with a different number in each cell)
+    in every plane until no new rotation of it shows up,
+    rotating 'blocks' the same way.
+    """
+    planes = tuple(planes)
+    probes = [arange(blocks.size).reshape(blocks.shape)]
+    matrices = [blocks]
+    indexes = {probes[0].tobytes(): 0}
+    transitions = []
+
+    while len(transitions) < len(probes):
+        orientation = len(transitions)
+        plane_transitions = []
+
+        for plane in planes:
+            rotations = []
+            for clockwise in (False, True):
+                probe = rotate_blocks_nd(probes[orientation], plane, clockwise)
+                probe_bytes = probe.tobytes()
+
+                if probe_bytes not in indexes:
+                    indexes[probe_bytes] = len(probes)
+                    probes.append(probe)
+                    matrices.append(rotate_blocks_nd(
+                        matrices[orientation], plane, clockwise))
+                rotations.append(indexes[probe_bytes])
+            plane_transitions.append(tuple(rotations))
+        transitions.append(tuple(plane_transitions))
+
+    return OrientationTableND(
+        color,
+        planes,
+        tuple(_orientation_nd(matrix, color) for matrix in matrices),
+        tuple(transitions)
+    )
+
+
+class PieceND:
+    """
+    A piece of an N-dimensional game.
+
+    'self.table': the piece's 'OrientationTableND'
+    'self.orientation': index of the piece's current orientation
+    'self.color': pygame color of the piece
+    'self.pos': the position of the first corner of the piece's
+        blocks matrix in the board.
+    """
+    __slots__ = ("table", "orientation", "color", "pos")
+
+    def __init__(self, table: OrientationTableND, pos, orientation: int = 0):
+        self.table = table
+        self.orientation = orientation
+        self.color = table.color
+        self.pos = list(pos)
+
+    def __repr__(self):
+        return f"PieceND(pos={self.pos}, orientation={self.orientation}, " \
+            + f"color={self.color})"
+
+    @property
+    def compiled(self) -> OrientationND:
+        """
+        The piece's current orientation, compiled.
+        """
+        return self.table.orientations[self.orientation]
+
+    @property
+    def blocks(self) -> ndarray:
+        return self.compiled.blocks
+
+    def rotate(self, plane: int, clockwise: bool) -> None:
+        """
+        Rotates 'self' in 'self.table.planes[plane]'.
+        """
+        self.orientation = \
+            self.table.transitions[self.orientation][plane][bool(clockwise)]
+
+    def block_positions(self) -> list[tuple[int, ...]]:
+        """
+        The positions of 'self's blocks in the board.
+        """
+        return [
+            tuple(coordinate + offset
+                  for coordinate, offset in zip(self.pos, position))
+            for position in self.compiled.positions
+        ]
+
+
+class GameND:
+    """
+    The engine every game mode plays on: Tetris in a well with
+    'len(self.extents)' dimensions, where the pieces fall along
+    the LAST axis. (Read the docstring of this module)
+
+    'Game2D', 'Game3D' and 'Game4D' move, rotate, land, clear and score
+    their pieces with the methods of this class, and only say
+    how their pieces are made and checked against their boards,
+    by overriding:
+
+        'moves': '{move: (axis, direction)}' of the moves
+            (other than 'HARD_DROP' and 'SOFT_DROP') the pieces can do,
+        '_spawn_piece' and '_new_board',
+        '_collides', '_fits', '_place', '_clear' and 'drop_distance',
+            which ask the board about a piece,
+        '_levels', '_rotate' and '_check_rotation'.
+
+    The defaults are for 'PieceND's, picked from 'self.tables',
+    on boards with the interface of 'ArrayBoardND'.
+
+    'self.board': '{pos: color}' mapping of the cells that landed,
+        stored as a 'self.board_type' instance.
+    'self.piece', 'self.next_piece': the current and next pieces,
+        which are NOT PART OF THE BOARD until they land.
+    'self.score_manager': the game's 'Score', scored with the amount
+        of levels cleared at once, like lines in 2D.
+    'self.amount_of_levels_cleared': amount of levels
+        (lines in 2D, floors in 3D) cleared when the last piece landed.
+        Set RIGHT AFTER a piece lands, in the same game step/frame.
+    'self.debug': if True, the piece is checked to never overlap
+        the board when it moves down. (Look at 'self._check_overlap')
+    """
+    MIN_SIZE = 4
+    """
+    The minimum size of the board along every axis,
+    so that every piece fits in it, in every orientation.
+    """
+    moves: dict = {}
+    tables: tuple = ()
+    debug: bool = False
+    KEEPS_LEVELS_CLEARED = False
+    """
+    If True, 'self.amount_of_levels_cleared' keeps the amount of levels
+    the last piece that cleared any cleared, instead of being set to 0
+    when a piece lands without clearing levels.
+    """
+
+    def __init__(self, extents, piece_count: int,
+                 board_type: type = ArrayBoardND,
+                 generator: PieceGenerator = None):
+        """
+        'extents': the size of the board along each axis,
+            the last one is the amount of levels.
+        'piece_count': the amount of pieces the game picks from.
+        'board_type': the class used to store 'self.board'.
+        'generator': picks the game's pieces.
+            If it's None, the game gets a new 'PieceGenerator',
+            with a random seed.
+        """
+        extents = tuple(extents)
+        if min(extents) < GameND.MIN_SIZE:
+            raise ValueError(
+                f"The board must be at least {GameND.MIN_SIZE} cells "
+                f"along every axis, not {'x'.join(map(str, extents))}")
+
+        self.extents = extents
+        self.board_type = board_type
+
+        if generator is None:
+            generator = PieceGenerator(piece_count)
+        self.generator = generator
+
+        self.piece = self._spawn_piece()
+        self.next_piece = self._spawn_piece()
+
+        self.score_manager = Score()
+        self.board = {}
+        self.amount_of_levels_cleared: int = 0
+
+    @property
+    def board(self):
+        """
+        The cells that landed in the board, as a '{pos: color}' mapping.
+
+        Assigning ANY '{pos: color}' mapping to it (like a dict)
+        copies its cells into a new 'self.board_type' instance,
+        which keeps the board's Zobrist hash.
+        """
+        return self._board
+
+    @board.setter
+    def board(self, squares):
+        if isinstance(squares, self.board_type):
+            self._board = squares
+        else:
+            self._board = self._new_board(squares)
+
+    def _new_board(self, squares):
+        """
+        Returns a new 'self.board_type' instance,
+        with the '{pos: color}' items in 'squares'.
+        """
+        return self.board_type(self.extents, squares)
+
+    @property
+    def zobrist_hash(self) -> int:
+        """
+        64-bit Zobrist hash of the state of 'self':
+        the filled cells of the board, the current piece's kind,
+        orientation and position, and the next piece's kind.
+        (Look at 'game/zobrist.py')
+        """
+        return self._board.zobrist_hash \
+            ^ self.piece.compiled.key \
+            ^ feature_key("nd-pos", *self.piece.pos) \
+            ^ feature_key("nd-next", self.next_piece.compiled.key)
+
+    def _spawn_piece(self) -> PieceND:
+        """
+        Returns a new piece, picked from 'self.tables' by 'self.generator',
+        in the middle of the board's top level.
+        """
+        table = self.tables[self.generator.next_index()]
+        size = table.orientations[0].blocks.shape
+        return PieceND(table, [
+            *(extent // 2 - length // 2
+              for extent, length in zip(self.extents[:-1], size)),
+            0
+        ])
+
+    def _init_random_piece(self) -> None:
+        """
+        Makes 'self.piece' to be 'self.next_piece',
+        and spawns a new 'self.next_piece'.
+        """
+        self.piece = self.next_piece
+        self.next_piece = self._spawn_piece()
+
+    def _collides(self, piece, pos) -> bool:
+        """
+        Returns True if 'piece', at 'pos', would have a block
+        outside of the board, or in a filled cell of the board.
+        """
+        return self._board.collides(piece.compiled, pos)
+
+    def _fits(self, piece, pos) -> bool:
+        """
+        Returns True if 'piece' can be rotated into 'pos'.
+        (Look at 'self.try_rotate')
+        """
+        return not self._collides(piece, pos)
+
+    def _place(self, piece) -> None:
+        """
+        Puts the blocks of 'piece' in the board.
+        """
+        self._board.place(piece.compiled, piece.pos, piece.color)
+
+    def _clear(self, level_indexes) -> int:
+        """
+        Clears the full levels in 'level_indexes',
+        and returns how many were cleared.
+        """
+        return self._board.clear_levels(level_indexes)
+
+    def _levels(self, piece) -> range:
+        """
+        Returns the indexes of the levels 'piece' is in.
+        """
+        level_pos = piece.pos[-1]
+        return range(level_pos, level_pos + piece.blocks.shape[-1])
+
+    def _rotate(self, piece, rotation, clockwise: bool) -> None:
+        """
+        Rotates 'piece' with 'rotation' (for 'PieceND's,
+        the index of the plane it rotates in), however 'clockwise' says.
+        """
+        piece.rotate(rotation, clockwise)
+
+    def _check_rotation(self, rotation) -> None:
+        """
+        Raises ValueError if 'rotation' isn't a rotation of 'self.piece'.
+        """
+        if not 0 <= rotation < len(self.piece.table.planes):
+            raise ValueError(
+                "Invalid rotation plane! Expected: 0 to "
+                + f"{len(self.piece.table.planes) - 1}. Got: {rotation}"
+            )
+
+    def drop_distance(self, piece=None) -> int:
+        """
+        Returns how many levels 'piece' (or 'self.piece' if not given)
+        can move down before it lands.
+
+        Used for hard drops and the ghost piece,
+        and can be used to evaluate where a piece would land
+        without moving it.
+        """
+        if piece is None:
+            piece = self.piece
+        return self._board.drop_distance(piece.compiled, piece.pos)
+
+    def ghost_position(self, piece=None) -> list[int]:
+        """
+        Returns the position 'piece' (or 'self.piece' if not given)
+        would land at if it were hard dropped.
+        """
+        if piece is None:
+            piece = self.piece
+        return [*piece.pos[:-1], piece.pos[-1] + self.drop_distance(piece)]
+
+    def _check_overlap(self) -> None:
+        """
+        Raises ValueError if 'self.piece' overlaps any block in the board,
+        or is outside of it.
+
+        Only called in debug mode (look at 'self.debug'),
+        since the moves already make sure this can't happen.
+        """
+        if self._collides(self.piece, self.piece.pos):
+            raise ValueError(
+                "Moved piece down,"
+                + f"overlapping board block! {self.board=} {self.piece=}"
+            )
+
+    def _move_piece_down(self) -> None:
+        """
+        Moves 'self.piece' one level down.
+
+        In debug mode, if 'self.piece' overlaps any block in the board,
+        this method raises ValueError.
+        """
+        self.piece.pos[-1] += 1
+
+        if self.debug:
+            self._check_overlap()
+
+    def try_move(self, move: str) -> bool:
+        """
+        Tries to move the piece with 'move', one of 'self.moves',
+        'HARD_DROP' or 'SOFT_DROP', and returns whether it moved.
+
+        If the piece were to overlap another cell, or have any of its
+        cells outside of the board, THE MOVE FAILS.
+        """
+        if move in self.moves:
+            axis, direction = self.moves[move]
+
+            new_pos = self.piece.pos.copy()
+            new_pos[axis] += direction
+
+            if self._collides(self.piece, new_pos):
+                return False
+            self.piece.pos[axis] += direction
+
+        elif move == HARD_DROP:
+            self.piece.pos[-1] += self.drop_distance()
+            # move the piece down to where it lands.
+
+            if self.debug:
+                self._check_overlap()
+
+        elif move == SOFT_DROP:
+            if self.landed():
+                return False
+            # can't move the piece down if it has already landed
+
+            self._move_piece_down()
+
+        else:
+            raise ValueError(
+                f"Invalid {len(self.extents)}D Game move! Expected: "
+                + " or ".join((*self.moves, HARD_DROP, SOFT_DROP))
+                + f". Got: {move}"
+            )
+
+        return True
+
+    def try_rotate(self, rotation, clockwise: bool) -> bool:
+        """
+        Rotates 'self.piece' with 'rotation'. (Look at 'self._rotate')
+
+        If the piece would go outside of the board, or overlap
+        a cell of the board, THE ROTATION IS CANCELLED.
+
+        Returns whether or not the rotation succeeded.
+        """
+        self._check_rotation(rotation)
+        self._rotate(self.piece, rotation, clockwise)
+
+        if not self._fits(self.piece, self.piece.pos):
+            self._rotate(self.piece, rotation, not clockwise)
+            return False
+        return True
+
+    def landed(self) -> bool:
+        """
+        Checks if 'self's current piece landed:
+        if it can't move one level down,
+        because of a block of the board or the floor.
+        """
+        *column_pos, level_pos = self.piece.pos
+        return self._collides(self.piece, (*column_pos, level_pos + 1))
+
+    def set_down(self) -> None:
+        """
+        Makes the piece 'inbeded' in the board.
+        AKA: "puts" the cells of the piece in 'self.board'.
+        """
+        self._place(self.piece)
+
+    def _clear_levels(self, previous_piece) -> None:
+        """
+        Clears the levels 'previous_piece' completed when it landed
+        (assuming it's 'self.piece', that just landed),
+        makes the levels above them fall, and scores them.
+        (Look at 'self.KEEPS_LEVELS_CLEARED')
+        """
+        amount = self._clear(self._levels(previous_piece))
+
+        if amount or not self.KEEPS_LEVELS_CLEARED:
+            self.amount_of_levels_cleared = amount
+            self.score_manager.score(amount)
+
+    def play(self) -> bool:
+        """
+        Plays Tetris for one "step" (where the piece goes one down),
+        and returns True if the game can continue,
+        and False it the game is over.
+
+        This is the "step":
+        If the current piece has landed,
+        it's set down with 'self.set_down',
+        the levels it completed are cleared with 'self._clear_levels',
+        and the next piece spawns.
+
+        If the new piece spawns where it immediately collides,
+        the game is over.
+
+        If the piece hasn't landed, it moves one level down
+        with 'self._move_piece_down'.
+        """
+        if self.landed():
+            self.set_down()
+            self._clear_levels(self.piece)
+            self._init_random_piece()
+
+            if self._collides(self.piece, self.piece.pos):
+                return False
+        else:
+            self._move_piece_down()
+
+        return True
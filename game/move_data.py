@@ -6,5 +6,9 @@ SOFT_DROP = "s"
 BACK = "b"
 FRONT = "f"
 
+ANA = "a"
+KATA = "k"
+
 MOVES_2D = (LEFT, RIGHT, HARD_DROP, SOFT_DROP)
 MOVES_3D = (LEFT, RIGHT, FRONT, BACK, HARD_DROP, SOFT_DROP)
+MOVES_4D = (LEFT, RIGHT, FRONT, BACK, ANA, KATA, HARD_DROP, SOFT_DROP)
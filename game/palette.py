@@ -0,0 +1,40 @@
+"""
+Module with the palette of colors shared by the compact boards,
+which store small palette INDEXES instead of the '(r, g, b)' colors
+of their squares.
+
+Index 0 is always "no square".
+The pieces' colors are registered when their modules are imported,
+and any other color (like the tests' GREY) is added the first time
+a board stores it.
+"""
+
+PALETTE: list = [None]
+"""
+'PALETTE[index]': the color with that palette index.
+"""
+
+_PALETTE_INDEXES: dict = {}
+"""
+'{color: index}', the reverse of 'PALETTE'.
+"""
+
+
+def palette_index(color) -> int:
+    """
+    Returns the palette index of 'color',
+    adding 'color' to the palette if it isn't in it yet.
+
+    Raises ValueError if the palette is full,
+    since the indexes have to fit in a byte.
+    """
+    index = _PALETTE_INDEXES.get(color)
+    if index is not None:
+        return index
+
+    if len(PALETTE) == 256:
+        raise ValueError(f"Palette is full, can't add color {color}!")
+
+    PALETTE.append(color)
+    _PALETTE_INDEXES[color] = len(PALETTE) - 1
+    return len(PALETTE) - 1
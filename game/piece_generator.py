@@ -0,0 +1,102 @@
+"""
+Module with the 'PieceGenerator' class,
+which picks the pieces of a game, instead of the 'random' module.
+
+Every game gets its own generator, with its own seed,
+so that games running side by side don't change each other's pieces,
+and the same seed always gives the same pieces.
+"""
+import random
+
+
+class PieceGenerator:
+    """
+    Picks the indexes of a game's next pieces (in the game's piece list),
+    with its own 'random.Random', seeded with 'self.seed'.
+
+    The indexes are picked in blocks of 'self.block_size' at a time,
+    (look at 'self.fill_block')
+    and handed out one by one with 'self.next_index'.
+    """
+    BLOCK_SIZE = 256
+
+    def __init__(self, piece_count: int, seed: int = None,
+                 block_size: int = BLOCK_SIZE):
+        """
+        'piece_count': the amount of pieces to pick from.
+        'seed': the generator's seed. If it's None,
+            it's picked with the 'random' module,
+            (so 'random.seed' still makes games repeatable)
+        'block_size': the amount of indexes picked at a time.
+        """
+        if seed is None:
+            seed = random.getrandbits(64)
+
+        self.piece_count = piece_count
+        self.seed = seed
+        self.block_size = block_size
+
+        self.random = random.Random(seed)
+        self.fill_block()
+
+    def fill_block(self) -> None:
+        """
+        Picks the next block of indexes, into 'self.block',
+        and starts handing them out from its first one.
+
+        'self.next_index' calls it when the block runs out,
+        and code that reads 'self.block' itself
+        (like 'BatchGame') calls it when it used the whole block.
+
+        The state of 'self.random' only changes here,
+        so it's saved here, for 'self.getstate'.
+        """
+        self.block = tuple(
+            self.random.choices(range(self.piece_count), k=self.block_size))
+        self.index = 0
+        self._random_state = self.random.getstate()
+
+    def next_index(self) -> int:
+        """
+        Returns the index of the next piece.
+        """
+        if self.index == self.block_size:
+            self.fill_block()
+
+        self.index += 1
+        return self.block[self.index - 1]
+
+    def getstate(self) -> tuple:
+        """
+        Returns the state of 'self' as an immutable tuple,
+        that 'self.setstate' can bring 'self' back to.
+
+        Nothing is copied, so it's cheap enough to call every step.
+        """
+        return self._random_state, self.block, self.index
+
+    def setstate(self, state: tuple) -> None:
+        """
+        Brings 'self' back to a 'state' returned by 'self.getstate',
+        so that it picks the same pieces again.
+        """
+        random_state, self.block, self.index = state
+
+        if random_state is not self._random_state:
+            self._random_state = random_state
+            self.random.setstate(random_state)
+        # (the state is the same object until a new block is picked)
+
+    def copy(self):
+        """
+        Returns a new generator in the same state as 'self',
+        that picks the same pieces without changing 'self'.
+        """
+        generator = PieceGenerator.__new__(PieceGenerator)
+        generator.piece_count = self.piece_count
+        generator.seed = self.seed
+        generator.block_size = self.block_size
+        generator.random = random.Random()
+        generator._random_state = None
+        generator.setstate(self.getstate())
+        return generator
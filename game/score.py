@@ -1,6 +1,14 @@
 from dataclasses import dataclass
 
 
+def fall_rate(level: int) -> int:
+    """
+    The amount of frames between each time the piece falls one
+    block (AKA: each game step) at 'level'.
+    """
+    return int(49 / 1.1 ** level) + 1
+
+
 @dataclass
 class Score:
     points: int = 0
@@ -0,0 +1,280 @@
+"""
+Module with 'SessionHost', which hosts MANY live games ("sessions")
+in ONE process, with asyncio, WITHOUT pygame or a window.
+
+Each session is a 'GameControl' (look at 'game/control.py'),
+played at its own 60 FPS cadence (starting the tick it was opened),
+with the controls its player (a remote player, a bot...)
+puts in its 'inputs' queue: 'ControlInput's, that say which control
+(like "LEFT" or "HARD_DROP") started or stopped being pressed.
+
+Instead of one task sleeping per session, ONE task drives every
+session with a 'TimerWheel': time is split into "ticks",
+'slots_per_frame' per frame, and each tick, the sessions
+that are due play their frame and are put back in the wheel,
+one frame later. So the host wakes up once per tick,
+no matter how many sessions it hosts.
+"""
+from game.control import GameControl, SuccessfulActions
+from collections.abc import Callable
+from dataclasses import dataclass
+from itertools import count
+import asyncio
+
+FRAME_RATE = 60
+"""
+The frames per second the sessions are played at, like 'main.py'.
+"""
+
+
+@dataclass(frozen=True)
+class ControlInput:
+    """
+    'control' (look at 'GameControl.CONTROLS') started being pressed,
+    if 'pressed' is True, or was released, if it's False.
+    """
+    control: str
+    pressed: bool
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel: the items scheduled for tick 't'
+    are kept in 'self.slots[t % len(self.slots)]',
+    so scheduling an item and finding the items that are due
+    don't depend on how many items there are.
+
+    Items scheduled more than 'len(self.slots)' ticks ahead
+    share their slot with sooner items, and wait there
+    until their tick comes.
+
+    'self.tick': the next tick to fire. (Look at 'self.advance')
+    """
+
+    def __init__(self, slot_count: int):
+        if slot_count < 1:
+            raise ValueError(
+                f"'slot_count' must be at least 1, not {slot_count}")
+
+        self.slots: list[list[tuple[int, object]]] = [
+            [] for _ in range(slot_count)]
+        self.tick = 0
+
+    def __len__(self) -> int:
+        return sum(map(len, self.slots))
+
+    def schedule(self, item, tick: int) -> None:
+        """
+        Schedules 'item' to fire at 'tick',
+        which can't be before 'self.tick'.
+        """
+        if tick < self.tick:
+            raise ValueError(
+                f"Can't schedule at tick {tick}, "
+                f"the wheel is already at tick {self.tick}")
+        self.slots[tick % len(self.slots)].append((tick, item))
+
+    def advance(self) -> list:
+        """
+        Fires 'self.tick': returns the items scheduled for it,
+        in the order they were scheduled,
+        and moves the wheel to the next tick.
+        """
+        index = self.tick % len(self.slots)
+        slot = self.slots[index]
+        self.slots[index] = []
+
+        due = []
+        for entry in slot:
+            if entry[0] == self.tick:
+                due.append(entry[1])
+            else:
+                self.slots[index].append(entry)
+        # (the items of later rounds stay in the slot)
+
+        self.tick += 1
+        return due
+
+
+class Session:
+    """
+    One live game in a 'SessionHost'.
+
+    'self.id': the session's id in its host.
+    'self.control': the 'GameControl' of the game.
+    'self.inputs': asyncio queue of the 'ControlInput's
+        the session's player sent, played in the session's next frame.
+    'self.held_controls': the controls the player is holding.
+    'self.frames': amount of frames the session played.
+    'self.successful_actions', 'self.game_can_continue':
+        what 'GameControl.play_frame' returned in the last frame.
+    'self.over': set when the game is over, or the session is closed.
+    'self.on_frame': if it's not None, it's called with 'self'
+        after every frame (to send the game to a remote player...)
+    """
+
+    def __init__(self, session_id: int, control: GameControl,
+                 on_frame: Callable[["Session"], None] = None):
+        self.id = session_id
+        self.control = control
+        self.inputs: asyncio.Queue[ControlInput] = asyncio.Queue()
+        self.held_controls: set[str] = set()
+        self.frames = 0
+        self.successful_actions = SuccessfulActions(False, False, False, False)
+        self.game_can_continue = True
+        self.over = asyncio.Event()
+        self.on_frame = on_frame
+
+    def _check_control(self, control: str) -> None:
+        if control not in self.control.CONTROLS:
+            raise ValueError(
+                f"Invalid control {control!r}. "
+                "Expected one of: "
+                + ", ".join(sorted(self.control.CONTROLS)))
+
+    def press(self, control: str) -> None:
+        """
+        Puts 'control' starting to be pressed in 'self.inputs'.
+        """
+        self._check_control(control)
+        self.inputs.put_nowait(ControlInput(control, True))
+
+    def release(self, control: str) -> None:
+        """
+        Puts 'control' being released in 'self.inputs'.
+        """
+        self._check_control(control)
+        self.inputs.put_nowait(ControlInput(control, False))
+
+    def play_frame(self) -> bool:
+        """
+        Plays one frame of the game, with the inputs in 'self.inputs',
+        and returns whether the game can continue.
+
+        A control that was pressed and released in the same frame
+        is held for that frame, so that quick taps aren't lost.
+        """
+        pressed_controls = set()
+
+        while not self.inputs.empty():
+            control_input = self.inputs.get_nowait()
+            if control_input.pressed:
+                pressed_controls.add(control_input.control)
+                self.held_controls.add(control_input.control)
+            else:
+                self.held_controls.discard(control_input.control)
+
+        self.successful_actions, self.game_can_continue = \
+            self.control.play_frame(
+                self.held_controls | pressed_controls, pressed_controls)
+        self.frames += 1
+
+        if self.on_frame is not None:
+            self.on_frame(self)
+        return self.game_can_continue
+
+
+class SessionHost:
+    """
+    Hosts many 'Session's, in one process.
+    (Read the docstring of this module)
+
+    'self.sessions': '{id: Session}' of the sessions
+        that are being played.
+    'self.wheel': the 'TimerWheel' of the sessions' next frames.
+    """
+
+    def __init__(self, frame_rate: float = FRAME_RATE,
+                 slots_per_frame: int = 8):
+        """
+        'frame_rate' is the frames per second of every session,
+        and 'slots_per_frame' the amount of ticks per frame,
+        so sessions opened at different times play their frames
+        at different ticks, instead of all at once.
+        """
+        if frame_rate <= 0:
+            raise ValueError(
+                f"'frame_rate' must be positive, not {frame_rate}")
+        if slots_per_frame < 1:
+            raise ValueError(
+                "'slots_per_frame' must be at least 1, "
+                f"not {slots_per_frame}")
+
+        self.frame_rate = frame_rate
+        self.slots_per_frame = slots_per_frame
+        self.tick_seconds = 1 / (frame_rate * slots_per_frame)
+        self.wheel = TimerWheel(slots_per_frame)
+        self.sessions: dict[int, Session] = {}
+        self._ids = count()
+        self._running = False
+
+    def open(self, control: GameControl,
+             on_frame: Callable[[Session], None] = None) -> Session:
+        """
+        Returns a new 'Session' of 'control',
+        which plays its first frame in the next tick.
+        """
+        session = Session(next(self._ids), control, on_frame)
+        self.sessions[session.id] = session
+        self.wheel.schedule(session, self.wheel.tick)
+        return session
+
+    def close(self, session: Session) -> None:
+        """
+        Stops playing 'session', and sets its 'over' event.
+        (It's dropped from the wheel when its tick comes)
+        """
+        self.sessions.pop(session.id, None)
+        session.over.set()
+
+    def advance(self, ticks: int = 1) -> int:
+        """
+        Plays the frames of the sessions due in the next 'ticks' ticks,
+        and returns the amount of frames played.
+
+        The sessions whose game is over are closed.
+        """
+        frames = 0
+
+        for _ in range(ticks):
+            tick = self.wheel.tick
+            for session in self.wheel.advance():
+                if session.id not in self.sessions:
+                    continue
+                # closed
+
+                frames += 1
+                if session.play_frame():
+                    self.wheel.schedule(session, tick + self.slots_per_frame)
+                else:
+                    self.close(session)
+
+        return frames
+
+    async def run(self) -> None:
+        """
+        Plays the sessions in real time, ticking the wheel
+        every 'self.tick_seconds' seconds, until 'self.stop' is called.
+
+        If the host falls behind, it plays the ticks it missed
+        right away, so every session keeps playing 'self.frame_rate'
+        frames per second, on average.
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time() - self.wheel.tick * self.tick_seconds
+        self._running = True
+
+        while self._running:
+            due_ticks = int((loop.time() - start) / self.tick_seconds) \
+                + 1 - self.wheel.tick
+            if due_ticks > 0:
+                self.advance(due_ticks)
+
+            next_tick = start + self.wheel.tick * self.tick_seconds
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+    def stop(self) -> None:
+        """
+        Makes 'self.run' return after its current tick.
+        """
+        self._running = False
@@ -0,0 +1,385 @@
+"""
+Module that plays Game2D's, Game3D's and Game4D's WITHOUT a window
+(and WITHOUT importing pygame), for measuring the engines
+and generating lots of games.
+
+The games are played frame by frame, like 'GameControl' plays them
+in 'main.py': the piece falls one block every
+'fall_rate(level)' frames, and a hard drop makes the game
+play its step right away.
+But the moves of each frame are picked by a "policy",
+instead of the keyboard.
+
+A policy is ANY callable that takes the game, and returns
+the actions to try in the current frame.
+An action is a tuple with the name of the game method to call,
+and its arguments:
+    ("try_move", "l")
+    ("try_rotate", True)        (2D)
+    ("try_rotate", X_AXIS, False)   (3D)
+    ("try_rotate", 5, True)     (4D, the plane's index in 'PLANES_4D')
+
+'RandomPolicy' and 'ScriptedPolicy' are the policies included here,
+but any function works as a policy too.
+
+Run 'python -m game.simulation --help' to play games
+from the command line.
+"""
+from game.game_2d import Game2D, PIECES_2D
+from game.game_3d import Game3D, PIECES_3D, AXII
+from game.game_4d import Game4D, PIECES_4D, PLANES_4D
+from game.move_data import *
+from game.piece_generator import PieceGenerator
+from game.score import fall_rate
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from time import perf_counter_ns
+import argparse
+import random
+
+
+Action = tuple
+Policy = Callable[[object], Iterable[Action]]
+
+
+@dataclass(frozen=True)
+class Engine:
+    """
+    What the simulation needs to know about a game type:
+
+    'game_type': Game2D, Game3D or Game4D
+    'piece_count': the amount of pieces its 'PieceGenerator' picks from
+    'actions': all of the actions a policy can pick in that game
+    """
+    game_type: type
+    piece_count: int
+    actions: tuple[Action, ...]
+
+    def new_game(self, seed: int = None):
+        """
+        Returns a new game, with its own 'PieceGenerator' seeded
+        with 'seed'.
+        """
+        return self.game_type(
+            generator=PieceGenerator(self.piece_count, seed))
+
+
+ENGINES: dict[str, Engine] = {
+    "2d": Engine(
+        Game2D,
+        len(PIECES_2D),
+        tuple(("try_move", move) for move in MOVES_2D)
+        + (("try_rotate", True), ("try_rotate", False))
+    ),
+    "3d": Engine(
+        Game3D,
+        len(PIECES_3D),
+        tuple(("try_move", move) for move in MOVES_3D)
+        + tuple(
+            ("try_rotate", axis, clockwise)
+            for axis in AXII
+            for clockwise in (True, False)
+        )
+    ),
+    "4d": Engine(
+        Game4D,
+        len(PIECES_4D),
+        tuple(("try_move", move) for move in MOVES_4D)
+        + tuple(
+            ("try_rotate", plane, clockwise)
+            for plane in range(len(PLANES_4D))
+            for clockwise in (True, False)
+        )
+    ),
+}
+"""
+The engines the simulation can play, by name.
+"""
+
+
+class RandomPolicy:
+    """
+    Policy that tries random actions from 'actions',
+    using its own 'random.Random', seeded with 'seed'.
+
+    Every frame, there's a 'move_chance' chance of trying
+    ONE random action (and no actions otherwise),
+    so that the pieces get to fall between the moves.
+    """
+
+    def __init__(self, actions: Sequence[Action], seed: int = None,
+                 move_chance: float = 0.25):
+        if not 0 <= move_chance <= 1:
+            raise ValueError(
+                f"'move_chance' must be between 0 and 1, not {move_chance}")
+
+        self.actions = tuple(actions)
+        self.random = random.Random(seed)
+        self.move_chance = move_chance
+
+    def __call__(self, game) -> tuple[Action, ...]:
+        if self.random.random() >= self.move_chance:
+            return ()
+        return (self.random.choice(self.actions),)
+
+
+class ScriptedPolicy:
+    """
+    Policy that plays 'script': a sequence of the actions
+    to try in each frame, one frame after the other.
+
+    When the script runs out, it starts over,
+    so short scripts can play whole games.
+    """
+
+    def __init__(self, script: Sequence[Iterable[Action]]):
+        if not script:
+            raise ValueError("'script' must have at least one frame")
+
+        self.script = tuple(tuple(frame) for frame in script)
+        self.frame = 0
+
+    def __call__(self, game) -> tuple[Action, ...]:
+        actions = self.script[self.frame]
+        self.frame = (self.frame + 1) % len(self.script)
+        return actions
+
+
+class LatencyHistogram:
+    """
+    Histogram of how long each engine call took, by method name.
+
+    The calls are counted in buckets of powers of 2 nanoseconds:
+    bucket 'n' counts the calls that took less than 2 ** n nanoseconds,
+    but at least 2 ** (n - 1).
+    """
+
+    def __init__(self):
+        self.buckets: dict[str, list[int]] = {}
+        self.totals: dict[str, int] = {}
+
+    def record(self, name: str, nanoseconds: int) -> None:
+        buckets = self.buckets.setdefault(name, [])
+        bucket = nanoseconds.bit_length()
+
+        if bucket >= len(buckets):
+            buckets.extend([0] * (bucket + 1 - len(buckets)))
+        buckets[bucket] += 1
+
+        self.totals[name] = self.totals.get(name, 0) + nanoseconds
+
+    def count(self, name: str) -> int:
+        return sum(self.buckets.get(name, ()))
+
+    def mean(self, name: str) -> float:
+        """
+        The mean time, in nanoseconds, of the calls to 'name'.
+        """
+        count = self.count(name)
+        return self.totals[name] / count if count else 0.0
+
+    def percentile(self, name: str, percent: float) -> int:
+        """
+        The upper bound (in nanoseconds) of the bucket
+        where 'percent' percent of the calls to 'name' took less time.
+        """
+        buckets = self.buckets.get(name, ())
+        target = sum(buckets) * percent / 100
+        seen = 0
+
+        for bucket, count in enumerate(buckets):
+            seen += count
+            if count and seen >= target:
+                return 2 ** bucket
+        return 0
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """
+        Adds the calls counted in 'other' to this histogram.
+        """
+        for name, other_buckets in other.buckets.items():
+            buckets = self.buckets.setdefault(name, [])
+            if len(other_buckets) > len(buckets):
+                buckets.extend([0] * (len(other_buckets) - len(buckets)))
+
+            for bucket, count in enumerate(other_buckets):
+                buckets[bucket] += count
+
+            self.totals[name] = self.totals.get(name, 0) + other.totals[name]
+
+    def format(self) -> str:
+        lines = []
+
+        for name in sorted(self.buckets):
+            lines.append(
+                f"{name}: {self.count(name)} calls, "
+                f"mean {self.mean(name):.0f}ns, "
+                f"p50 < {self.percentile(name, 50)}ns, "
+                f"p99 < {self.percentile(name, 99)}ns"
+            )
+
+            for bucket, count in enumerate(self.buckets[name]):
+                if count:
+                    lines.append(f"    < {2 ** bucket:>10}ns: {count}")
+
+        return "\n".join(lines)
+
+
+@dataclass
+class SimulationReport:
+    """
+    The results of 'simulate':
+
+    'engine': the name of the engine that was played
+    'games': amount of games played
+    'frames': amount of frames played, in all games
+    'pieces': amount of pieces spawned, in all games
+    'seconds': time it took to play all games
+    'scores': the final 'Score' of each game
+    'latency': how long each engine call took
+    """
+    engine: str
+    games: int = 0
+    frames: int = 0
+    pieces: int = 0
+    seconds: float = 0.0
+    scores: list = field(default_factory=list)
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def _per_second(self, amount: int) -> float:
+        return amount / self.seconds if self.seconds else 0.0
+
+    @property
+    def games_per_second(self) -> float:
+        return self._per_second(self.games)
+
+    @property
+    def pieces_per_second(self) -> float:
+        return self._per_second(self.pieces)
+
+    @property
+    def frames_per_second(self) -> float:
+        return self._per_second(self.frames)
+
+    def format(self) -> str:
+        return "\n".join((
+            f"{self.engine}: {self.games} games, {self.pieces} pieces, "
+            f"{self.frames} frames in {self.seconds:.3f}s",
+            f"{self.games_per_second:.2f} games/s, "
+            f"{self.pieces_per_second:.1f} pieces/s, "
+            f"{self.frames_per_second:.1f} frames/s",
+            self.latency.format(),
+        ))
+
+
+def play_game(game, policy: Policy, latency: LatencyHistogram,
+              max_frames: int = None) -> tuple[int, int]:
+    """
+    Plays 'game' until it's over (or until 'max_frames' frames
+    were played, if it's not None), with the actions 'policy' picks
+    every frame, recording how long each engine call took in 'latency'.
+
+    Returns the amount of frames played, and the amount
+    of pieces spawned (not counting the first piece).
+    """
+    frames = 0
+    pieces = 0
+    frame_count = 0
+    # Like 'GameControl.frame_count'
+
+    while max_frames is None or frames < max_frames:
+        frames += 1
+        frame_count += 1
+
+        for action in policy(game):
+            name, *arguments = action
+
+            start = perf_counter_ns()
+            moved = getattr(game, name)(*arguments)
+            latency.record(name, perf_counter_ns() - start)
+
+            if moved and arguments == [HARD_DROP]:
+                frame_count = fall_rate(game.score_manager.level)
+            # A hard drop sets the piece down right away,
+            # like in 'GameControl'.
+
+        if frame_count >= fall_rate(game.score_manager.level):
+            frame_count = 0
+            piece = game.piece
+
+            start = perf_counter_ns()
+            game_can_continue = game.play()
+            latency.record("play", perf_counter_ns() - start)
+
+            if game.piece is not piece:
+                pieces += 1
+            if not game_can_continue:
+                break
+
+    return frames, pieces
+
+
+def simulate(engine: str, games: int,
+             policy_factory: Callable[[int], Policy] = None,
+             seed: int = 0, max_frames: int = None) -> SimulationReport:
+    """
+    Plays 'games' games of 'engine' ("2d", "3d" or "4d", from 'ENGINES'),
+    and returns their 'SimulationReport'.
+
+    Game number 'i' is seeded with 'seed + i', and plays with the policy
+    'policy_factory(seed + i)' returns, so the same arguments
+    always play the same games.
+    If 'policy_factory' is None, the games are played with
+    'RandomPolicy's.
+
+    'max_frames' is the maximum amount of frames of each game.
+    """
+    if engine not in ENGINES:
+        raise ValueError(
+            f"'engine' must be one of {tuple(ENGINES)}, not {engine!r}")
+    if games < 0:
+        raise ValueError(f"'games' can't be negative, not {games}")
+
+    engine_data = ENGINES[engine]
+
+    if policy_factory is None:
+        def policy_factory(game_seed):
+            return RandomPolicy(engine_data.actions, game_seed)
+
+    report = SimulationReport(engine)
+    start = perf_counter_ns()
+
+    for game_seed in range(seed, seed + games):
+        game = engine_data.new_game(game_seed)
+
+        frames, pieces = play_game(
+            game, policy_factory(game_seed), report.latency, max_frames)
+
+        report.games += 1
+        report.frames += frames
+        report.pieces += pieces
+        report.scores.append(game.score_manager)
+
+    report.seconds = (perf_counter_ns() - start) / 1e9
+    return report
+
+
+def main(arguments: Sequence[str] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m game.simulation",
+        description="Plays Tetris games without a window, "
+                    "with random moves, and reports how fast they ran.")
+    parser.add_argument("engine", choices=tuple(ENGINES))
+    parser.add_argument("-n", "--games", type=int, default=10)
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument("-f", "--max-frames", type=int, default=None)
+    parsed = parser.parse_args(arguments)
+
+    print(simulate(
+        parsed.engine, parsed.games,
+        seed=parsed.seed, max_frames=parsed.max_frames
+    ).format())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Module with the Zobrist hashing keys of the 2D and 3D games.
+
+Every "feature" of a game's state (a filled square at some position,
+the current piece in some rotation, its x-pos, the next piece, ...)
+has a random-looking 64-bit key, and the hash of a state is the XOR of
+the keys of all of its features.
+Adding or removing a feature is ONE XOR, so the boards keep their
+hash up to date as squares are placed and cleared,
+instead of hashing the whole board again.
+
+The keys are made from a hash of the feature itself,
+NOT from 'random' or Python's 'hash',
+so the same state has the same hash in every process and every run.
+"""
+from functools import lru_cache
+from hashlib import blake2b
+
+
+@lru_cache(maxsize=None)
+def feature_key(*feature) -> int:
+    """
+    Returns the 64-bit key of 'feature',
+    a tuple of ints, strings and tuples of them, like '("2d-x", 3)'.
+    """
+    digest = blake2b(repr(feature).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+@lru_cache(maxsize=None)
+def cell_keys_2d(rows: int, columns: int) -> tuple[tuple[int, ...], ...]:
+    """
+    Returns the keys of the squares of a 'rows' x 'columns' 2D board,
+    as 'keys[y][x]'.
+    """
+    return tuple(
+        tuple(feature_key("2d-cell", x_pos, y_pos)
+              for x_pos in range(columns))
+        for y_pos in range(rows)
+    )
+
+
+def cell_key_3d(pos: tuple[int, int, int]) -> int:
+    """
+    Returns the key of a filled cube at 'pos' in a 3D board.
+    """
+    return feature_key("3d-cell", *pos)
@@ -22,8 +22,9 @@ God bless you, enjoy!
 """
 import pygame
 import game
-from game_control import GameControl, GameControl2D, GameControl3D, Z_AXIS, \
+from game_control import GameControl, GameControl2D, GameControl3D, \
     controls_keys, CONTROL_KEYS_FILE
+from game.game_3d import Z_AXIS
 from dataclasses import dataclass
 from random import choice as random_choice
 from collections.abc import Sequence
@@ -1173,11 +1174,17 @@ class Window:
         if not isinstance(self.controls, GameControl2D):
             raise TypeError("Can't render in 2D while game mode is not 2D!")
 
-        BOARD_WIDTH = int(self.BOARD_HEIGHT *
-                          (game.game_2d.COLUMNS / game.game_2d.ROWS))
-        BLOCK_WIDTH = BOARD_WIDTH // game.game_2d.COLUMNS
+        ROWS = self.controls.game.rows
+        COLUMNS = self.controls.game.columns
+
+        BLOCK_WIDTH = max(
+            1, min(self.BOARD_HEIGHT // ROWS, (self.WIDTH >> 1) // COLUMNS))
+        BOARD_WIDTH = BLOCK_WIDTH * COLUMNS
+        BOARD_HEIGHT = BLOCK_WIDTH * ROWS
+        # The board's size depends on the game's own amount of rows
+        # and columns, so the blocks are shrunk to fit big boards.
         BOARD_POS = self.WIDTH // 2 - \
-            BOARD_WIDTH // 2, self.HEIGHT // 2 - self.BOARD_HEIGHT // 2
+            BOARD_WIDTH // 2, self.HEIGHT // 2 - BOARD_HEIGHT // 2
         # to draw board
 
         # DRAW BOARD:
@@ -1185,7 +1192,7 @@ class Window:
         # board outline
         NEXT_PIECE_OUTLINE = pygame.Surface(
             (BOARD_WIDTH + (Window.GREY_BORDER_WIDTH << 1),
-             self.BOARD_HEIGHT + (Window.GREY_BORDER_WIDTH << 1))
+             BOARD_HEIGHT + (Window.GREY_BORDER_WIDTH << 1))
         )
         NEXT_PIECE_OUTLINE.fill(BRIGHT_GREY)
         self.window.blit(
@@ -1196,7 +1203,7 @@ class Window:
              Window.GREY_BORDER_WIDTH))
 
         # board background
-        board = pygame.Surface((BOARD_WIDTH, self.BOARD_HEIGHT))
+        board = pygame.Surface((BOARD_WIDTH, BOARD_HEIGHT))
         board.fill(BLACK)
         self.window.blit(board, BOARD_POS)
 
@@ -1227,7 +1234,7 @@ class Window:
         NEXT_PIECE_OUTLINE.fill(BRIGHT_GREY)
         NEXT_PIECE_OUTLINE_POS = (
             BOARD_RIGHT,
-            BOARD_POS[1] + (self.BOARD_HEIGHT >> 1) -
+            BOARD_POS[1] + (BOARD_HEIGHT >> 1) -
             (NEXT_PIECE_OUTLINE.get_height() >> 1),
         )
 
@@ -1254,7 +1261,7 @@ class Window:
 
         NEXT_PIECE_BOX_POS = (
             BOARD_RIGHT + Window.GREY_BORDER_WIDTH,
-            BOARD_POS[1] + (self.BOARD_HEIGHT >> 1) -
+            BOARD_POS[1] + (BOARD_HEIGHT >> 1) -
             (next_piece_box.get_height() >> 1)
         )
 
@@ -1357,7 +1364,10 @@ class Window:
         if self.mode_menu.option != "3D":
             raise TypeError("Game mode is 2D, but 'draw_3d' was called!")
 
-        slices = [{} for slice_pos in range(game.game_3d.FLOOR_WIDTH)]
+        FLOOR_WIDTH = self.controls.game.floor_width
+        FLOORS = self.controls.game.floors
+
+        slices = [{} for slice_pos in range(FLOOR_WIDTH)]
         """
         Each FRONT-FACING SLICE of the board,
         AS IF IT INCLUDED THE PIECE'S BLOCKS,
@@ -1378,10 +1388,10 @@ class Window:
                 self.controls.game.piece.color
         # add next_piece blocks to 'slices'
         NEXT_PIECE_DISPLAY_POSITION = (
-            5,
-            (game.game_3d.FLOOR_WIDTH >> 1) -
+            FLOOR_WIDTH + 1,
+            (FLOOR_WIDTH >> 1) -
             (self.controls.game.next_piece.blocks.shape[1] >> 1),
-            (game.game_3d.FLOORS >> 1) -
+            (FLOORS >> 1) -
             (self.controls.game.next_piece.blocks.shape[2] >> 1)
         )
         OLD_NEXT_PIECE_POS = self.controls.game.next_piece.pos
@@ -1400,10 +1410,10 @@ class Window:
 
         FRONT_SLICE_FRONT_WIDTH = int(
             self.BOARD_HEIGHT
-            * (game.game_3d.FLOOR_WIDTH / game.game_3d.FLOORS)
+            * (FLOOR_WIDTH / FLOORS)
         )
         DISTANCE_TO_FRONT_SLICE_FRONT = max(
-            (game.game_3d.FLOOR_WIDTH, game.game_3d.FLOORS))
+            (FLOOR_WIDTH, FLOORS))
         """
         Arbitrary value, meant to represent the imagined distance
         from the "camera" to front of the board,
@@ -1431,7 +1441,7 @@ class Window:
         # SLICES_LATTICE_POINTS_IN_SCREEN[y, x, z] = slice's (aka y) lattice
         # point (aka (x, y)) in screen
 
-        for y_pos_in_game in range(game.game_3d.FLOOR_WIDTH + 1):
+        for y_pos_in_game in range(FLOOR_WIDTH + 1):
             DISTANCE_TO_SLICE = DISTANCE_TO_FRONT_SLICE_FRONT + y_pos_in_game
 
             PERSPECTIVE_FACTOR = \
@@ -1450,12 +1460,12 @@ class Window:
             SLICE_FRONT_WIDTH_IN_SCREEN = int(
                 FRONT_SLICE_FRONT_WIDTH * PERSPECTIVE_FACTOR)
             BLOCK_FRONT_WIDTH_IN_SCREEN = \
-                SLICE_FRONT_WIDTH_IN_SCREEN // game.game_3d.FLOOR_WIDTH
+                SLICE_FRONT_WIDTH_IN_SCREEN // FLOOR_WIDTH
             # since 'SLICE_FRONT_WIDTH_IN_SCREEN'
             # is the slice's width IN THE SCREEN,
             # and the slice's width is just the sum of
             # all of the block's widths in the slice,
-            # which is 'game.game_3d.FLOOR_WIDTH',
+            # which is 'FLOOR_WIDTH',
             # the slice's front and back display size are these.
             SLICE_POS_IN_SCREEN = (
                 self.WIDTH // 2 - SLICE_FRONT_WIDTH_IN_SCREEN // 2,
@@ -1475,9 +1485,9 @@ class Window:
                             SLICE_POS_IN_SCREEN[1] +
                             BLOCK_FRONT_WIDTH_IN_SCREEN * block_z_pos
                         )
-                        for block_z_pos in range(game.game_3d.FLOORS + 1)
+                        for block_z_pos in range(FLOORS + 1)
                     )
-                    for block_x_pos in range(game.game_3d.FLOOR_WIDTH + 1)
+                    for block_x_pos in range(FLOOR_WIDTH + 1)
                 )
             )
 
@@ -1486,58 +1496,58 @@ class Window:
         # to help the player see better.
 
         # draw back side vertical grid lines
-        for x_pos in range(game.game_3d.FLOOR_WIDTH + 1):
+        for x_pos in range(FLOOR_WIDTH + 1):
             pygame.draw.line(
                 self.window,
                 BRIGHT_GREY,
-                SLICES_LATTICE_POINTS_IN_SCREEN[game.game_3d.FLOOR_WIDTH]
+                SLICES_LATTICE_POINTS_IN_SCREEN[FLOOR_WIDTH]
                                                [x_pos]
                                                [0],
-                SLICES_LATTICE_POINTS_IN_SCREEN[game.game_3d.FLOOR_WIDTH]
+                SLICES_LATTICE_POINTS_IN_SCREEN[FLOOR_WIDTH]
                                                [x_pos]
-                                               [game.game_3d.FLOORS]
+                                               [FLOORS]
             )
         # draw back side horizontal grid lines
-        for z_pos in range(game.game_3d.FLOORS + 1):
+        for z_pos in range(FLOORS + 1):
             pygame.draw.line(
                 self.window,
                 BRIGHT_GREY,
-                SLICES_LATTICE_POINTS_IN_SCREEN[game.game_3d.FLOOR_WIDTH]
+                SLICES_LATTICE_POINTS_IN_SCREEN[FLOOR_WIDTH]
                                                [0]
                                                [z_pos],
-                SLICES_LATTICE_POINTS_IN_SCREEN[game.game_3d.FLOOR_WIDTH]
-                                               [game.game_3d.FLOOR_WIDTH]
+                SLICES_LATTICE_POINTS_IN_SCREEN[FLOOR_WIDTH]
+                                               [FLOOR_WIDTH]
                                                [z_pos]
             )
 
         # draw sides' vertical grid lines
-        for y_pos in range(game.game_3d.FLOOR_WIDTH):
+        for y_pos in range(FLOOR_WIDTH):
             # left
             pygame.draw.line(
                 self.window,
                 BRIGHT_GREY,
                 SLICES_LATTICE_POINTS_IN_SCREEN[y_pos][0][0],
-                SLICES_LATTICE_POINTS_IN_SCREEN[y_pos][0][game.game_3d.FLOORS]
+                SLICES_LATTICE_POINTS_IN_SCREEN[y_pos][0][FLOORS]
             )
             # right
             pygame.draw.line(
                 self.window,
                 BRIGHT_GREY,
                 SLICES_LATTICE_POINTS_IN_SCREEN[y_pos]
-                                               [game.game_3d.FLOOR_WIDTH]
+                                               [FLOOR_WIDTH]
                                                [0],
                 SLICES_LATTICE_POINTS_IN_SCREEN[y_pos]
-                                               [game.game_3d.FLOOR_WIDTH]
-                                               [game.game_3d.FLOORS]
+                                               [FLOOR_WIDTH]
+                                               [FLOORS]
             )
         # draw sides' horizontal grid lines
-        for z_pos in range(game.game_3d.FLOORS):
+        for z_pos in range(FLOORS):
             # left
             pygame.draw.line(
                 self.window,
                 BRIGHT_GREY,
                 SLICES_LATTICE_POINTS_IN_SCREEN[0][0][z_pos],
-                SLICES_LATTICE_POINTS_IN_SCREEN[game.game_3d.FLOOR_WIDTH]
+                SLICES_LATTICE_POINTS_IN_SCREEN[FLOOR_WIDTH]
                                                [0]
                                                [z_pos]
             )
@@ -1546,35 +1556,35 @@ class Window:
                 self.window,
                 BRIGHT_GREY,
                 SLICES_LATTICE_POINTS_IN_SCREEN[0]
-                                               [game.game_3d.FLOOR_WIDTH]
+                                               [FLOOR_WIDTH]
                                                [z_pos],
-                SLICES_LATTICE_POINTS_IN_SCREEN[game.game_3d.FLOOR_WIDTH]
-                                               [game.game_3d.FLOOR_WIDTH]
+                SLICES_LATTICE_POINTS_IN_SCREEN[FLOOR_WIDTH]
+                                               [FLOOR_WIDTH]
                                                [z_pos]
             )
 
         # draw floor's horizontal grid lines
-        for x_pos in range(game.game_3d.FLOOR_WIDTH):
+        for x_pos in range(FLOOR_WIDTH):
             pygame.draw.line(
                 self.window,
                 BRIGHT_GREY,
                 SLICES_LATTICE_POINTS_IN_SCREEN[0]
                                                [x_pos]
-                                               [game.game_3d.FLOORS],
-                SLICES_LATTICE_POINTS_IN_SCREEN[game.game_3d.FLOOR_WIDTH]
+                                               [FLOORS],
+                SLICES_LATTICE_POINTS_IN_SCREEN[FLOOR_WIDTH]
                                                [x_pos]
-                                               [game.game_3d.FLOORS]
+                                               [FLOORS]
             )
         # draw floor's "vertical" grid lines
-        for y_pos in range(game.game_3d.FLOOR_WIDTH):
+        for y_pos in range(FLOOR_WIDTH):
             pygame.draw.line(
                 self.window,
                 BRIGHT_GREY,
                 SLICES_LATTICE_POINTS_IN_SCREEN[y_pos]
-                                               [0][game.game_3d.FLOORS],
+                                               [0][FLOORS],
                 SLICES_LATTICE_POINTS_IN_SCREEN[y_pos]
-                                               [game.game_3d.FLOOR_WIDTH]
-                                               [game.game_3d.FLOORS]
+                                               [FLOOR_WIDTH]
+                                               [FLOORS]
             )
 
         # IMPORTANT: IF THE GAME LAGS,
@@ -1605,12 +1615,12 @@ class Window:
             SLICE_BACK_WIDTH_IN_SCREEN = int(
                 FRONT_SLICE_FRONT_WIDTH * BACK_PERSPECTIVE_FACTOR)
             BLOCK_BACK_WIDTH_IN_SCREEN = \
-                SLICE_BACK_WIDTH_IN_SCREEN // game.game_3d.FLOOR_WIDTH
+                SLICE_BACK_WIDTH_IN_SCREEN // FLOOR_WIDTH
 
             SLICE_FRONT_WIDTH_IN_SCREEN = int(
                 FRONT_SLICE_FRONT_WIDTH * FRONT_PERSPECTIVE_FACTOR)
             BLOCK_FRONT_WIDTH_IN_SCREEN = \
-                SLICE_FRONT_WIDTH_IN_SCREEN // game.game_3d.FLOOR_WIDTH
+                SLICE_FRONT_WIDTH_IN_SCREEN // FLOOR_WIDTH
             # (again with this one)
 
             SLICE_BACK_POS_IN_SCREEN = \
@@ -1774,7 +1784,7 @@ class Window:
         # if that block were in the front-most slice of the board
 
         NEXT_PIECE_TEXT_POS = (
-            SLICES_LATTICE_POINTS_IN_SCREEN[0][game.game_3d.FLOOR_WIDTH][0][0],
+            SLICES_LATTICE_POINTS_IN_SCREEN[0][FLOOR_WIDTH][0][0],
             # text's left pos is just the right of the board
             # IF BOARD IS TOO WIDE, THE TEXT MAY NOT FIT IN THE WINDOW!
             SLICES_LATTICE_POINTS_IN_SCREEN[0][0][
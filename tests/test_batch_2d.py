@@ -0,0 +1,138 @@
+from game.batch_2d import *
+from game.game_2d import Game2D, PIECES_2D
+from game.piece_generator import PieceGenerator
+from game.score import Score, fall_rate
+from game.simulation import ENGINES
+import random
+import unittest
+
+
+PIECE_INDEXES = {id(piece): index for index, piece in enumerate(PIECES_2D)}
+
+
+def game_state(game: Game2D) -> tuple:
+    score = game.score_manager
+    return (
+        PIECE_INDEXES[id(game.piece.data)], game.piece.rotation,
+        tuple(game.piece.pos), PIECE_INDEXES[id(game.next_piece.data)],
+        set(game.board),
+        (score.points, score.lines, score.level, score.transitioned),
+        game.amount_of_levels_cleared
+    )
+
+
+def batch_state(batch: BatchGame2D, game: int) -> tuple:
+    score = batch.score(game)
+    return (
+        int(batch.pieces[game]), int(batch.rotations[game]),
+        (int(batch.x_pos[game]), int(batch.y_pos[game])),
+        int(batch.next_pieces[game]),
+        batch.squares(game),
+        (score.points, score.lines, score.level, score.transitioned),
+        int(batch.amount_of_levels_cleared[game])
+    )
+
+
+class TestBatchGame2D(unittest.TestCase):
+    def test_same_as_game_2d(self):
+        """
+        Every game of the batch should play EXACTLY like a 'Game2D'
+        with the same pieces and actions, played frame by frame
+        like 'play_game' plays it, on narrow boards (where lines
+        are cleared all the time) and on the default board,
+        starting from random scores, so that levels go up.
+        """
+        rng = random.Random(3)
+
+        for rows, columns in ((8, 4), (16, 5), (ROWS, COLUMNS)):
+            with self.subTest(rows=rows, columns=columns):
+                GAMES = 12
+                generators = [
+                    PieceGenerator(len(PIECES_2D), seed, block_size=5)
+                    for seed in range(GAMES)
+                ]
+                games = [
+                    Game2D(generator=generator.copy(),
+                           rows=rows, columns=columns)
+                    for generator in generators
+                ]
+                batch = BatchGame2D(GAMES, rows=rows, columns=columns,
+                                    generators=generators)
+
+                for index, game in enumerate(games):
+                    game.score_manager = Score(
+                        0, rng.randrange(100), rng.randrange(20),
+                        rng.random() < 0.5)
+                    batch.lines[index] = game.score_manager.lines
+                    batch.levels[index] = game.score_manager.level
+                    batch.transitioned[index] = \
+                        game.score_manager.transitioned
+
+                frame_counts = [0] * GAMES
+                alive = [True] * GAMES
+
+                for _ in range(2000):
+                    actions = [
+                        rng.randrange(len(BATCH_ACTIONS_2D) + 1)
+                        if rng.random() < 0.5 else NO_ACTION
+                        for _ in range(GAMES)
+                    ]
+                    batch.step(actions)
+
+                    for index, game in enumerate(games):
+                        if not alive[index]:
+                            continue
+                        frame_counts[index] += 1
+
+                        if actions[index] != NO_ACTION:
+                            name, argument = \
+                                BATCH_ACTIONS_2D[actions[index] - 1]
+                            if getattr(game, name)(argument) \
+                                    and argument == HARD_DROP:
+                                frame_counts[index] = \
+                                    fall_rate(game.score_manager.level)
+
+                        if frame_counts[index] \
+                                >= fall_rate(game.score_manager.level):
+                            frame_counts[index] = 0
+                            alive[index] = game.play()
+
+                        self.assertEqual(
+                            batch_state(batch, index), game_state(game))
+                        self.assertEqual(batch.alive[index], alive[index])
+
+                self.assertFalse(any(alive))
+
+    def test_game_over(self):
+        """
+        Hard dropping every frame should end every game,
+        and games that are over shouldn't change anymore.
+        """
+        batch = BatchGame2D(50, seed=7)
+        frames = 0
+        while batch.alive.any():
+            batch.step([HARD_DROP_ACTION] * 50)
+            frames += 1
+
+        self.assertEqual(batch.frames.tolist(), batch.spawned.tolist())
+        boards = batch.boards.copy()
+        batch.step([LEFT_ACTION] * 50)
+        batch.play()
+        self.assertTrue((batch.boards == boards).all())
+        self.assertEqual(batch.frames.max(), frames)
+
+    def test_actions(self):
+        self.assertEqual(BATCH_ACTIONS_2D, ENGINES["2d"].actions)
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, BatchGame2D, 0)
+        self.assertRaises(ValueError, BatchGame2D, -1)
+        self.assertRaises(ValueError, BatchGame2D, 4, rows=3)
+        self.assertRaises(ValueError, BatchGame2D, 4, columns=17)
+        self.assertRaises(
+            ValueError, BatchGame2D, 4, generators=[PieceGenerator(7)])
+        self.assertRaises(ValueError, BatchGame2D(4).step, [0, 0, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
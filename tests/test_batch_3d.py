@@ -0,0 +1,228 @@
+from game.batch_3d import *
+from game.game_3d import Game3D, PIECES_3D, spawn_templates_3d
+from game.piece_generator import PieceGenerator
+from game.score import Score, fall_rate
+from game.simulation import ENGINES
+import random
+import unittest
+
+
+GREY = (128, 128, 128)
+
+
+def game_state(game: Game3D) -> tuple:
+    indexes = {
+        id(template.table): index
+        for index, template in enumerate(spawn_templates_3d(game.floor_width))
+    }
+    score = game.score_manager
+    return (
+        indexes[id(game.piece.table)], game.piece.orientation,
+        tuple(game.piece.pos), indexes[id(game.next_piece.table)],
+        set(game.board),
+        (score.points, score.lines, score.level, score.transitioned),
+        game.amount_of_levels_cleared
+    )
+
+
+def batch_state(batch: BatchGame3D, game: int) -> tuple:
+    score = batch.score(game)
+    return (
+        int(batch.pieces[game]), int(batch.orientations[game]),
+        tuple(batch.pos[:, game].tolist()),
+        int(batch.next_pieces[game]),
+        batch.cubes(game),
+        (score.points, score.lines, score.level, score.transitioned),
+        int(batch.amount_of_levels_cleared[game])
+    )
+
+
+def clearing_board(rng: random.Random, game: Game3D) -> dict:
+    """
+    Moves 'game's piece down, to where it lands on the
+    bottom floor, and returns a '{pos: GREY}' board where it fills
+    the floors it's in (but some of them have another hole),
+    with cubes above them, next to the piece's columns.
+    """
+    width, floors = game.floor_width, game.floors
+    x_pos, y_pos, _ = game.piece.pos
+    _, _, min_dz, _, _, max_dz = game.piece.compiled.bounds
+    z_pos = floors - 2 - max_dz
+    game.piece.pos[2] = z_pos
+
+    piece = {
+        (x_pos + dx, y_pos + dy, z_pos + dz)
+        for dx, dy, dz in game.piece.compiled.positions
+    }
+    columns = {(x, y) for x, y, _ in piece}
+
+    board = {}
+    for z in range(z_pos + min_dz, floors - 1):
+        hole = (rng.randrange(width), rng.randrange(width), z) \
+            if rng.random() < 0.3 else None
+        board.update(
+            ((x, y, z), GREY)
+            for x in range(width) for y in range(width)
+            if (x, y, z) not in piece and (x, y, z) != hole)
+    board.update(
+        ((x, y, floors - 1), GREY)
+        for x in range(width) for y in range(width)
+        if (x, y) in columns or rng.random() < 0.5)
+    board.pop((width - 1, width - 1, floors - 1), None)
+    board.update(
+        ((x, y, z), GREY)
+        for x in range(width) for y in range(width)
+        for z in range(1, z_pos + min_dz)
+        if (x, y) not in columns and rng.random() < 0.3)
+    return board
+
+
+class TestBatchGame3D(unittest.TestCase):
+    def play(self, rng: random.Random, batch: BatchGame3D,
+             games: list[Game3D], frames: int, first_action: int = None):
+        """
+        Plays 'frames' frames of random actions in 'batch' and 'games'
+        (the first one is 'first_action' if given), checking that
+        every game of 'batch' plays EXACTLY like its 'Game3D',
+        played frame by frame like 'play_game' plays it.
+        """
+        frame_counts = [0] * len(games)
+        alive = [True] * len(games)
+
+        for frame in range(frames):
+            actions = [
+                rng.randrange(len(BATCH_ACTIONS_3D) + 1)
+                if rng.random() < 0.7 else NO_ACTION
+                for _ in games
+            ]
+            if frame == 0 and first_action is not None:
+                actions = [first_action] * len(games)
+            batch.step(actions)
+
+            for index, game in enumerate(games):
+                if not alive[index]:
+                    continue
+                frame_counts[index] += 1
+
+                if actions[index] != NO_ACTION:
+                    name, *arguments = BATCH_ACTIONS_3D[actions[index] - 1]
+                    if getattr(game, name)(*arguments) \
+                            and arguments == [HARD_DROP]:
+                        frame_counts[index] = \
+                            fall_rate(game.score_manager.level)
+
+                if frame_counts[index] >= fall_rate(game.score_manager.level):
+                    frame_counts[index] = 0
+                    alive[index] = game.play()
+
+                self.assertEqual(batch_state(batch, index), game_state(game))
+                self.assertEqual(batch.alive[index], alive[index])
+        return alive
+
+    def test_same_as_game_3d(self):
+        """
+        Every game of the batch should play EXACTLY like a 'Game3D'
+        with the same pieces and actions, played frame by frame
+        like 'play_game' plays it, with floors of every size
+        (floors of 16, 25 and 64 bits), starting from random scores,
+        so that levels go up.
+        """
+        rng = random.Random(5)
+
+        for floor_width, floors in ((4, 8), (5, 12), (MAX_FLOOR_WIDTH, 10)):
+            with self.subTest(floor_width=floor_width, floors=floors):
+                GAMES = 10
+                generators = [
+                    PieceGenerator(len(PIECES_3D), seed, block_size=5)
+                    for seed in range(GAMES)
+                ]
+                games = [
+                    Game3D(generator=generator.copy(),
+                           floor_width=floor_width, floors=floors)
+                    for generator in generators
+                ]
+                batch = BatchGame3D(GAMES, floor_width=floor_width,
+                                    floors=floors, generators=generators)
+
+                for index, game in enumerate(games):
+                    game.score_manager = Score(
+                        0, rng.randrange(100), rng.randrange(20),
+                        rng.random() < 0.5)
+                    batch.lines[index] = game.score_manager.lines
+                    batch.levels[index] = game.score_manager.level
+                    batch.transitioned[index] = \
+                        game.score_manager.transitioned
+
+                alive = self.play(rng, batch, games, 3000)
+                self.assertFalse(any(alive))
+
+    def test_clear_floors(self):
+        """
+        Pieces that complete floors should clear them like 'Game3D'
+        clears them, making the floors above them fall,
+        with floors of every size.
+        """
+        rng = random.Random(6)
+        HARD_DROP_ACTION = BATCH_ACTIONS_3D.index(("try_move", HARD_DROP)) + 1
+
+        for floor_width, floors in ((4, 8), (5, 12), (MAX_FLOOR_WIDTH, 10)):
+            with self.subTest(floor_width=floor_width, floors=floors):
+                GAMES = 20
+                generators = [
+                    PieceGenerator(len(PIECES_3D), seed)
+                    for seed in range(GAMES)
+                ]
+                games = [
+                    Game3D(generator=generator.copy(),
+                           floor_width=floor_width, floors=floors)
+                    for generator in generators
+                ]
+                batch = BatchGame3D(GAMES, floor_width=floor_width,
+                                    floors=floors, generators=generators)
+
+                for index, game in enumerate(games):
+                    game.board = clearing_board(rng, game)
+                    batch.pos[:, index] = game.piece.pos
+                    for x_pos, y_pos, z_pos in game.board:
+                        batch.boards[index, z_pos] |= \
+                            1 << y_pos * floor_width + x_pos
+
+                self.play(rng, batch, games, 300, HARD_DROP_ACTION)
+                self.assertTrue((batch.lines > 1).any())
+                self.assertTrue((batch.lines == 1).any())
+
+    def test_game_over(self):
+        """
+        Hard dropping every frame should end every game,
+        and games that are over shouldn't change anymore.
+        """
+        batch = BatchGame3D(50, seed=7)
+        frames = 0
+        while batch.alive.any():
+            batch.step([BATCH_ACTIONS_3D.index(("try_move", HARD_DROP)) + 1]
+                       * 50)
+            frames += 1
+
+        self.assertEqual(batch.frames.tolist(), batch.spawned.tolist())
+        boards = batch.boards.copy()
+        batch.step([1] * 50)
+        batch.play()
+        self.assertTrue((batch.boards == boards).all())
+        self.assertEqual(batch.frames.max(), frames)
+
+    def test_actions(self):
+        self.assertEqual(BATCH_ACTIONS_3D, ENGINES["3d"].actions)
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, BatchGame3D, 0)
+        self.assertRaises(ValueError, BatchGame3D, -1)
+        self.assertRaises(ValueError, BatchGame3D, 4, floors=3)
+        self.assertRaises(ValueError, BatchGame3D, 4, floor_width=9)
+        self.assertRaises(
+            ValueError, BatchGame3D, 4, generators=[PieceGenerator(7)])
+        self.assertRaises(ValueError, BatchGame3D(4).step, [0, 0, 0])
+        self.assertRaises(ValueError, BatchGame3D(4).step, [0, 0, 0, 13])
+
+
+if __name__ == "__main__":
+    unittest.main()
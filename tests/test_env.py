@@ -0,0 +1,222 @@
+from game.board_2d import ArrayBoard2D
+from game.board_3d import ArrayBoard3D
+from game.control import GameControl2D, GameControl3D
+from game.env import *
+from game.game_2d import Game2D
+from game.game_3d import Game3D
+from game.piece_generator import PieceGenerator
+import random
+import unittest
+
+
+def random_actions(env, seed: int, count: int) -> list[int]:
+    """
+    Returns 'count' random actions of 'env' that hold
+    each control for a few frames, like a player would.
+    """
+    rng = random.Random(seed)
+    action = 0
+    actions = []
+    for _ in range(count):
+        for bit in range(len(env.mode.controls)):
+            if rng.random() < 0.1:
+                action ^= 1 << bit
+        actions.append(action)
+    return actions
+
+
+class TestTetrisEnv(unittest.TestCase):
+    def test_same_as_control(self):
+        """
+        Stepping the env should play EXACTLY like its 'GameControl',
+        played frame by frame with the controls of the actions,
+        and the observations should show its game.
+        """
+        for mode, game_type, board_type, control_type, size in (
+                ("2d", Game2D, ArrayBoard2D, GameControl2D,
+                 {"rows": 12, "columns": 6}),
+                ("3d", Game3D, ArrayBoard3D, GameControl3D,
+                 {"floor_width": 4, "floors": 10})):
+            with self.subTest(mode=mode):
+                env = TetrisEnv(mode, max_frames=2000, **size)
+                observation, _ = env.reset(5)
+                arrays = dict(observation)
+
+                game_seed = random.Random(5).getrandbits(64)
+                expected = control_type(game_type(
+                    board_type=board_type,
+                    generator=PieceGenerator(7, game_seed), **size))
+                held = frozenset()
+                points = 0
+
+                for action in random_actions(env, 1, 2000):
+                    controls = frozenset(
+                        control
+                        for bit, control in enumerate(env.mode.controls)
+                        if action >> bit & 1)
+                    _, game_can_continue = expected.play_frame(
+                        controls, controls - held)
+                    held = controls
+
+                    observation, reward, terminated, truncated, _ = \
+                        env.step(action)
+                    game = expected.game
+                    self.assertEqual(
+                        env.control.game.zobrist_hash, game.zobrist_hash)
+                    self.assertEqual(
+                        reward, game.score_manager.points - points)
+                    points = game.score_manager.points
+                    self.assertEqual(terminated, not game_can_continue)
+
+                    self.assertEqual(
+                        observation["board"].tolist(),
+                        (game.board.cells != 0).tolist())
+                    self.assertEqual(
+                        observation["position"].tolist(), game.piece.pos)
+                    self.assertEqual(
+                        env.mode.piece_key(game.piece),
+                        env.mode.piece_key(env.control.game.piece))
+                    self.assertEqual(
+                        int(observation["orientation"]),
+                        env.mode.piece_orientation(game.piece))
+
+                    for name, array in observation.items():
+                        self.assertIs(array, arrays[name])
+                    # (the same arrays, every step)
+
+                    if terminated or truncated:
+                        break
+
+                self.assertTrue(terminated or truncated)
+                self.assertGreater(env.control.game.board.__len__(), 0)
+                self.assertRaises(ValueError, env.step, 0)
+
+    def test_pieces(self):
+        """
+        The piece indexes should be the indexes of the pieces
+        the generator picked.
+        """
+        for mode in ENV_MODES:
+            with self.subTest(mode=mode):
+                env = TetrisEnv(mode)
+                observation, _ = env.reset(3)
+                generator = PieceGenerator(
+                    7, random.Random(3).getrandbits(64))
+                indexes = [generator.next_index() for _ in range(3)]
+
+                self.assertEqual(int(observation["piece"]), indexes[0])
+                self.assertEqual(int(observation["next_piece"]), indexes[1])
+
+                hard_drop = 1 << env.mode.controls.index("HARD_DROP")
+                env.step(hard_drop)
+                self.assertEqual(int(observation["piece"]), indexes[1])
+                self.assertEqual(int(observation["next_piece"]), indexes[2])
+
+    def test_held_controls(self):
+        """
+        Holding a control should only press it in its first frame:
+        holding "HARD_DROP" should hard drop once,
+        and holding "LEFT" should move the piece with DAS.
+        """
+        env = TetrisEnv("2d")
+        env.reset(0)
+        hard_drop = 1 << env.mode.controls.index("HARD_DROP")
+        for _ in range(10):
+            env.step(hard_drop)
+        self.assertEqual(env.control.game.board.__len__(), 4)
+
+        env.reset(0)
+        left = 1 << env.mode.controls.index("LEFT")
+        x_pos = env.control.game.piece.pos[0]
+        env.step(left)
+        env.step(left)
+        self.assertEqual(env.control.game.piece.pos[0], x_pos - 1)
+
+    def test_board_shape(self):
+        """
+        'board_shape' should be the shape of the cells of the boards
+        of the games of that size, without making a game.
+        """
+        for mode, size in (("2d", {}), ("2d", {"rows": 12, "columns": 6}),
+                           ("3d", {}), ("3d", {"floor_width": 5,
+                                               "floors": 9})):
+            with self.subTest(mode=mode, size=size):
+                env = TetrisEnv(mode, **size)
+                self.assertEqual(
+                    env.mode.board_shape(**size),
+                    env.control.game.board.cells.shape)
+                vector = VectorTetrisEnv(mode, 2, **size)
+                self.assertEqual(
+                    vector.observation["board"].shape[1:],
+                    env.control.game.board.cells.shape)
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, TetrisEnv, "5d")
+        env = TetrisEnv("2d")
+        env.reset()
+        self.assertRaises(ValueError, env.step, -1)
+        self.assertRaises(ValueError, env.step, env.action_count)
+
+
+class TestVectorTetrisEnv(unittest.TestCase):
+    def test_same_as_envs(self):
+        """
+        Every row of the vector env should be what the same env
+        played alone returns, and the envs whose game ended
+        should start a new game in the next step.
+        """
+        for mode in ENV_MODES:
+            with self.subTest(mode=mode):
+                vector = VectorTetrisEnv(mode, 3, max_frames=300)
+                observation, _ = vector.reset(7)
+                arrays = dict(observation)
+                envs = [TetrisEnv(mode, max_frames=300) for _ in range(3)]
+                for index, env in enumerate(envs):
+                    env.reset(7 + index)
+
+                actions = [
+                    random_actions(env, index, 700)
+                    for index, env in enumerate(envs)
+                ]
+                resets = 0
+
+                for frame in range(700):
+                    observation, rewards, terminated, truncated, _ = \
+                        vector.step([
+                            actions[index][frame] for index in range(3)])
+
+                    for index, env in enumerate(envs):
+                        if env.done:
+                            env.reset()
+                            expected = (env.observation, 0.0, False, False)
+                            resets += 1
+                        else:
+                            expected = env.step(
+                                actions[index][frame])[:4]
+
+                        self.assertEqual(
+                            (rewards[index], terminated[index],
+                             truncated[index]),
+                            expected[1:])
+                        for name, array in observation.items():
+                            self.assertEqual(
+                                array[index].tolist(),
+                                expected[0][name].tolist())
+
+                    for name, array in observation.items():
+                        self.assertIs(array, arrays[name])
+
+                self.assertGreaterEqual(resets, 6)
+                # (every game is truncated at frame 300)
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, VectorTetrisEnv, "2d", 0)
+        self.assertRaises(ValueError, VectorTetrisEnv, "5d", 2)
+        vector = VectorTetrisEnv("3d", 2)
+        vector.reset()
+        self.assertRaises(ValueError, vector.step, [0])
+        self.assertRaises(ValueError, vector.step, [0, 1 << 20])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+from game.farm import *
+from game.move_data import HARD_DROP
+from game.simulation import ScriptedPolicy, simulate
+import os
+import unittest
+
+
+def hard_drop_policy(seed: int) -> ScriptedPolicy:
+    return ScriptedPolicy([[("try_move", HARD_DROP)]])
+
+
+class TestFarm(unittest.TestCase):
+    def test_same_as_simulate(self):
+        """
+        The farm should play the SAME games 'simulate' plays
+        with the same arguments, whatever ranges the workers get,
+        writing each game's results in the order of their seeds.
+        """
+        for engine in ("2d", "3d"):
+            for chunk_size in (1, 2, 5):
+                with self.subTest(engine=engine, chunk_size=chunk_size):
+                    expected = simulate(engine, 5, seed=3)
+                    report = farm(engine, 5, seed=3, workers=2,
+                                  chunk_size=chunk_size)
+
+                    self.assertEqual(report.games, 5)
+                    self.assertEqual(report.scores, expected.scores)
+                    self.assertEqual(report.frames, expected.frames)
+                    self.assertEqual(report.pieces, expected.pieces)
+                    self.assertEqual(
+                        report.results["seed"].tolist(), list(range(3, 8)))
+                    self.assertTrue((report.results["seconds"] > 0).all())
+                    self.assertEqual(
+                        report.latency.count("play"),
+                        expected.latency.count("play"))
+                    self.assertIn("game durations", report.format())
+
+    def test_policy_factory(self):
+        """
+        Any picklable policy factory should work in the workers,
+        and 'max_frames' should stop the games early.
+        """
+        report = farm("2d", 3, hard_drop_policy, workers=2)
+        self.assertEqual(
+            report.results["frames"].tolist(),
+            report.results["pieces"].tolist())
+
+        report = farm("2d", 3, seed=9, max_frames=50, workers=1)
+        self.assertEqual(report.results["frames"].tolist(), [50] * 3)
+
+    def test_no_games(self):
+        report = farm("3d", 0)
+        self.assertEqual(report.games, 0)
+        self.assertEqual(len(report.results), 0)
+        self.assertEqual(report.scores, [])
+        self.assertIn("0 games", report.format())
+
+    def test_shared_memory_released(self):
+        """
+        The shared memory of the results should be unlinked
+        when the farm is done.
+        """
+        if not os.path.isdir("/dev/shm"):
+            self.skipTest("no /dev/shm to look at")
+
+        before = set(os.listdir("/dev/shm"))
+        farm("2d", 4, workers=2, max_frames=10)
+        self.assertEqual(set(os.listdir("/dev/shm")), before)
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, farm, "5d", 1)
+        self.assertRaises(ValueError, farm, "2d", -1)
+        self.assertRaises(ValueError, farm, "2d", 1, workers=0)
+        self.assertRaises(ValueError, farm, "2d", 1, chunk_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
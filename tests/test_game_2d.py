@@ -1 +1,538 @@
 import game.game_2d
+from game import game_2d
+from game.board_2d import Board2D, BitBoard2D, PaletteBoard2D, ArrayBoard2D
+from game.zobrist import cell_keys_2d
+import random
+import unittest
+
+
+GREY = (128, 128, 128)
+
+BOARD_TYPES = (BitBoard2D, PaletteBoard2D, ArrayBoard2D)
+
+PIECES_2D = (game_2d.I_2D, game_2d.J_2D, game_2d.L_2D, game_2d.O_2D,
+             game_2d.S_2D, game_2d.T_2D, game_2d.Z_2D)
+
+
+def random_board(rng: random.Random, fill: float = 0.3) -> dict:
+    """
+    Returns a '{pos: GREY}' dict with about 'fill' of the board's squares
+    filled, only in the bottom half of the board,
+    so that pieces still fit at the top.
+    """
+    return {
+        (x_pos, y_pos): GREY
+        for y_pos in range(game_2d.ROWS // 2, game_2d.ROWS)
+        for x_pos in range(game_2d.COLUMNS)
+        if rng.random() < fill
+    }
+
+
+class TestPiece2D(unittest.TestCase):
+    def test_compiled_rotations(self):
+        """
+        The compiled rotation tables should have exactly the squares
+        of the "#" strings they were compiled from, in the same order
+        (up->down, left->right),
+        and be shared by all of the pieces of the same kind.
+        """
+        for piece_data in PIECES_2D:
+            piece = game_2d.Piece2D(piece_data)
+            self.assertIs(piece.rotations,
+                          game_2d.Piece2D(piece_data).rotations)
+
+            for rotation, strings in enumerate(piece_data[:-2]):
+                piece.rotation = rotation
+                SQUARES = [
+                    (ci, ri)
+                    for ri, row in enumerate(strings)
+                    for ci, square in enumerate(row)
+                    if square == "#"
+                ]
+                self.assertEqual(
+                    list(piece.relative_square_positions()), SQUARES)
+
+                compiled = piece.compiled
+                self.assertEqual(compiled.height, len(strings))
+                self.assertEqual(compiled.width, len(strings[0]))
+                self.assertEqual(
+                    compiled.bounds,
+                    (min(x for x, _ in SQUARES), min(y for _, y in SQUARES),
+                     max(x for x, _ in SQUARES), max(y for _, y in SQUARES))
+                )
+                self.assertEqual(
+                    compiled.bottom,
+                    tuple(
+                        (x_pos, max(y for x, y in SQUARES if x == x_pos))
+                        for x_pos in sorted(set(x for x, _ in SQUARES))
+                    )
+                )
+
+    def test_square_positions(self):
+        """
+        'Piece2D.square_positions' should be the relative positions,
+        moved by 'Piece2D.pos'.
+        """
+        for piece_data in PIECES_2D:
+            piece = game_2d.Piece2D(piece_data)
+            piece.pos = [2, 5]
+            self.assertEqual(
+                piece.square_positions(),
+                [(x_pos + 2, y_pos + 5)
+                 for x_pos, y_pos in piece.relative_square_positions()]
+            )
+
+    def test_spawn(self):
+        """
+        Spawning a piece from its template should make the same piece
+        as 'Piece2D', sharing the template's data but not its position.
+        """
+        for columns in (game_2d.COLUMNS, 64):
+            for piece_data in PIECES_2D:
+                template = game_2d.spawn_template_2d(piece_data, columns)
+                self.assertIs(
+                    template, game_2d.spawn_template_2d(piece_data, columns))
+
+                piece = game_2d.Piece2D(piece_data, columns)
+                spawned = game_2d.Piece2D.spawn(template)
+
+                self.assertIs(spawned.data, piece_data)
+                self.assertIs(spawned.rotations, piece.rotations)
+                self.assertEqual(spawned.pos, piece.pos)
+                self.assertEqual(spawned.color, piece.color)
+                self.assertEqual(spawned.rotation, 0)
+
+                spawned.pos[0] += 1
+                self.assertEqual(list(template.pos), piece.pos)
+
+
+class TestBoards2D(unittest.TestCase):
+    def test_mapping(self):
+        """
+        Every board type should behave exactly like the '{pos: color}'
+        dict it replaces.
+        """
+        for board_type in BOARD_TYPES:
+            with self.subTest(board_type=board_type):
+                self._test_mapping(board_type)
+
+    def _test_mapping(self, board_type: type):
+        squares = random_board(random.Random(0))
+        board = board_type(game_2d.ROWS, game_2d.COLUMNS, squares)
+
+        self.assertEqual(board, squares)
+        self.assertEqual(len(board), len(squares))
+        self.assertEqual(set(board), set(squares))
+
+        pos = next(iter(squares))
+        self.assertIn(pos, board)
+        self.assertEqual(board.pop(pos), GREY)
+        self.assertNotIn(pos, board)
+        self.assertIsNone(board.get(pos))
+        self.assertIsNone(board.get((-1, 0)))
+        self.assertIsNone(board.get((0, game_2d.ROWS)))
+
+        with self.assertRaises(ValueError):
+            board[(game_2d.COLUMNS, 0)] = GREY
+
+        copy = board.copy()
+        copy[pos] = GREY
+        self.assertNotIn(pos, board)
+
+    def test_incomplete_backend(self):
+        """
+        A backend missing any of 'Board2D's abstract methods
+        shouldn't be made.
+        """
+        class IncompleteBoard2D(Board2D):
+            __getitem__ = dict.__getitem__
+            __setitem__ = dict.__setitem__
+            __delitem__ = dict.__delitem__
+            __iter__ = dict.__iter__
+            __len__ = dict.__len__
+
+        self.assertRaises(TypeError, IncompleteBoard2D)
+
+    def test_collides(self):
+        """
+        'collides' and 'fits' should give the
+        same answers as checking every square of the piece
+        in a dict board, for every piece, rotation and position
+        (including ones partly outside of the board).
+        """
+        rng = random.Random(1)
+        for _ in range(5):
+            squares = random_board(rng)
+            for board_type in BOARD_TYPES:
+                self._test_collides(
+                    board_type(game_2d.ROWS, game_2d.COLUMNS, squares),
+                    squares
+                )
+
+    def _test_collides(self, board, squares: dict):
+        for piece_data in PIECES_2D:
+            piece = game_2d.Piece2D(piece_data)
+
+            for rotation in range(len(piece.all_rotations)):
+                piece.rotation = rotation
+
+                for y_pos in range(-3, game_2d.ROWS + 1):
+                    for x_pos in range(-3, game_2d.COLUMNS + 1):
+                        piece.pos = [x_pos, y_pos]
+                        positions = piece.square_positions()
+
+                        COLLIDES = any(
+                            pos in squares
+                            or pos[0] not in range(game_2d.COLUMNS)
+                            or pos[1] >= game_2d.ROWS
+                            for pos in positions
+                        )
+                        FITS = not COLLIDES and all(
+                            pos[1] >= 0 for pos in positions)
+
+                        self.assertEqual(
+                            board.collides(
+                                piece.row_masks(), x_pos, y_pos),
+                            COLLIDES,
+                            msg=f"{piece.piece=} {piece.pos=}"
+                        )
+                        self.assertEqual(
+                            board.fits(piece.row_masks(), x_pos, y_pos),
+                            FITS,
+                            msg=f"{piece.piece=} {piece.pos=}"
+                        )
+
+    def test_drop_distance(self):
+        """
+        'drop_distance' should be the amount of times
+        the piece can move one square down before colliding,
+        for every piece, rotation and column,
+        even when the piece is tucked under an overhang.
+        """
+        rng = random.Random(2)
+        for _ in range(5):
+            squares = random_board(rng, 0.5)
+            for board_type in BOARD_TYPES:
+                self._test_drop_distance(
+                    board_type(game_2d.ROWS, game_2d.COLUMNS, squares))
+
+    def _test_drop_distance(self, board):
+        for piece_data in PIECES_2D:
+            piece = game_2d.Piece2D(piece_data)
+
+            for rotation in range(len(piece.all_rotations)):
+                piece.rotation = rotation
+
+                for y_pos in range(-2, game_2d.ROWS):
+                    for x_pos in range(-2, game_2d.COLUMNS):
+                        if not board.fits(piece.row_masks(),
+                                          x_pos, y_pos):
+                            continue
+
+                        distance = 0
+                        while not board.collides(piece.row_masks(),
+                                                 x_pos,
+                                                 y_pos + distance + 1):
+                            distance += 1
+
+                        self.assertEqual(
+                            board.drop_distance(
+                                piece.compiled.bottom, x_pos, y_pos),
+                            distance,
+                            msg=f"{piece.piece=} {x_pos=} {y_pos=}"
+                        )
+
+    def test_skyline(self):
+        """
+        The column bitmasks and the skyline should always match
+        the board's squares, after placing pieces and clearing rows.
+        """
+        game_instance = game_2d.Game2D()
+        rng = random.Random(3)
+
+        for _ in range(200):
+            for _ in range(rng.randrange(4)):
+                game_instance.try_rotate()
+            for _ in range(rng.randrange(6)):
+                game_instance.try_move(rng.choice("lr"))
+            game_instance.try_move("h")
+            if not game_instance.play():
+                game_instance.board = {}
+
+            board = game_instance.board
+            for x_pos in range(game_2d.COLUMNS):
+                ROWS_FILLED = [y_pos for y_pos in range(game_2d.ROWS)
+                               if (x_pos, y_pos) in board]
+                self.assertEqual(
+                    board.columns[x_pos],
+                    sum(1 << y_pos for y_pos in ROWS_FILLED)
+                )
+                self.assertEqual(
+                    board.heights[x_pos],
+                    min(ROWS_FILLED, default=game_2d.ROWS)
+                )
+
+
+class TestGame2D(unittest.TestCase):
+    def test_board_types_play_the_same(self):
+        """
+        The same game, played with every board type,
+        should end up with the same boards and scores.
+        """
+        games = []
+        for board_type in BOARD_TYPES:
+            random.seed(4)
+            game_instance = game_2d.Game2D(board_type)
+            rng = random.Random(5)
+
+            for _ in range(300):
+                game_instance.try_rotate(rng.random() < 0.5)
+                game_instance.try_move(rng.choice("lrlrh"))
+                if not game_instance.play():
+                    break
+            games.append(game_instance)
+
+        for game_instance in games[1:]:
+            self.assertEqual(game_instance.board, games[0].board)
+            self.assertEqual(game_instance.score_manager,
+                             games[0].score_manager)
+
+    def test_snapshot_restore(self):
+        """
+        Restoring a snapshot, then playing the same moves again,
+        should play out exactly the same game,
+        (including the pieces that come next)
+        for every board type.
+        """
+        for board_type in BOARD_TYPES:
+            game_instance = game_2d.Game2D(board_type)
+            game_instance.board = random_board(random.Random(6))
+            snapshot = game_instance.snapshot()
+
+            results = []
+            for _ in range(2):
+                game_instance.restore(snapshot)
+                rng = random.Random(7)
+
+                for _ in range(200):
+                    game_instance.try_rotate(rng.random() < 0.5)
+                    game_instance.try_move(rng.choice("lrlrh"))
+                    if not game_instance.play():
+                        break
+                results.append((
+                    dict(game_instance.board),
+                    game_instance.piece.square_positions(),
+                    game_instance.next_piece.data,
+                    game_instance.score_manager
+                ))
+            self.assertEqual(results[0], results[1])
+
+    def test_fork(self):
+        """
+        Playing a forked game shouldn't change the original game.
+        """
+        game_instance = game_2d.Game2D()
+        game_instance.board = random_board(random.Random(8))
+        BOARD = dict(game_instance.board)
+        PIECE_POS = game_instance.piece.pos.copy()
+
+        fork = game_instance.fork()
+        self.assertEqual(fork.board, BOARD)
+
+        fork.try_move("h")
+        fork.play()
+        fork.board[(0, 0)] = GREY
+
+        self.assertEqual(game_instance.board, BOARD)
+        self.assertEqual(game_instance.piece.pos, PIECE_POS)
+
+    def test_zobrist_hash(self):
+        """
+        The board's Zobrist hash, kept up to date while playing,
+        should always be the XOR of the keys of its filled squares,
+        and the game's hash should come back to the same value
+        when the piece moves back to where it was.
+        """
+        KEYS = cell_keys_2d(game_2d.ROWS, game_2d.COLUMNS)
+
+        for board_type in BOARD_TYPES:
+            random.seed(9)
+            game_instance = game_2d.Game2D(board_type)
+            game_instance.board = random_board(random.Random(10), 0.8)
+            rng = random.Random(11)
+
+            for _ in range(300):
+                HASH = game_instance.zobrist_hash
+                if game_instance.try_move("l"):
+                    self.assertNotEqual(game_instance.zobrist_hash, HASH)
+                    game_instance.try_move("r")
+                self.assertEqual(game_instance.zobrist_hash, HASH)
+
+                game_instance.try_rotate(rng.random() < 0.5)
+                game_instance.try_move(rng.choice("lrlrh"))
+                if not game_instance.play():
+                    game_instance.board = random_board(rng, 0.8)
+
+                EXPECTED_HASH = 0
+                for x_pos, y_pos in game_instance.board:
+                    EXPECTED_HASH ^= KEYS[y_pos][x_pos]
+                self.assertEqual(
+                    game_instance.board.zobrist_hash, EXPECTED_HASH)
+
+            self.assertEqual(game_instance.fork().zobrist_hash,
+                             game_instance.zobrist_hash)
+
+    def test_board_assignment(self):
+        """
+        Assigning a dict to 'Game2D.board' should keep working,
+        and the game's moves should see its squares.
+        """
+        game_instance = game_2d.Game2D()
+        game_instance.piece = game_2d.Piece2D(game_2d.O_2D)
+        # O piece's squares are at x = 4, 5
+
+        game_instance.board = {(3, 0): GREY}
+        self.assertIsInstance(game_instance.board, BitBoard2D)
+        self.assertEqual(game_instance.board, {(3, 0): GREY})
+
+        self.assertFalse(game_instance.try_move("l"))
+        self.assertTrue(game_instance.try_move("r"))
+
+    def test_clear_lines(self):
+        """
+        Landing a vertical I piece in the hole of 4 almost-full rows
+        should clear all 4 of them, make the squares above them fall 4
+        rows, and score a "Tetris".
+        """
+        game_instance = game_2d.Game2D()
+        game_instance.board = {
+            (x_pos, y_pos): GREY
+            for x_pos in range(1, game_2d.COLUMNS)
+            for y_pos in range(game_2d.ROWS - 4, game_2d.ROWS)
+        }
+        game_instance.board[(5, game_2d.ROWS - 5)] = GREY
+        game_instance.board[(3, game_2d.ROWS - 6)] = GREY
+
+        game_instance.piece = game_2d.Piece2D(game_2d.I_2D)
+        game_instance.piece.rotation = 1
+        game_instance.piece.pos = [-2, game_2d.ROWS - 4]
+        # I piece's squares are at x = dx + pos[0] = 2 - 2 = 0
+
+        game_instance.set_down()
+        game_instance.clear_lines(game_instance.piece)
+
+        self.assertEqual(game_instance.amount_of_levels_cleared, 4)
+        self.assertEqual(game_instance.score_manager.points, 1200)
+        self.assertEqual(
+            game_instance.board,
+            {(5, game_2d.ROWS - 1): GREY, (3, game_2d.ROWS - 2): GREY}
+        )
+        self.assertEqual(
+            game_instance.board.counts,
+            [0] * (game_2d.ROWS - 2) + [1, 1]
+        )
+
+    def test_hard_drop(self):
+        """
+        Hard dropping on an empty board should land the piece
+        right on the floor.
+        """
+        for piece_data in PIECES_2D:
+            game_instance = game_2d.Game2D()
+            game_instance.piece = game_2d.Piece2D(piece_data)
+
+            game_instance.try_move("h")
+            self.assertTrue(game_instance.landed())
+            self.assertEqual(
+                max(y_pos for _, y_pos
+                    in game_instance.piece.square_positions()),
+                game_2d.ROWS - 1
+            )
+
+    def test_rotation_mask(self):
+        """
+        'rotation_mask' should have the bits of exactly the rotations
+        'try_rotate' succeeds at, without rotating the piece,
+        for every board type.
+        """
+        rng = random.Random(17)
+        for board_type in BOARD_TYPES:
+            for _ in range(100):
+                game_instance = game_2d.Game2D(board_type)
+                game_instance.board = {
+                    (x_pos, y_pos): GREY
+                    for x_pos in range(game_2d.COLUMNS)
+                    for y_pos in range(rng.randrange(2, game_2d.ROWS),
+                                       game_2d.ROWS)
+                    if rng.random() < 0.6
+                }
+                game_instance.piece.pos[1] = rng.randrange(game_2d.ROWS)
+                for _ in range(rng.randrange(6)):
+                    game_instance.try_move(rng.choice("lr"))
+
+                ROTATION = game_instance.piece.rotation
+                MASK = game_instance.rotation_mask()
+                self.assertEqual(game_instance.piece.rotation, ROTATION)
+
+                for clockwise in (False, True):
+                    self.assertEqual(bool(MASK >> clockwise & 1),
+                                     game_instance.try_rotate(clockwise))
+                    game_instance.piece.rotation = ROTATION
+
+    def test_board_size(self):
+        """
+        Games should play on boards of any size,
+        with the pieces spawning in the middle of the board,
+        and a Tetris on a huge board should only clear the Tetris' rows,
+        for every board type.
+        """
+        self.assertRaises(ValueError, game_2d.Game2D, rows=3)
+        self.assertRaises(ValueError, game_2d.Game2D, columns=3)
+
+        ROWS, COLUMNS = 1000, 64
+
+        for board_type in BOARD_TYPES:
+            game_instance = game_2d.Game2D(
+                board_type, rows=ROWS, columns=COLUMNS)
+            self.assertEqual(game_instance.board.row_count, ROWS)
+            self.assertEqual(game_instance.board.column_count, COLUMNS)
+
+            for piece_data in PIECES_2D:
+                piece = game_2d.Piece2D(piece_data, COLUMNS)
+                SQUARES_X = [x_pos for x_pos, _ in piece.square_positions()]
+                self.assertLessEqual(
+                    abs(min(SQUARES_X) + max(SQUARES_X) + 1 - COLUMNS), 2)
+            # centered, give or take a square
+
+            game_instance.board = {
+                (x_pos, y_pos): GREY
+                for x_pos in range(COLUMNS) if x_pos != 40
+                for y_pos in range(ROWS - 4, ROWS)
+            }
+            game_instance.board[(40, ROWS - 5)] = GREY
+
+            game_instance.piece = game_2d.Piece2D(game_2d.I_2D, COLUMNS)
+            game_instance.piece.rotation = 1
+            game_instance.piece.pos[0] = 38
+            # I piece's squares are at x = dx + pos[0] = 2 + 38 = 40
+
+            self.assertTrue(game_instance.try_move("h"))
+            self.assertEqual(game_instance.piece.pos[1], ROWS - 9)
+            # right on top of the square in its column
+
+            del game_instance.board[(40, ROWS - 5)]
+            game_instance.piece.pos[1] = ROWS - 4
+            game_instance.set_down()
+            game_instance.clear_lines(game_instance.piece)
+
+            self.assertEqual(game_instance.amount_of_levels_cleared, 4)
+            self.assertEqual(len(game_instance.board), 0)
+            self.assertEqual(game_instance.board.zobrist_hash, 0)
+
+            fork = game_instance.fork()
+            self.assertEqual((fork.rows, fork.columns), (ROWS, COLUMNS))
+            self.assertEqual(fork.board.row_count, ROWS)
+
+
+if __name__ == "__main__":
+    unittest.main()
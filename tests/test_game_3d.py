@@ -1,11 +1,38 @@
 from game import game_3d
-from numpy import rot90, nditer
+from game.board_3d import Board3D, DictBoard3D, ArrayBoard3D, BitBoard3D
+from game.piece_generator import PieceGenerator
+from game.zobrist import cell_key_3d
+from numpy import rot90, nditer, array_equal
+import random
 import unittest
-from itertools import combinations
+from itertools import combinations, product
 
 
 GREY = (128, 128, 128)
 
+BOARD_TYPES = (DictBoard3D, ArrayBoard3D, BitBoard3D)
+
+
+def random_board(rng: random.Random, fill: float = 0.5) -> dict:
+    """
+    Returns a '{pos: GREY}' dict with about 'fill' of the board's cubes
+    filled, only in the bottom 5 floors of the board,
+    so that pieces still fit at the top.
+    """
+    return {
+        (x_pos, y_pos, z_pos): GREY
+        for x_pos in range(game_3d.FLOOR_WIDTH)
+        for y_pos in range(game_3d.FLOOR_WIDTH)
+        for z_pos in range(game_3d.FLOORS - 5, game_3d.FLOORS)
+        if rng.random() < fill
+    }
+
+
+def block_inside_board(pos) -> bool:
+    return pos[0] in range(game_3d.FLOOR_WIDTH) \
+        and pos[1] in range(game_3d.FLOOR_WIDTH) \
+        and pos[2] in range(game_3d.FLOORS)
+
 
 def piece_inside_board(piece: game_3d.Piece3D):
     return all(
@@ -45,6 +72,124 @@ class TestPiece3D(unittest.TestCase):
                 piece_inside_board(piece)
             )
 
+    def test_spawn(self):
+        """
+        Spawning a piece from its template should make the same piece
+        as 'Piece3D', rotated to "face the player" like the games did,
+        in the middle of the floors.
+        """
+        for floor_width in (game_3d.FLOOR_WIDTH, 16):
+            TEMPLATES = game_3d.spawn_templates_3d(floor_width)
+            self.assertEqual(len(TEMPLATES), len(game_3d.PIECES_3D))
+
+            for template, piece_data in zip(TEMPLATES, game_3d.PIECES_3D):
+                piece = game_3d.Piece3D(*piece_data, floor_width)
+                piece.rotate(game_3d.Z_AXIS, True)
+                piece.rotate(game_3d.Y_AXIS, True)
+
+                spawned = game_3d.Piece3D.spawn(template)
+
+                self.assertTrue(array_equal(spawned.blocks, piece.blocks))
+                self.assertEqual(spawned.orientation, piece.orientation)
+                self.assertEqual(spawned.pos, piece.pos)
+                self.assertEqual(spawned.color, piece.color)
+
+                spawned.pos[2] += 1
+                self.assertEqual(template.pos[2], 0)
+
+    def test_canonical_orientations(self):
+        """
+        Each piece's canonical orientations should have ONE orientation
+        for each distinct shape, every orientation should be in the same
+        cubes as its shape's orientation (with a different 'pos'),
+        and rotating a spawned piece with each shape's rotations
+        should get it to that shape's orientation.
+        """
+        self.assertEqual(
+            sorted(
+                len(canonical.orientations)
+                for canonical in game_3d.CANONICAL_ORIENTATIONS_3D),
+            [3, 3, 12, 12, 12, 24, 24]
+        )
+        # I and O have 3 shapes (one per axis), T, S and Z have 12,
+        # and J and L have no symmetries.
+
+        for canonical, template in zip(
+                game_3d.CANONICAL_ORIENTATIONS_3D,
+                game_3d.spawn_templates_3d()):
+            table = canonical.table
+            self.assertIs(table, template.table)
+            self.assertEqual(canonical.start, template.orientation)
+            self.assertEqual(canonical.ids[canonical.start], 0)
+            self.assertEqual(canonical.rotations[0], ())
+
+            for orientation, shape_id in enumerate(canonical.ids):
+                compiled = table.orientations[orientation]
+                representative = table.orientations[
+                    canonical.orientations[shape_id]]
+                SHIFT = [
+                    low - representative_low for low, representative_low
+                    in zip(compiled.bounds[:3], representative.bounds[:3])
+                ]
+
+                self.assertEqual(
+                    set(compiled.positions),
+                    {(dx + SHIFT[0], dy + SHIFT[1], dz + SHIFT[2])
+                     for dx, dy, dz in representative.positions}
+                )
+
+            SHAPES = set()
+            for orientation in canonical.orientations:
+                compiled = table.orientations[orientation]
+                SHAPES.add(frozenset(
+                    (dx - compiled.bounds[0], dy - compiled.bounds[1],
+                     dz - compiled.bounds[2])
+                    for dx, dy, dz in compiled.positions))
+            self.assertEqual(len(SHAPES), len(canonical.orientations))
+            # the shapes are all different
+
+            for orientation, rotations in zip(
+                    canonical.orientations, canonical.rotations):
+                piece = game_3d.Piece3D.spawn(template)
+                for axis, clockwise in rotations:
+                    piece.rotate(axis, clockwise)
+                self.assertEqual(piece.orientation, orientation)
+                self.assertLessEqual(len(rotations), 3)
+
+    def test_orientation_table(self):
+        """
+        Every piece should have 24 orientations,
+        rotating through the transition table should give exactly
+        the blocks 'rot90' gives,
+        and rotating back should come back to the same orientation.
+        """
+        rng = random.Random(0)
+
+        for piece_data in game_3d.PIECES_3D:
+            piece = game_3d.Piece3D(*piece_data)
+            self.assertIs(piece.table, game_3d.Piece3D(*piece_data).table)
+            self.assertEqual(len(piece.table.orientations), 24)
+            self.assertFalse(piece.blocks.flags.writeable)
+
+            EXPECTED_BLOCKS = piece_data[0]
+            for _ in range(200):
+                AXIS = rng.randrange(3)
+                CLOCKWISE = rng.random() < 0.5
+                ORIENTATION = piece.orientation
+
+                piece.rotate(AXIS, CLOCKWISE)
+                EXPECTED_BLOCKS = game_3d.rotate_blocks(
+                    EXPECTED_BLOCKS, AXIS, CLOCKWISE)
+                self.assertTrue(array_equal(piece.blocks, EXPECTED_BLOCKS))
+
+                self.assertEqual(
+                    piece.table.transitions[piece.orientation][AXIS]
+                    [not CLOCKWISE],
+                    ORIENTATION
+                )
+
+            self.assertRaises(ValueError, piece.rotate, 3, True)
+
     # TODO: REDUNDANT
     def test_rotate(self):
         for piece in self.pieces:
@@ -123,6 +268,40 @@ class TestPiece3D(unittest.TestCase):
 
             self.assertEqual(len(BLOCK_POSITIONS), sum(nditer(piece.blocks)))
 
+    def test_block_offsets(self):
+        """
+        The cached block offsets and positions should be the 1's
+        in the piece's blocks matrix, in every orientation and position,
+        as tuples AND as (k, 3) arrays.
+        """
+        rng = random.Random(1)
+
+        for piece in self.pieces:
+            for _ in range(50):
+                piece.rotate(rng.randrange(3), rng.random() < 0.5)
+                piece.pos = [rng.randrange(-2, 4) for _ in range(3)]
+
+                EXPECTED = [
+                    (x_pos + piece.pos[0],
+                     y_pos + piece.pos[1],
+                     z_pos + piece.pos[2])
+                    for x_pos in range(piece.blocks.shape[0])
+                    for y_pos in range(piece.blocks.shape[1])
+                    for z_pos in range(piece.blocks.shape[2])
+                    if piece.blocks[x_pos, y_pos, z_pos]
+                ]
+                self.assertEqual(piece.block_positions(), EXPECTED)
+                self.assertEqual(
+                    piece.block_position_array().tolist(),
+                    [list(block_pos) for block_pos in EXPECTED])
+
+                OFFSETS = piece.block_offsets()
+                self.assertEqual(OFFSETS.shape, (len(EXPECTED), 3))
+                self.assertFalse(OFFSETS.flags.writeable)
+                self.assertEqual(
+                    [tuple(offset) for offset in OFFSETS.tolist()],
+                    piece.relative_block_positions())
+
 
 class TestGame3D(unittest.TestCase):
     """
@@ -155,7 +334,9 @@ class TestGame3D(unittest.TestCase):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.game = game_3d.Game3D()
+        self.game = game_3d.Game3D(DictBoard3D)
+        # (some of these tests put cubes below the floor,
+        # which only the dict board can hold)
 
     def test_init_random_piece(self):
         """
@@ -572,3 +753,350 @@ class TestGame3D(unittest.TestCase):
             self.game.piece = game_3d.Piece3D(*piece)
 
             self.assertTrue(self.game.play())
+
+    def test_zobrist_hash(self):
+        """
+        The board's Zobrist hash, kept up to date while playing
+        (including floor clears), should always be the XOR of the keys
+        of its filled cubes, and the game's hash should come back to the
+        same value when the piece moves back to where it was,
+        for every board type.
+        """
+        for board_type in BOARD_TYPES:
+            self.game = game_3d.Game3D(board_type, PieceGenerator(7, seed=0))
+            rng = random.Random(1)
+
+            def fill_bottom():
+                self.game.board = {
+                    (x_pos, y_pos, z_pos): GREY
+                    for x_pos in range(game_3d.FLOOR_WIDTH)
+                    for y_pos in range(game_3d.FLOOR_WIDTH)
+                    for z_pos in range(game_3d.FLOORS - 3, game_3d.FLOORS)
+                    if rng.random() < 0.9
+                }
+            fill_bottom()
+
+            for _ in range(300):
+                HASH = self.game.zobrist_hash
+                if self.game.try_move(game_3d.LEFT):
+                    self.assertNotEqual(self.game.zobrist_hash, HASH)
+                    self.game.try_move(game_3d.RIGHT)
+                self.assertEqual(self.game.zobrist_hash, HASH)
+
+                self.game.try_rotate(rng.randrange(3), rng.random() < 0.5)
+                self.game.try_move(rng.choice(game_3d.MOVES_3D))
+                if not self.game.play():
+                    fill_bottom()
+
+                EXPECTED_HASH = 0
+                for block_pos in self.game.board:
+                    EXPECTED_HASH ^= cell_key_3d(block_pos)
+                self.assertEqual(
+                    self.game.board.zobrist_hash, EXPECTED_HASH)
+
+    def test_rotation_mask(self):
+        """
+        'rotation_mask' should have the bits of exactly the rotations
+        'try_rotate' succeeds at, without rotating the piece,
+        for every board type.
+        """
+        rng = random.Random(17)
+        for board_type in BOARD_TYPES:
+            for _ in range(100):
+                game_instance = game_3d.Game3D(board_type)
+                game_instance.board = random_board(rng, 0.6)
+                game_instance.piece.pos[2] = rng.randrange(game_3d.FLOORS)
+                for _ in range(rng.randrange(4)):
+                    game_instance.try_move(rng.choice("lrfb"))
+
+                ORIENTATION = game_instance.piece.orientation
+                POS = list(game_instance.piece.pos)
+                MASK = game_instance.rotation_mask()
+
+                self.assertEqual(game_instance.piece.orientation, ORIENTATION)
+                self.assertEqual(game_instance.piece.pos, POS)
+
+                for axis, clockwise in product(game_3d.AXII, (False, True)):
+                    self.assertEqual(
+                        bool(MASK >> (axis * 2 + clockwise) & 1),
+                        game_instance.try_rotate(axis, clockwise))
+                    game_instance.piece.orientation = ORIENTATION
+
+    def test_board_types_play_the_same(self):
+        """
+        Games with the same pieces and moves should play out exactly
+        the same, no matter which board type they store their board in.
+        """
+        games = []
+        for board_type in BOARD_TYPES:
+            game_instance = game_3d.Game3D(
+                board_type, PieceGenerator(7, seed=2))
+            game_instance.board = random_board(random.Random(3))
+            rng = random.Random(4)
+
+            for _ in range(500):
+                game_instance.try_rotate(rng.randrange(3), rng.random() < 0.5)
+                game_instance.try_move(rng.choice(game_3d.MOVES_3D))
+                if not game_instance.play():
+                    break
+            games.append(game_instance)
+
+        for game_instance in games[1:]:
+            self.assertEqual(game_instance.board, games[0].board)
+            self.assertEqual(game_instance.piece.pos, games[0].piece.pos)
+            self.assertEqual(game_instance.score_manager,
+                             games[0].score_manager)
+
+    def test_hard_drop(self):
+        """
+        Hard dropping should move the piece to its ghost position,
+        exactly where moving it down one floor at a time would land it,
+        for every board type.
+        """
+        rng = random.Random(8)
+
+        for board_type in BOARD_TYPES:
+            game_instance = game_3d.Game3D(
+                board_type, PieceGenerator(7, seed=9))
+
+            for _ in range(100):
+                game_instance.board = random_board(rng)
+                game_instance.try_rotate(rng.randrange(3), rng.random() < 0.5)
+                game_instance.try_move(rng.choice(game_3d.MOVES_3D[:4]))
+
+                EXPECTED_POS = game_instance.piece.pos.copy()
+                while not game_instance.board.collides(
+                        game_instance.piece.compiled,
+                        (EXPECTED_POS[0], EXPECTED_POS[1],
+                         EXPECTED_POS[2] + 1)):
+                    EXPECTED_POS[2] += 1
+
+                self.assertEqual(game_instance.ghost_position(), EXPECTED_POS)
+                self.assertTrue(game_instance.try_move(game_3d.HARD_DROP))
+                self.assertEqual(game_instance.piece.pos, EXPECTED_POS)
+                self.assertTrue(game_instance.landed())
+
+                game_instance._init_random_piece()
+
+    def test_debug(self):
+        """
+        Moving the piece down into the board's cubes should only raise
+        ValueError in debug mode.
+        """
+        for debug in (False, True):
+            game_instance = game_3d.Game3D(debug=debug)
+            game_instance.board = {
+                block_pos: GREY
+                for block_pos in game_instance.piece.block_positions()
+            }
+            game_instance.piece.pos[2] -= 1
+
+            if debug:
+                self.assertRaises(
+                    ValueError, game_instance._move_piece_down)
+            else:
+                game_instance._move_piece_down()
+
+    def test_board_size(self):
+        """
+        Games should play on wells of any size,
+        with the pieces spawning in the middle of the floors,
+        and clearing the bottom floor of a huge well
+        should only leave the cube above it, one floor lower,
+        for every board type.
+        """
+        self.assertRaises(ValueError, game_3d.Game3D, floor_width=3)
+        self.assertRaises(ValueError, game_3d.Game3D, floors=3)
+
+        FLOOR_WIDTH, FLOORS = 16, 80
+
+        for board_type in BOARD_TYPES:
+            game_instance = game_3d.Game3D(
+                board_type, floor_width=FLOOR_WIDTH, floors=FLOORS)
+            self.assertEqual(game_instance.board.floor_width, FLOOR_WIDTH)
+            self.assertEqual(game_instance.board.floors, FLOORS)
+
+            for piece in (game_instance.piece, game_instance.next_piece):
+                for axis in (0, 1):
+                    BLOCKS = [pos[axis] for pos in piece.block_positions()]
+                    self.assertLessEqual(
+                        abs(min(BLOCKS) + max(BLOCKS) + 1 - FLOOR_WIDTH), 2)
+            # centered, give or take a cube
+
+            game_instance.board = {
+                (x_pos, y_pos, FLOORS - 1): GREY
+                for x_pos in range(FLOOR_WIDTH)
+                for y_pos in range(FLOOR_WIDTH)
+                if (x_pos, y_pos) != (0, 0)
+            }
+            game_instance.board[(5, 5, FLOORS - 2)] = GREY
+
+            game_instance.piece = game_3d.Piece3D(
+                *game_3d.PIECES_3D[0], FLOOR_WIDTH)
+            game_instance.piece.pos = [-1, -1, 0]
+            # an upright I piece, its blocks are at (1, 1, dz) in its matrix,
+            # so it's right above the hole in the bottom floor.
+
+            self.assertTrue(game_instance.try_move("h"))
+            game_instance.play()
+
+            self.assertEqual(game_instance.amount_of_levels_cleared, 1)
+            self.assertEqual(
+                set(game_instance.board),
+                {(5, 5, FLOORS - 1)}
+                | {(0, 0, z_pos) for z_pos in range(FLOORS - 3, FLOORS)}
+            )
+            # the cube on the floor and the rest of the I piece fell
+            # one floor down.
+
+            EXPECTED_HASH = 0
+            for block_pos in game_instance.board:
+                EXPECTED_HASH ^= cell_key_3d(block_pos)
+            self.assertEqual(game_instance.board.zobrist_hash, EXPECTED_HASH)
+
+
+class TestBoards3D(unittest.TestCase):
+    def test_mapping(self):
+        """
+        Every board type should work like the '{pos: color}' dict
+        it was made from.
+        """
+        squares = random_board(random.Random(5))
+        for board_type in BOARD_TYPES:
+            board = board_type(game_3d.FLOOR_WIDTH, game_3d.FLOORS, squares)
+
+            self.assertEqual(board, squares)
+            self.assertEqual(dict(board.items()), squares)
+            self.assertEqual(len(board), len(squares))
+
+            POS = next(iter(squares))
+            self.assertEqual(board[POS], GREY)
+            del board[POS]
+            self.assertNotIn(POS, board)
+            self.assertRaises(KeyError, board.__delitem__, POS)
+            board[POS] = game_3d.I_3D[1]
+            self.assertEqual(board.get(POS), game_3d.I_3D[1])
+
+            self.assertIsNone(board.get((0, 0, game_3d.FLOORS)))
+            self.assertEqual(board.copy(), board)
+
+        self.assertRaises(
+            ValueError, ArrayBoard3D.__setitem__,
+            ArrayBoard3D(game_3d.FLOOR_WIDTH, game_3d.FLOORS),
+            (game_3d.FLOOR_WIDTH, 0, 0), GREY)
+
+    def test_incomplete_backend(self):
+        """
+        A backend missing any of 'Board3D's abstract methods
+        shouldn't be made.
+        """
+        class IncompleteBoard3D(Board3D):
+            __getitem__ = dict.__getitem__
+            __setitem__ = dict.__setitem__
+            __delitem__ = dict.__delitem__
+            __iter__ = dict.__iter__
+            __len__ = dict.__len__
+
+            def collides(self, orientation, pos) -> bool:
+                return False
+
+        self.assertRaises(TypeError, IncompleteBoard3D)
+
+    def test_collides(self):
+        """
+        'collides' should be True exactly when one of the piece's blocks
+        is outside of the board or in one of the board's cubes,
+        for every board type, piece, rotation and position.
+        """
+        rng = random.Random(6)
+        squares = random_board(rng)
+
+        for board_type in BOARD_TYPES:
+            board = board_type(game_3d.FLOOR_WIDTH, game_3d.FLOORS, squares)
+
+            for piece_data in game_3d.PIECES_3D:
+                piece = game_3d.Piece3D(*piece_data)
+                for _ in range(4):
+                    piece.rotate(rng.randrange(3), rng.random() < 0.5)
+
+                    for pos in product(
+                            range(-2, game_3d.FLOOR_WIDTH),
+                            range(-2, game_3d.FLOOR_WIDTH),
+                            range(-2, game_3d.FLOORS)):
+                        piece.pos = list(pos)
+                        EXPECTED = any(
+                            block_pos in squares
+                            or not block_inside_board(block_pos)
+                            for block_pos in piece.block_positions()
+                        )
+                        self.assertEqual(
+                            board.collides(piece.compiled, pos), EXPECTED)
+
+    def test_drop_distance(self):
+        """
+        'drop_distance' should be how many floors the piece can move down
+        before it would collide, for every board type,
+        piece, rotation and position where the piece fits,
+        even under overhangs.
+        """
+        rng = random.Random(10)
+        squares = random_board(rng, 0.4)
+        squares.update({
+            (x_pos, y_pos, 8): GREY
+            for x_pos in range(game_3d.FLOOR_WIDTH)
+            for y_pos in range(game_3d.FLOOR_WIDTH)
+            if rng.random() < 0.3
+        })
+        # an overhang
+
+        for board_type in BOARD_TYPES:
+            board = board_type(game_3d.FLOOR_WIDTH, game_3d.FLOORS, squares)
+
+            for piece_data in game_3d.PIECES_3D:
+                piece = game_3d.Piece3D(*piece_data)
+                for _ in range(4):
+                    piece.rotate(rng.randrange(3), rng.random() < 0.5)
+
+                    for pos in product(
+                            range(-2, game_3d.FLOOR_WIDTH),
+                            range(-2, game_3d.FLOOR_WIDTH),
+                            range(-2, game_3d.FLOORS)):
+                        if board.collides(piece.compiled, pos):
+                            continue
+
+                        x_pos, y_pos, z_pos = pos
+                        EXPECTED = 0
+                        while not board.collides(
+                                piece.compiled,
+                                (x_pos, y_pos, z_pos + EXPECTED + 1)):
+                            EXPECTED += 1
+                        self.assertEqual(
+                            board.drop_distance(piece.compiled, pos),
+                            EXPECTED)
+
+    def test_clear_floors(self):
+        """
+        Every board type should clear the same floors,
+        and make the same floors fall, keeping its Zobrist hash.
+        """
+        rng = random.Random(7)
+        for _ in range(20):
+            squares = random_board(rng, 0.95)
+            FLOORS = [rng.randrange(-1, game_3d.FLOORS + 1)
+                      for _ in range(4)]
+
+            boards = [
+                board_type(game_3d.FLOOR_WIDTH, game_3d.FLOORS, squares)
+                for board_type in BOARD_TYPES
+            ]
+            AMOUNTS = [board.clear_floors(FLOORS) for board in boards]
+
+            for board, amount in zip(boards[1:], AMOUNTS[1:]):
+                self.assertEqual(amount, AMOUNTS[0])
+                self.assertEqual(board, boards[0])
+                self.assertEqual(board.zobrist_hash, boards[0].zobrist_hash)
+
+            EXPECTED_HASH = 0
+            for block_pos in boards[0]:
+                EXPECTED_HASH ^= cell_key_3d(block_pos)
+            self.assertEqual(boards[0].zobrist_hash, EXPECTED_HASH)
@@ -2,6 +2,8 @@ import game_control
 import pygame
 from json import load as load_from_json
 from game.move_data import *
+from game.control import DASSettings
+from game.game_3d import X_AXIS, Y_AXIS
 from game.game_2d import I_2D, J_2D, L_2D, O_2D, S_2D, T_2D, Z_2D, Piece2D
 import unittest
 
@@ -151,7 +153,7 @@ class TestDirectionInputs(unittest.TestCase):
 
         X_POS_LEFT_OF_I: int = min(
             (
-                square_pos[game_control.X_AXIS] - 1
+                square_pos[X_AXIS] - 1
                 for square_pos in instance_2D.game.piece.square_positions()
             )
         )
@@ -191,11 +193,11 @@ class TestDirectionInputs(unittest.TestCase):
                 # and have the charge should go up by one each frame.
                 self.assertEqual(
                     instance_2D.das[LEFT],
-                    game_control.DASSettings(True, frame_waiting_for_tuck + 1),
+                    DASSettings(True, frame_waiting_for_tuck + 1),
                     msg=f"{frame_waiting_for_tuck=}"
                 )
 
-            instance_2D.game.piece.pos[game_control.Y_AXIS] += 1
+            instance_2D.game.piece.pos[Y_AXIS] += 1
 
             # Check that the move WAS, INDEED, post-poned,
             # AND that the 2D instance's DAS charges
@@ -215,7 +217,7 @@ class TestDirectionInputs(unittest.TestCase):
             # by one each frame.
             self.assertEqual(
                 instance_2D.das[LEFT],
-                game_control.DASSettings(False, frames_waiting_for_tuck + 1),
+                DASSettings(False, frames_waiting_for_tuck + 1),
                 msg=f"{frames_waiting_for_tuck=}"
             )
 
@@ -253,7 +255,7 @@ class TestDirectionInputs(unittest.TestCase):
 
             X_POS_LEFT_OF_I: int = min(
                 (
-                    square_pos[game_control.X_AXIS] - 1
+                    square_pos[X_AXIS] - 1
                     for square_pos in instance_2D.game.piece.square_positions()
                 )
             )
@@ -274,7 +276,7 @@ class TestDirectionInputs(unittest.TestCase):
                 # PRETEND THAT THE PLAYER
                 # HAS ALREADY BEEN HOLDING THE PIECE FOR THOSE FRAMES
                 # (If the test BELOW passes, then this is fine to do)
-                instance_2D.das[LEFT] = game_control.DASSettings(
+                instance_2D.das[LEFT] = DASSettings(
                     True, TEST_START_FRAME)
 
                 for frame_waiting_for_tuck in range(
@@ -288,7 +290,7 @@ class TestDirectionInputs(unittest.TestCase):
 
                     self.assertEqual(
                         instance_2D.das[LEFT],
-                        game_control.DASSettings(
+                        DASSettings(
                             True,
                             TEST_START_FRAME + more_frames_waiting_for_tuck
                         ),
@@ -296,7 +298,7 @@ class TestDirectionInputs(unittest.TestCase):
                             + f"{frame_waiting_for_tuck=}"
                     )
 
-                instance_2D.game.piece.pos[game_control.Y_AXIS] += 1
+                instance_2D.game.piece.pos[Y_AXIS] += 1
 
                 self.assertTrue(
                     instance_2D.direction_input_handler((LEFT, )),
@@ -304,7 +306,7 @@ class TestDirectionInputs(unittest.TestCase):
                 )
 
                 self.assertEqual(
-                    instance_2D.das[LEFT], game_control.DASSettings(
+                    instance_2D.das[LEFT], DASSettings(
                         False, game_control.GameControl.FIRST_DELAY)
                 )
 
@@ -334,7 +336,7 @@ class TestDirectionInputs(unittest.TestCase):
 
             X_POS_LEFT_OF_I: int = min(
                 (
-                    square_pos[game_control.X_AXIS] - 1
+                    square_pos[X_AXIS] - 1
                     for square_pos in instance_2D.game.piece.square_positions()
                 )
             )
@@ -356,7 +358,7 @@ class TestDirectionInputs(unittest.TestCase):
                 )
 
                 self.assertEqual(
-                    instance_2D.das[LEFT], game_control.DASSettings(
+                    instance_2D.das[LEFT], DASSettings(
                         True, frame_waiting_for_tuck + 1)
                 )
 
@@ -368,7 +370,7 @@ class TestDirectionInputs(unittest.TestCase):
             )
 
             self.assertEqual(
-                instance_2D.das[LEFT], game_control.DASSettings(
+                instance_2D.das[LEFT], DASSettings(
                     True, game_control.GameControl.FIRST_DELAY)
             )
 
@@ -379,6 +381,6 @@ class TestDirectionInputs(unittest.TestCase):
             )
 
             self.assertEqual(
-                instance_2D.das[LEFT], game_control.DASSettings(
+                instance_2D.das[LEFT], DASSettings(
                     True, game_control.GameControl.FIRST_DELAY)
             )
@@ -0,0 +1,156 @@
+from game import game_2d, game_3d, game_4d, game_nd
+from game.board_nd import ArrayBoardND, cell_keys_nd
+from game.move_data import *
+from game.piece_generator import PieceGenerator
+from game.zobrist import feature_key
+from numpy import count_nonzero, stack
+import random
+import unittest
+
+
+GREY = (128, 128, 128)
+
+
+class TestGame4D(unittest.TestCase):
+    def test_orientations(self):
+        """
+        Every 4D piece should have one orientation per rotation
+        of the hypercube its matrix is in (192 for a matrix
+        with no symmetries), each with the same amount of blocks,
+        and rotating clockwise then counterclockwise in the same plane
+        should go back to where the piece was.
+        """
+        for table in game_4d.ORIENTATIONS_4D:
+            self.assertEqual(len(table.orientations), 192)
+
+            blocks = count_nonzero(table.orientations[0].blocks)
+            for orientation, planes in enumerate(table.transitions):
+                self.assertEqual(
+                    count_nonzero(table.orientations[orientation].blocks),
+                    blocks)
+                for plane, (_, clockwise) in enumerate(planes):
+                    self.assertEqual(
+                        table.transitions[clockwise][plane][0], orientation)
+
+    def test_play(self):
+        """
+        Random games should play until they're over,
+        without the piece ever overlapping the board,
+        and with the board's Zobrist hash matching its cells.
+        """
+        rng = random.Random(4)
+        game = game_4d.Game4D(generator=PieceGenerator(7, seed=4))
+        MOVES = tuple(game.moves) + (SOFT_DROP,)
+
+        for _ in range(10000):
+            if rng.random() < 0.5:
+                game.try_move(rng.choice(MOVES))
+            if rng.random() < 0.3:
+                game.try_rotate(
+                    rng.randrange(len(game_4d.PLANES_4D)), rng.random() < 0.5)
+            if rng.random() < 0.05:
+                game.try_move(HARD_DROP)
+
+            self.assertFalse(any(
+                pos in game.board for pos in game.piece.block_positions()))
+            if not game.play():
+                break
+        else:
+            self.fail("The game should have ended.")
+
+        keys = cell_keys_nd("nd-cell", game.extents)
+        expected_hash = 0
+        for pos in game.board:
+            expected_hash ^= int(keys[pos])
+        self.assertEqual(game.board.zobrist_hash, expected_hash)
+
+    def test_clear_levels(self):
+        """
+        Filling a hyper-floor should clear it when a piece lands in it,
+        making the cells above it fall.
+        """
+        game = game_4d.Game4D(hyper_floors=6)
+        board = {
+            (x_pos, y_pos, w_pos, 5): GREY
+            for x_pos in range(4) for y_pos in range(4) for w_pos in range(4)
+        }
+        board[(0, 0, 0, 4)] = GREY
+        board[(1, 2, 3, 4)] = GREY
+        del board[(0, 0, 0, 5)]
+        game.board = board
+
+        self.assertEqual(game.board.clear_levels(range(6)), 0)
+
+        game.board[(0, 0, 0, 5)] = GREY
+        self.assertEqual(game.board.clear_levels([4, 5, 7, -1]), 1)
+        self.assertEqual(
+            set(game.board), {(0, 0, 0, 5), (1, 2, 3, 5)})
+        self.assertEqual(
+            game.board.zobrist_hash,
+            feature_key("nd-cell", 0, 0, 0, 5)
+            ^ feature_key("nd-cell", 1, 2, 3, 5))
+
+    def test_collision_mask(self):
+        """
+        'collision_mask' should match checking each orientation
+        with 'collides', inside and at the edges of the board.
+        """
+        rng = random.Random(2)
+        board = ArrayBoardND((4, 4, 4, 8), {
+            (rng.randrange(4), rng.randrange(4), rng.randrange(4),
+             rng.randrange(4, 8)): GREY
+            for _ in range(60)
+        })
+        for table in game_4d.ORIENTATIONS_4D:
+            orientations = table.orientations[:16]
+            blocks = stack(
+                [orientation.blocks for orientation in orientations])
+
+            for pos in ((0, 0, 0, 3), (-1, 0, 1, 4), (1, 1, 0, 6)):
+                expected = sum(
+                    1 << bit for bit, orientation in enumerate(orientations)
+                    if board.collides(orientation, pos))
+                self.assertEqual(
+                    board.collision_mask(orientations, pos, blocks), expected)
+                self.assertEqual(
+                    board.collision_mask(orientations, pos), expected)
+
+    def test_invalid_arguments(self):
+        game = game_4d.Game4D()
+
+        self.assertRaises(ValueError, game_4d.Game4D, hyper_floor_width=3)
+        self.assertRaises(ValueError, game_4d.Game4D, hyper_floors=3)
+        self.assertRaises(ValueError, game.try_move, "z")
+        self.assertRaises(ValueError, game.try_rotate, 6, True)
+        self.assertRaises(
+            ValueError, game.board.__setitem__, (4, 0, 0, 0), GREY)
+
+
+class TestGameND(unittest.TestCase):
+    def test_shared_engine(self):
+        """
+        Every game mode should move, land, clear and score its pieces
+        with the SAME methods of 'GameND'.
+        """
+        for game_type in (game_2d.Game2D, game_3d.Game3D, game_4d.Game4D):
+            with self.subTest(game_type=game_type.__name__):
+                self.assertTrue(issubclass(game_type, game_nd.GameND))
+                for name in ("try_move", "landed", "set_down",
+                             "_clear_levels", "play"):
+                    self.assertIs(
+                        getattr(game_type, name),
+                        getattr(game_nd.GameND, name))
+
+    def test_invalid_moves(self):
+        """
+        Every game mode should reject the moves it doesn't have,
+        with the same error.
+        """
+        for game in (game_2d.Game2D(), game_3d.Game3D(), game_4d.Game4D()):
+            with self.subTest(game_type=type(game).__name__):
+                self.assertRaises(ValueError, game.try_move, "z")
+                self.assertIs(game.try_move(HARD_DROP), True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+from game.piece_generator import PieceGenerator
+from game import game_2d, game_3d
+import unittest
+
+
+class TestPieceGenerator(unittest.TestCase):
+    def test_seed(self):
+        """
+        Two generators with the same seed should pick the same pieces,
+        across many blocks, and all of them should be valid indexes.
+        """
+        first = PieceGenerator(7, seed=1, block_size=16)
+        second = PieceGenerator(7, seed=1, block_size=16)
+
+        INDEXES = [first.next_index() for _ in range(100)]
+        self.assertEqual(INDEXES, [second.next_index() for _ in range(100)])
+        self.assertTrue(all(index in range(7) for index in INDEXES))
+        self.assertEqual(set(INDEXES), set(range(7)))
+
+    def test_state(self):
+        """
+        'setstate' should make the generator pick the same pieces
+        it picked after 'getstate', even after picking other blocks,
+        and copies should pick the same pieces without changing
+        the original generator.
+        """
+        generator = PieceGenerator(7, seed=2, block_size=16)
+        for _ in range(10):
+            generator.next_index()
+
+        STATE = generator.getstate()
+        INDEXES = [generator.next_index() for _ in range(50)]
+
+        generator.setstate(STATE)
+        self.assertEqual([generator.next_index() for _ in range(50)],
+                         INDEXES)
+
+        generator.setstate(STATE)
+        copy = generator.copy()
+        self.assertEqual([copy.next_index() for _ in range(50)], INDEXES)
+        self.assertEqual(generator.getstate(), STATE)
+
+    def test_fill_block(self):
+        """
+        'fill_block' should pick the same block 'next_index'
+        would pick when the block runs out.
+        """
+        first = PieceGenerator(7, seed=4, block_size=16)
+        second = PieceGenerator(7, seed=4, block_size=16)
+
+        for _ in range(16):
+            first.next_index()
+        second.fill_block()
+
+        self.assertEqual(first.next_index(), second.next_index())
+        self.assertEqual(first.getstate(), second.getstate())
+
+    def test_games(self):
+        """
+        Games with generators with the same seed should get the same
+        pieces, no matter what other games are being played.
+        """
+        for game_type, pieces in ((game_2d.Game2D, game_2d.PIECES_2D),
+                                  (game_3d.Game3D, game_3d.PIECES_3D)):
+            first = game_type(generator=PieceGenerator(len(pieces), seed=3))
+            other = game_type()
+            second = game_type(generator=PieceGenerator(len(pieces), seed=3))
+
+            for _ in range(20):
+                self.assertEqual(first.next_piece.color,
+                                 second.next_piece.color)
+                for game_instance in (first, other, second):
+                    game_instance.try_move("h")
+                    game_instance.play()
+                    game_instance.board = {}
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+from game.control import GameControl2D, GameControl3D
+from game.game_2d import Game2D
+from game.game_3d import Game3D
+from game.piece_generator import PieceGenerator
+from game.sessions import *
+import asyncio
+import random
+import subprocess
+import sys
+import unittest
+
+
+class TestTimerWheel(unittest.TestCase):
+    def test_advance(self):
+        """
+        Items should fire at their tick, in the order they were
+        scheduled, even when they're more than one round ahead.
+        """
+        wheel = TimerWheel(4)
+        wheel.schedule("a", 2)
+        wheel.schedule("b", 6)
+        wheel.schedule("c", 2)
+        wheel.schedule("d", 0)
+
+        self.assertEqual(len(wheel), 4)
+        fired = [wheel.advance() for _ in range(8)]
+        self.assertEqual(fired, [["d"], [], ["a", "c"], [], [], [], ["b"], []])
+        self.assertEqual(wheel.tick, 8)
+        self.assertEqual(len(wheel), 0)
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, TimerWheel, 0)
+
+        wheel = TimerWheel(4)
+        wheel.advance()
+        self.assertRaises(ValueError, wheel.schedule, "a", 0)
+
+
+class TestSessionHost(unittest.TestCase):
+    def test_same_as_control(self):
+        """
+        Every session should play EXACTLY like its 'GameControl',
+        played frame by frame with the same controls,
+        once per 'slots_per_frame' ticks,
+        no matter when it was opened.
+        """
+        rng = random.Random(8)
+        host = SessionHost(slots_per_frame=4)
+        sessions = []
+        expected = []
+        held = []
+        opened = []
+        # the session's 'GameControl' played without the host,
+        # the controls held in it, and the tick it was opened at
+
+        for tick in range(3000):
+            if tick < 6:
+                if tick % 2:
+                    game_type, control_type = Game3D, GameControl3D
+                else:
+                    game_type, control_type = Game2D, GameControl2D
+
+                opened.append(host.wheel.tick)
+                sessions.append(host.open(control_type(
+                    game_type(generator=PieceGenerator(7, tick)))))
+                expected.append(control_type(
+                    game_type(generator=PieceGenerator(7, tick))))
+                expected[-1].frame_total = 0
+                held.append(set())
+            # (the sessions are opened in different ticks)
+
+            due = [
+                index for index, session in enumerate(sessions)
+                if not session.over.is_set()
+                and (host.wheel.tick - opened[index]) % 4 == 0
+            ]
+
+            pressed = {}
+            for index in due:
+                controls = sorted(expected[index].CONTROLS)
+                pressed[index] = set()
+                for control in controls:
+                    if rng.random() < 0.05:
+                        if control in held[index]:
+                            held[index].discard(control)
+                            sessions[index].release(control)
+                        else:
+                            held[index].add(control)
+                            pressed[index].add(control)
+                            sessions[index].press(control)
+
+            self.assertEqual(host.advance(), len(due))
+
+            for index in due:
+                result = expected[index].play_frame(
+                    held[index], pressed[index])
+                expected[index].frame_total += 1
+                self.assertEqual(
+                    (sessions[index].successful_actions,
+                     sessions[index].game_can_continue),
+                    result)
+                self.assertEqual(
+                    sessions[index].control.game.zobrist_hash,
+                    expected[index].game.zobrist_hash)
+                self.assertEqual(
+                    sessions[index].over.is_set(), not result[1])
+
+        self.assertEqual(
+            [session.frames for session in sessions],
+            [control.frame_total for control in expected])
+
+    def test_taps_and_close(self):
+        """
+        A control pressed and released before a frame should be
+        played as held in that frame,
+        and closed sessions shouldn't play anymore.
+        """
+        host = SessionHost(slots_per_frame=2)
+        session = host.open(GameControl2D(
+            Game2D(generator=PieceGenerator(7, 1))))
+        x_pos = session.control.game.piece.pos[0]
+
+        session.press("LEFT")
+        session.release("LEFT")
+        host.advance(2)
+        self.assertEqual(session.control.game.piece.pos[0], x_pos - 1)
+        self.assertEqual(session.held_controls, set())
+
+        frames = []
+        other = host.open(
+            GameControl2D(), on_frame=lambda played: frames.append(played))
+        host.close(session)
+        self.assertTrue(session.over.is_set())
+        self.assertEqual(host.advance(10), 5)
+        self.assertEqual(session.frames, 1)
+        self.assertEqual(frames, [other] * 5)
+
+    def test_run(self):
+        """
+        Bots playing through the sessions' input queues
+        should play their games until they're over, in real time.
+        """
+        async def bot(session: Session):
+            while not session.over.is_set():
+                session.press("HARD_DROP")
+                session.release("HARD_DROP")
+                await asyncio.sleep(0)
+
+        async def main():
+            host = SessionHost(frame_rate=2000)
+            sessions = [
+                host.open(GameControl3D() if index % 2 else GameControl2D())
+                for index in range(20)
+            ]
+            runner = asyncio.create_task(host.run())
+            bots = [asyncio.create_task(bot(session)) for session in sessions]
+
+            await asyncio.wait_for(
+                asyncio.gather(*(session.over.wait() for session in sessions)),
+                timeout=30)
+            host.stop()
+            await runner
+            await asyncio.gather(*bots)
+            return host, sessions
+
+        host, sessions = asyncio.run(main())
+        self.assertEqual(host.sessions, {})
+        for session in sessions:
+            self.assertFalse(session.game_can_continue)
+            self.assertGreater(session.control.game.board.__len__(), 0)
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, SessionHost, 0)
+        self.assertRaises(ValueError, SessionHost, slots_per_frame=0)
+        session = SessionHost().open(GameControl2D())
+        self.assertRaises(ValueError, session.press, "rotate_cw_x")
+        self.assertRaises(ValueError, session.release, "FOO")
+
+    def test_no_pygame(self):
+        """
+        The sessions should be usable without pygame.
+        """
+        result = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, game.sessions; "
+             "print('pygame' in sys.modules)"],
+            capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
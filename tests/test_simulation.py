@@ -0,0 +1,118 @@
+from game.simulation import *
+from game.score import fall_rate
+import subprocess
+import sys
+import unittest
+
+
+class TestSimulation(unittest.TestCase):
+    def test_engines(self):
+        """
+        Both engines should play all of their games until they're over,
+        counting frames, pieces and engine calls.
+        """
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                report = simulate(engine, 3)
+
+                self.assertEqual(report.games, 3)
+                self.assertEqual(len(report.scores), 3)
+                self.assertGreater(report.pieces, 0)
+                self.assertGreater(report.frames, report.pieces)
+                self.assertGreater(report.frames_per_second, 0)
+
+                self.assertGreater(report.latency.count("play"), 0)
+                self.assertGreater(report.latency.count("try_move"), 0)
+                self.assertGreater(report.latency.count("try_rotate"), 0)
+                self.assertIn("play", report.format())
+
+    def test_seed(self):
+        """
+        The same seed should play the same games,
+        and different seeds should play different games.
+        """
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                first = simulate(engine, 2, seed=5)
+                second = simulate(engine, 2, seed=5)
+                third = simulate(engine, 2, seed=6)
+
+                self.assertEqual(first.scores, second.scores)
+                self.assertEqual(first.frames, second.frames)
+                self.assertEqual(first.pieces, second.pieces)
+                self.assertNotEqual(first.frames, third.frames)
+
+    def test_scripted_policy(self):
+        """
+        Hard dropping every frame should spawn a new piece every frame,
+        until the pieces stack up to the top
+        (where the last piece spawned ends the game).
+        """
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                report = simulate(
+                    engine, 1,
+                    lambda seed: ScriptedPolicy([[("try_move", HARD_DROP)]])
+                )
+                self.assertEqual(report.frames, report.pieces)
+
+    def test_callback_policy(self):
+        """
+        Any function should work as a policy,
+        and 'max_frames' should stop the games early.
+        A game where nothing is ever pressed should only call 'play'.
+        """
+        games = []
+
+        def policy(game):
+            games.append(game)
+            return ()
+
+        report = simulate("2d", 2, lambda seed: policy, max_frames=100)
+
+        self.assertEqual(report.frames, 200)
+        self.assertEqual(len(games), 200)
+        self.assertEqual(len(set(map(id, games))), 2)
+        self.assertEqual(tuple(report.latency.buckets), ("play",))
+        self.assertEqual(report.latency.count("play"), 200 // fall_rate(0))
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, simulate, "5d", 1)
+        self.assertRaises(ValueError, simulate, "2d", -1)
+        self.assertRaises(ValueError, ScriptedPolicy, [])
+        self.assertRaises(ValueError, RandomPolicy, (), move_chance=2)
+
+    def test_latency_histogram(self):
+        histogram = LatencyHistogram()
+        for nanoseconds in (1, 3, 3, 100):
+            histogram.record("play", nanoseconds)
+
+        self.assertEqual(histogram.buckets["play"], [0, 1, 2, 0, 0, 0, 0, 1])
+        self.assertEqual(histogram.mean("play"), 107 / 4)
+        self.assertEqual(histogram.percentile("play", 50), 4)
+        self.assertEqual(histogram.percentile("play", 100), 128)
+
+        other = LatencyHistogram()
+        other.record("play", 1000)
+        other.record("try_move", 5)
+        histogram.merge(other)
+
+        self.assertEqual(histogram.count("play"), 5)
+        self.assertEqual(histogram.count("try_move"), 1)
+        self.assertEqual(histogram.totals["play"], 1107)
+
+    def test_no_pygame(self):
+        """
+        The simulation should be usable without pygame.
+        """
+        result = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, game.simulation; "
+             "print('pygame' in sys.modules)"],
+            capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()